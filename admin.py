@@ -32,6 +32,18 @@ class Administrator:
         r = self.api_call(f"kill_game/{room}")
         return r.text
     
+    def resource_usage(self):
+        r = self.api_call("resource_usage")
+        return r.json()
+
+    def reaper_status(self):
+        r = self.api_call("reaper")
+        return r.json()
+
+    def reap_games(self):
+        r = self.api_call("reap_games")
+        return r.json()
+
     def forbid_new_games(self):
         r = self.api_call("forbid_new_games")
         return r.text
@@ -48,6 +60,14 @@ class Administrator:
         r = self.api_call("kill_server")
         return r.text
 
+    def submit_simulation(self, kingdom: list, strategies: list, num_games: int, seed: int = None):
+        r = requests.post(f"{self.admin_base_url}/simulations", json={"kingdom": kingdom, "strategies": strategies, "num_games": num_games, "seed": seed}, auth=self.auth)
+        return r.json()
+
+    def simulation(self, job_id: int):
+        r = self.api_call(f"simulations/{job_id}")
+        return r.json()
+
     # COMPOSITE APIS
     def initiate_pending_shutdown(self, timeout: int, warning_interval: int):
         """
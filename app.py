@@ -4,24 +4,33 @@ monkey.patch_all()
 import flask_socketio
 import random
 import string
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 from config import Config
 from flask import Flask, Blueprint, abort, request, send_from_directory, jsonify
 from flask_httpauth import HTTPBasicAuth
-from typing import Any, Dict, DefaultDict, List, Tuple
+from typing import Any, Deque, Dict, DefaultDict, List, Tuple
 from dominion.cards import ALL_KINGDOM_CARDS, ALL_KINGDOM_CARDS_BY_EXPANSION
+from dominion.cards.catalog import card_records
 from dominion.cards.custom_sets import CustomSet
 from dominion.cards.recommended_sets import ALL_RECOMMENDED_SETS
 from dominion.expansions import DominionExpansion, IntrigueExpansion, ProsperityExpansion, CornucopiaExpansion, HinterlandsExpansion, GuildsExpansion
 from dominion.game import Game, GameStartedError
+from dominion.limits import GameLimits
 from dominion.heartbeat import HeartBeat
-from dominion.interactions import BrowserInteraction, AutoInteraction
+from dominion.interactions import BrowserInteraction, AutoInteraction, StrategyInteraction
+from dominion.interactions.strategy import STRATEGIES, load_strategies
+from dominion.jobs import JobQueue
+from dominion.stats import StatsRecorder, StatsStore
+from http_cache import CachedPayload, StaticAssets
 
 
 app = Flask(__name__)
 app.config.from_object("config.Config")
 socketio = flask_socketio.SocketIO(app, async_mode="gevent", logger=False, engineio_logger=False)
 auth = HTTPBasicAuth()
+# Hashed, precompressed frontend assets (see build_static.py)
+static_assets = StaticAssets("client/public") if Config.PRECOMPRESSED_STATIC_ASSETS else None
 
 
 @auth.verify_password
@@ -31,12 +40,24 @@ def verify_password(username, password):
 
 @app.route("/")
 def base():
+    if static_assets is not None:
+        return static_assets.response(request)
     return send_from_directory("client/public", "index.html")
 
 @app.route("/<path:path>")
 def home(path):
+    if static_assets is not None and path in static_assets:
+        return static_assets.response(request, path)
     return send_from_directory("client/public", path)
 
+@app.route("/api/recommended_sets")
+def api_recommended_sets():
+    return recommended_sets_payload.response(request)
+
+@app.route("/api/kingdom_cards")
+def api_kingdom_cards():
+    return all_kingdom_cards_payload.response(request)
+
 
 # Global dictionary of games, indexed by room ID
 games: Dict[str, Game] = {}
@@ -46,10 +67,26 @@ sids: Dict[str, Tuple[str, Any]] = {}
 connected_players: DefaultDict[str, List[str]] = defaultdict(list)
 # Global dictionary of disconnected players, indexed by room ID, {room: [username, ...], ...}
 disconnected_players: DefaultDict[str, List[str]] = defaultdict(list)
+# Global dictionary of when each room last saw any activity, indexed by room ID, {room: monotonic time, ...}
+room_activity: Dict[str, float] = {}
+# Global dictionary of when each room's game was first seen to have ended, indexed by room ID
+room_ended_at: Dict[str, float] = {}
+# Rooms reclaimed by the reaper, most recent last
+reaped_rooms: Deque[Dict[str, Any]] = deque(maxlen=100)
+num_reaped_rooms: int = 0
 # Global variable for admin use
 allow_game_creation: bool = True
+# Finished games waiting to be written to the statistics database, if there is one
+stats_recorder: StatsRecorder | None = StatsRecorder(StatsStore(Config.STATS_DATABASE)) if Config.STATS_DATABASE else None
+# Simulation jobs, which are run by simulation_worker.py in a process of its own (if there is a queue)
+simulation_queue: JobQueue | None = JobQueue(Config.SIMULATION_DATABASE) if Config.SIMULATION_DATABASE else None
+# Extra CPU strategies, written in the strategy format (see Strategy.parse)
+if Config.STRATEGIES_DIRECTORY:
+    load_strategies(Config.STRATEGIES_DIRECTORY)
 # All Kingdom cards (for building custom kingdoms)
-all_kingdom_cards_json = [{"expansion": expansion.name, "cards": [card_class().json for card_class in sorted(expansion_card_classes, key=lambda card_class: card_class._cost)]} for expansion, expansion_card_classes in ALL_KINGDOM_CARDS_BY_EXPANSION.items()]
+all_kingdom_cards_payload = CachedPayload([{"expansion": expansion.name, "cards": [record.json for record in sorted(card_records(expansion_card_classes), key=lambda record: record.cost)]} for expansion, expansion_card_classes in ALL_KINGDOM_CARDS_BY_EXPANSION.items()])
+# All recommended sets (these don't depend on any particular game)
+recommended_sets_payload = CachedPayload([recommended_set(None).json for recommended_set in ALL_RECOMMENDED_SETS])
 
 @socketio.on('join room')
 def join_room(data):
@@ -67,6 +104,7 @@ def join_room(data):
     try:
         # Add the player to the game
         game = games[room]
+        touch_room(room)
         game.kill_scheduled = False # Cancel erasure of the game if necessary
         game_startable_before = game.startable
         game.add_player(username, sid)
@@ -114,9 +152,18 @@ def create_room(data):
     sids[sid] = (room, data)
     connected_players[room].append(username)
     # Create the game object
-    game = Game(socketio=socketio, room=room)
+    limits = GameLimits(
+        max_turns=Config.MAX_TURNS,
+        max_decisions=Config.MAX_DECISIONS,
+        max_log_entries=Config.MAX_LOG_ENTRIES,
+        max_rounds_without_score_change=Config.MAX_ROUNDS_WITHOUT_SCORE_CHANGE,
+        max_rounds_without_supply_change=Config.MAX_ROUNDS_WITHOUT_SUPPLY_CHANGE,
+        max_repeated_positions=Config.MAX_REPEATED_POSITIONS,
+    )
+    game = Game(socketio=socketio, room=room, limits=limits)
     # Add the game object to the global dictionary of games
     games[room] = game
+    touch_room(room)
     # Create the game's heartbeat
     game.heartbeat = HeartBeat(game)
     # Add the player to the game
@@ -131,8 +178,10 @@ def add_cpu(data):
     # Add the CPU player to the game
     game = games[room]
     game_startable_before = game.startable
-    game.add_cpu()
-    cpu_name = f"CPU {game._future_cpus}"
+    # CPUs play a named strategy if one is asked for (or configured), and at random otherwise
+    strategy_name = data.get('strategy', Config.CPU_STRATEGY)
+    game.add_cpu(StrategyInteraction.using(strategy_name) if strategy_name in STRATEGIES else AutoInteraction)
+    cpu_name = f"CPU {len(game._future_cpus)}"
     socketio.emit("players in room", game.future_player_names, room=room)
     socketio.send(f'{cpu_name} has entered room {room}.\n', room=room)
     # If the game just became startable, push an event
@@ -180,6 +229,7 @@ def start_game(data):
     socketio.send(f'{username} has started game {room}.\n', room=room)
     socketio.emit('game started', room=room)
     game = games[room]
+    touch_room(room)
     # Add in customization options
     if recommended_set_index is not None:
         print("Recommended set detected.")
@@ -225,6 +275,18 @@ def start_game(data):
     socketio.start_background_task(game.heartbeat.beat)
     # Start the game (nothing can happen after this)
     game.start()
+    # Queue the finished game's results (they are written in batches by stats_writer)
+    if stats_recorder is not None and game.ended:
+        stats_recorder.record_game(game)
+
+@socketio.on('watch simulation')
+def watch_simulation(data):
+    # Progress is pushed to the job's room by simulation_watcher
+    job = simulation_queue.get(data['id']) if simulation_queue is not None else None
+    if job is None:
+        return None
+    flask_socketio.join_room(f"simulation {job.id}")
+    return job.json # This activates the client's callback with the job's progress so far
 
 @socketio.on('message')
 def send_message(data):
@@ -240,22 +302,21 @@ def send_message(data):
     message = data['message']
     socketio.emit("player message", f'{username}: {message}\n', room=room)
 
+# The lobby fetches these from /api/recommended_sets and /api/kingdom_cards, but older clients still ask over the socket
 @socketio.on('request recommended sets')
 def send_recommended_sets(data):
-    room = data['room']
     socketio.emit(
         'recommended sets',
-        data=[recommended_set(Game()).json for recommended_set in ALL_RECOMMENDED_SETS],
-        room=room,
+        data=recommended_sets_payload.data,
+        to=request.sid,
     )
 
 @socketio.on('request all kingdom cards')
 def send_all_cards(data):
-    room = data['room']
     socketio.emit(
         'all kingdom cards',
-        data=all_kingdom_cards_json,
-        room=room,
+        data=all_kingdom_cards_payload.data,
+        to=request.sid,
     )
 
 @socketio.on("request kingdom json")
@@ -292,6 +353,7 @@ def send_kingdom_json(data):
 @socketio.on("refresh")
 def refresh(data):
     room = data["room"]
+    touch_room(room)
     refresh_heartbeat(room)
 
 @socketio.on("disconnect")
@@ -328,6 +390,7 @@ def handle_response(response_data):
         print(f"There is no player with SID {request.sid}.")
         return
     game = games[room]
+    touch_room(room)
     for player in game.players:
         if player.sid == request.sid:
             break
@@ -346,16 +409,104 @@ def refresh_heartbeat(room):
 
 
 def kill_game(room):
-    game = games[room]
+    game = games.get(room)
+    if game is None:
+        # Already killed (e.g. by the reaper while a disconnect was pending)
+        return
     game.killed = True
     game.heartbeat.stop()
     # Erase the game from existence
     games.pop(room, None)
     connected_players.pop(room, None)
     disconnected_players.pop(room, None)
+    room_activity.pop(room, None)
+    room_ended_at.pop(room, None)
+    for sid in [sid for sid, (sid_room, _) in sids.items() if sid_room == room]:
+        sids.pop(sid, None)
     socketio.send(f'Game {room} has ended.\n', room=room)
 
 
+def touch_room(room):
+    room_activity[room] = time.monotonic()
+
+
+def room_lifecycle_state(room) -> Tuple[str, float]:
+    '''
+    The lifecycle state of a room ("lobby", "running" or "ended") and how
+    long (in seconds) it has been idle in that state.
+    '''
+    game = games[room]
+    now = time.monotonic()
+    if game.ended:
+        return "ended", now - room_ended_at.setdefault(room, now)
+    state = "running" if game.started else "lobby"
+    return state, now - room_activity.setdefault(room, now)
+
+
+def reap_games() -> List[Dict[str, Any]]:
+    '''
+    Kill every room that has been idle for longer than its lifecycle state's TTL.
+
+    Returns:
+        A description of each room that was reaped.
+    '''
+    global num_reaped_rooms
+    ttls = {"lobby": Config.LOBBY_TTL, "running": Config.RUNNING_TTL, "ended": Config.ENDED_TTL}
+    reaped = []
+    for room in list(games):
+        state, idle_time = room_lifecycle_state(room)
+        if idle_time < ttls[state]:
+            continue
+        reaped.append(
+            {
+                "room": room,
+                "state": state,
+                "idle_seconds": round(idle_time),
+                "players": list(connected_players.get(room, [])) + list(disconnected_players.get(room, [])),
+                "sids": sum(1 for sid_room, _ in sids.values() if sid_room == room),
+            }
+        )
+        print(f"Reaping {state} game {room} after {round(idle_time)} idle seconds.")
+        kill_game(room)
+    num_reaped_rooms += len(reaped)
+    reaped_rooms.extend(reaped)
+    return reaped
+
+
+def reaper():
+    while True:
+        socketio.sleep(Config.REAPER_INTERVAL)
+        try:
+            reap_games()
+        except Exception as exception:
+            # Never let the reaper die
+            print(f"The reaper failed: {exception!r}")
+
+
+def stats_writer():
+    while True:
+        socketio.sleep(Config.STATS_FLUSH_INTERVAL)
+        try:
+            stats_recorder.flush()
+        except Exception as exception:
+            # Never let the writer die (the failed batch is lost)
+            print(f"Writing game statistics failed: {exception!r}")
+
+
+def simulation_watcher():
+    # Only reads the queue, so the simulations themselves never run on this worker
+    since = time.time()
+    while True:
+        socketio.sleep(Config.SIMULATION_POLL_INTERVAL)
+        try:
+            for job in simulation_queue.updated_since(since):
+                socketio.emit("simulation progress", job.json, room=f"simulation {job.id}")
+                since = job.updated_at
+        except Exception as exception:
+            # Never let the watcher die
+            print(f"Watching simulations failed: {exception!r}")
+
+
 admin = Blueprint("admin", __name__)
 
 
@@ -384,6 +535,66 @@ def admin_kill_game(room):
     return f"Game {room} has been killed."
 
 
+@admin.route("/resource_usage")
+def admin_resource_usage():
+    return jsonify({room: game.resource_usage() for room, game in list(games.items())})
+
+
+@admin.route("/card_stats/<card>")
+def admin_card_stats(card):
+    if stats_recorder is None:
+        abort(404)
+    num_players = request.args.get("num_players", type=int)
+    card_stats = stats_recorder.store.card_stats(card, expansion=request.args.get("expansion"), num_players=num_players)
+    return jsonify(
+        {
+            "card": card_stats.card,
+            "games": card_stats.games,
+            "owners": card_stats.owners,
+            "win_rate": card_stats.win_rate,
+            "mean_game_length": card_stats.mean_game_length,
+            "pending_games": stats_recorder.num_pending,
+        }
+    )
+
+
+@admin.route("/simulations", methods=["POST"])
+def admin_submit_simulation():
+    if simulation_queue is None:
+        abort(404)
+    data = request.get_json(force=True)
+    try:
+        job_id = simulation_queue.submit(data["kingdom"], data["strategies"], int(data["num_games"]), data.get("seed"))
+    except (KeyError, TypeError, ValueError) as exception:
+        return jsonify({"error": str(exception)}), 400
+    return jsonify(simulation_queue.get(job_id).json), 201
+
+
+@admin.route("/simulations/<int:job_id>")
+def admin_simulation(job_id):
+    job = simulation_queue.get(job_id) if simulation_queue is not None else None
+    if job is None:
+        abort(404)
+    return jsonify(job.json)
+
+
+@admin.route("/reaper")
+def admin_reaper():
+    return jsonify(
+        {
+            "num_reaped_rooms": num_reaped_rooms,
+            "recently_reaped_rooms": list(reaped_rooms),
+            "ttls": {"lobby": Config.LOBBY_TTL, "running": Config.RUNNING_TTL, "ended": Config.ENDED_TTL},
+            "rooms": {room: dict(zip(("state", "idle_seconds"), room_lifecycle_state(room))) for room in list(games)},
+        }
+    )
+
+
+@admin.route("/reap_games")
+def admin_reap_games():
+    return jsonify(reap_games())
+
+
 @admin.route("/forbid_new_games")
 def admin_forbid_new_games():
     global allow_game_creation
@@ -415,5 +626,12 @@ def kill_server():
 app.register_blueprint(admin, url_prefix="/admin")
 
 
+socketio.start_background_task(reaper)
+if stats_recorder is not None:
+    socketio.start_background_task(stats_writer)
+if simulation_queue is not None:
+    socketio.start_background_task(simulation_watcher)
+
+
 if __name__ == '__main__':
     socketio.run(app, host="0.0.0.0", port=5000)
\ No newline at end of file
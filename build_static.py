@@ -0,0 +1,74 @@
+"""
+Prepare the compiled frontend for precompressed static asset serving.
+
+Run this after ``npm run build``. Every file in ``client/public`` is copied
+into ``client/public/dist`` under a content-hashed name (so it can be cached
+forever), along with gzipped (and, if the ``brotli`` package is installed,
+brotli-compressed) copies. ``index.html`` is rewritten to refer to the hashed
+names, and a manifest of them is written to ``dist/manifest.json``.
+
+The server uses these files when ``PRECOMPRESSED_STATIC_ASSETS`` is enabled.
+"""
+import gzip
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+PUBLIC_DIRECTORY = Path(__file__).parent / "client" / "public"
+DIST_DIRECTORY = PUBLIC_DIRECTORY / "dist"
+MANIFEST_NAME = "manifest.json"
+COMPRESSIBLE_SUFFIXES = {".css", ".html", ".js", ".json", ".map", ".svg", ".txt"}
+
+
+def hashed_name(path: Path, contents: bytes) -> str:
+    digest = hashlib.sha256(contents).hexdigest()[:12]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def write_asset(destination: Path, contents: bytes):
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.write_bytes(contents)
+    if destination.suffix in COMPRESSIBLE_SUFFIXES:
+        (destination.parent / f"{destination.name}.gz").write_bytes(gzip.compress(contents, compresslevel=9, mtime=0))
+        if brotli is not None:
+            (destination.parent / f"{destination.name}.br").write_bytes(brotli.compress(contents))
+
+
+def build():
+    if DIST_DIRECTORY.exists():
+        shutil.rmtree(DIST_DIRECTORY)
+    sources = sorted(
+        path for path in PUBLIC_DIRECTORY.rglob("*")
+        if path.is_file() and DIST_DIRECTORY not in path.parents and path.name != "index.html"
+    )
+    # Source maps go first so the files that refer to them can be pointed at their hashed names
+    sources.sort(key=lambda path: path.suffix != ".map")
+    manifest = {}
+    for source in sources:
+        contents = source.read_bytes()
+        for map_path, hashed_map_path in manifest.items():
+            if map_path.endswith(".map") and Path(map_path).parent == source.relative_to(PUBLIC_DIRECTORY).parent:
+                contents = contents.replace(f"sourceMappingURL={Path(map_path).name}".encode(), f"sourceMappingURL={Path(hashed_map_path).name}".encode())
+        relative_path = source.relative_to(PUBLIC_DIRECTORY)
+        hashed_path = relative_path.parent / hashed_name(source, contents)
+        write_asset(DIST_DIRECTORY / hashed_path, contents)
+        manifest[relative_path.as_posix()] = (Path("dist") / hashed_path).as_posix()
+    # Point the index at the hashed files
+    index = (PUBLIC_DIRECTORY / "index.html").read_text()
+    for path, hashed_path in manifest.items():
+        index = re.sub(rf"(['\"])/{re.escape(path)}\1", rf"\1/{hashed_path}\1", index)
+    write_asset(DIST_DIRECTORY / "index.html", index.encode())
+    (DIST_DIRECTORY / MANIFEST_NAME).write_text(json.dumps(manifest, indent=4))
+    print(f"Wrote {len(manifest)} hashed assets to {DIST_DIRECTORY}.")
+
+
+if __name__ == "__main__":
+    build()
@@ -10,3 +10,31 @@ class Config:
     DEBUG = environ.get("DEBUG")
     SECRET_KEY = environ.get("SECRET_KEY")
     ADMIN_PASSWORD = environ.get("ADMIN_PASSWORD")
+    # Serve the hashed, precompressed assets written by build_static.py
+    PRECOMPRESSED_STATIC_ASSETS = environ.get("PRECOMPRESSED_STATIC_ASSETS", "").lower() in ("1", "true", "yes")
+    # How long (in seconds) a room may go without activity in each lifecycle state before it is reaped
+    LOBBY_TTL = int(environ.get("LOBBY_TTL", 60 * 60))
+    RUNNING_TTL = int(environ.get("RUNNING_TTL", 6 * 60 * 60))
+    ENDED_TTL = int(environ.get("ENDED_TTL", 10 * 60))
+    REAPER_INTERVAL = int(environ.get("REAPER_INTERVAL", 60))
+    # Per-game resource budgets (runaway games are ended gracefully, and old log entries are discarded)
+    MAX_TURNS = int(environ.get("MAX_TURNS", 1000))
+    MAX_DECISIONS = int(environ.get("MAX_DECISIONS", 100000))
+    MAX_LOG_ENTRIES = int(environ.get("MAX_LOG_ENTRIES", 20000))
+    # Stall limits (unset by default, since people may take their time): games end after this many rounds without any score
+    # or Supply changes, or after reaching the same position this many times
+    MAX_ROUNDS_WITHOUT_SCORE_CHANGE = int(environ["MAX_ROUNDS_WITHOUT_SCORE_CHANGE"]) if environ.get("MAX_ROUNDS_WITHOUT_SCORE_CHANGE") else None
+    MAX_ROUNDS_WITHOUT_SUPPLY_CHANGE = int(environ["MAX_ROUNDS_WITHOUT_SUPPLY_CHANGE"]) if environ.get("MAX_ROUNDS_WITHOUT_SUPPLY_CHANGE") else None
+    MAX_REPEATED_POSITIONS = int(environ["MAX_REPEATED_POSITIONS"]) if environ.get("MAX_REPEATED_POSITIONS") else None
+    # Where to keep the results of finished games (not kept if unset), and how often (in seconds) to write them in a batch
+    STATS_DATABASE = environ.get("STATS_DATABASE")
+    STATS_FLUSH_INTERVAL = int(environ.get("STATS_FLUSH_INTERVAL", 30))
+    # Where to load extra CPU strategies from (*.strategy files), and the strategy CPUs play unless told otherwise (at random if unset)
+    STRATEGIES_DIRECTORY = environ.get("STRATEGIES_DIRECTORY")
+    CPU_STRATEGY = environ.get("CPU_STRATEGY")
+    # Where simulation jobs are queued (simulations are disabled if unset), how often (in seconds) the server checks their progress,
+    # and how the simulation worker (simulation_worker.py) runs them
+    SIMULATION_DATABASE = environ.get("SIMULATION_DATABASE")
+    SIMULATION_POLL_INTERVAL = float(environ.get("SIMULATION_POLL_INTERVAL", 2))
+    SIMULATION_WORKERS = int(environ.get("SIMULATION_WORKERS", 2))
+    SIMULATION_CHUNK_SIZE = int(environ.get("SIMULATION_CHUNK_SIZE", 500))
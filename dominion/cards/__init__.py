@@ -4,6 +4,7 @@ from typing import DefaultDict, List, Type
 from . import cards
 from .cards import Card
 from ..expansions import Expansion, ALL_EXPANSIONS
+from ..grammar import register_words
 
 from .dominion_cards import (
     KINGDOM_CARDS as DOMINION_KINGDOM_CARDS,
@@ -38,4 +39,15 @@ ALL_KINGDOM_CARDS_BY_EXPANSION: DefaultDict[Type[Expansion], List[Type[Card]]] =
 for expansion in ALL_EXPANSIONS:
     for card_class in ALL_KINGDOM_CARDS:
         if card_class.expansion == expansion.name:
-            ALL_KINGDOM_CARDS_BY_EXPANSION[expansion].append(card_class)
\ No newline at end of file
+            ALL_KINGDOM_CARDS_BY_EXPANSION[expansion].append(card_class)
+
+
+# Precompute the grammatical forms of every card's name
+def _all_subclasses(card_class: Type[Card]) -> List[Type[Card]]:
+    subclasses = []
+    for subclass in card_class.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_all_subclasses(subclass))
+    return subclasses
+
+register_words(_all_subclasses(Card))
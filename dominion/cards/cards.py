@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
-from enum import Enum, auto
+from enum import Enum, Flag, auto
+from functools import reduce
+from operator import or_
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING, Any, Optional, Deque, Dict, List, Tuple, Type, NewType
 
@@ -10,6 +12,7 @@ from ..grammar import a, s, Word
 
 if TYPE_CHECKING:
     from ..expansions import CornucopiaExpansion
+    from ..costs import CostEngine
     from ..game import Game
     from ..interactions.interaction import Interaction
     from ..player import Player
@@ -19,9 +22,12 @@ if TYPE_CHECKING:
 CardJSON = NewType("CardJSON", Dict)
 
 
-class CardType(Enum):
+class CardType(Flag):
     """
     Enumeration of all card types.
+
+    Each type is a single bit, so a card's types can be combined into a
+    single mask (see :attr:`Card.type_mask`).
     """
     TREASURE = auto()
     VICTORY = auto()
@@ -32,6 +38,16 @@ class CardType(Enum):
     PRIZE = auto()
 
 
+# Integer bits of each card type, for testing against :attr:`Card.type_bits` in hot paths
+TREASURE_BIT = CardType.TREASURE.value
+VICTORY_BIT = CardType.VICTORY.value
+CURSE_BIT = CardType.CURSE.value
+ACTION_BIT = CardType.ACTION.value
+REACTION_BIT = CardType.REACTION.value
+ATTACK_BIT = CardType.ATTACK.value
+PRIZE_BIT = CardType.PRIZE.value
+
+
 class ReactionType(Enum):
     """
     Emumeration of all reaction types.
@@ -51,6 +67,19 @@ class Card(Word, metaclass=ABCMeta):
 
     description = ''
 
+    type_mask: CardType = CardType(0)
+    type_bits: int = 0
+
+    _costs: CostEngine | None = None # The game's cost engine, once the card has an owner
+    _counted_by: Player | None = None # The player whose card counts include this card
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Compute the card's type mask once so that type checks don't need to scan the types list
+        if isinstance(cls.types, list):
+            cls.type_mask = reduce(or_, cls.types, CardType(0))
+            cls.type_bits = cls.type_mask.value
+
     def __init__(self, owner: Player | None = None):
         self._owner = owner
         self._id = Card.__lowest_id
@@ -65,11 +94,26 @@ class Card(Word, metaclass=ABCMeta):
 
     @owner.setter
     def owner(self, owner: Player | None):
+        self.release()
         self._owner: Player = owner
         if owner is not None:
+            owner.count_card(self)
+            self._counted_by = owner
             self.interactions: Interaction = self.owner.interactions
             self.game: Game = self.owner.game
             self.supply: Supply = self.owner.game.supply
+            self._costs = self.supply.costs
+
+    def release(self):
+        """
+        Stop counting this card among its owner's cards, e.g. because it
+        was trashed or returned to the Supply.
+
+        The card keeps its :attr:`owner`, since effects may still refer to it.
+        """
+        if self._counted_by is not None:
+            self._counted_by.uncount_card(self)
+            self._counted_by = None
 
     @property
     def id(self) -> int:
@@ -143,7 +187,7 @@ class Card(Word, metaclass=ABCMeta):
         """
         The cost of the card.
         """
-        return self._cost if (not hasattr(self, "game") or self.game.current_turn is None) else self.game.current_turn.get_cost(self)
+        return self._cost if self._costs is None else self._costs.get_cost(type(self))
 
     @property
     def gain_to(self) -> Deque[Card]:
@@ -155,6 +199,17 @@ class Card(Word, metaclass=ABCMeta):
         """
         return self.owner.discard_pile
     
+    @classmethod
+    def has_type(cls, card_type: CardType) -> bool:
+        """
+        Whether the card has the given type (or any of the given types, if
+        several are combined, e.g. ``CardType.VICTORY | CardType.CURSE``).
+
+        Args:
+            card_type: The card type to check for.
+        """
+        return bool(cls.type_bits & card_type.value)
+
     @classmethod
     @property
     def has_plus_two_actions(self) -> bool:
@@ -436,7 +491,7 @@ class AttackCard(ActionCard):
     def attack_player(self, player: Player, attack_parameter: Any = None):
         def get_reaction_cards_in_hand():
             # Get all reaction cards in the player's hand that can react to an attack
-            return set(card for card in player.hand if CardType.REACTION in card.types and ReactionType.ATTACK in card.reacts_to)
+            return set(player.hand.reactions(ReactionType.ATTACK))
 
         # First check if they have a reaction card in their hand
         immune = False
@@ -586,6 +641,19 @@ class VictoryCard(Card):
         """
         pass
 
+    @classmethod
+    def points_for(cls, player: Player) -> int:
+        """
+        The number of victory points each card of this class is worth to a player.
+
+        Cards whose worth depends on their owner's cards must override this
+        (and compute it from the player's card counts rather than their cards).
+
+        Args:
+            player: The player.
+        """
+        return cls.points
+
 
 class CurseCard(VictoryCard):
     '''
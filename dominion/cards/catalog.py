@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Type
+
+# Card modules are imported directly (rather than through the package) since
+# this module is imported by the Supply while the package is still initializing
+from .cards import Card, CardJSON, CardType
+from . import dominion_cards, cornucopia_cards, guilds_cards, hinterlands_cards, intrigue_cards, prosperity_cards
+
+
+# Card effects that the Supply customization options can require
+EFFECTS: Dict[str, Callable[[Type[Card]], bool]] = {
+    "plus_two_action": lambda card_class: card_class.has_plus_two_actions,
+    "drawer": lambda card_class: card_class.has_plus_one_card,
+    "buy": lambda card_class: card_class.has_plus_one_buy,
+    "trashing": lambda card_class: card_class.has_trashing,
+}
+
+
+@dataclass(frozen=True)
+class CardRecord:
+    """
+    Static information about a card class, computed once.
+
+    Args:
+        card_class: The card class this record describes.
+        name: The name of the card.
+        expansion: The name of the expansion the card belongs to.
+        cost: The unmodified cost of the card.
+        type_mask: A mask of the card's types.
+        effects: The names of the card effects (see :data:`EFFECTS`) the card has.
+        json: The card's JSON representation outside of any game. Do not mutate this.
+    """
+    card_class: Type[Card]
+    name: str
+    expansion: str
+    cost: int
+    type_mask: CardType
+    effects: FrozenSet[str]
+    json: CardJSON = field(compare=False, repr=False)
+
+    @classmethod
+    def from_card_class(cls, card_class: Type[Card]) -> CardRecord:
+        return cls(
+            card_class=card_class,
+            name=card_class.name,
+            expansion=card_class.expansion,
+            cost=card_class._cost,
+            type_mask=card_class.type_mask,
+            effects=frozenset(effect for effect, has_effect in EFFECTS.items() if has_effect(card_class)),
+            json=card_class().json,
+        )
+
+    def has_type(self, card_type: CardType) -> bool:
+        """
+        Whether the card has the given type.
+
+        Args:
+            card_type: The card type to check for.
+        """
+        return bool(self.type_mask.value & card_type.value)
+
+    def has_effect(self, effect: str) -> bool:
+        """
+        Whether the card has the given effect.
+
+        Args:
+            effect: The name of the effect to check for (a key of :data:`EFFECTS`).
+        """
+        if effect not in EFFECTS:
+            raise KeyError(effect)
+        return effect in self.effects
+
+
+CATALOG: Dict[Type[Card], CardRecord] = {}
+CATALOG_BY_NAME: Dict[str, CardRecord] = {}
+
+
+def register(card_classes: Iterable[Type[Card]]):
+    """
+    Add records for some card classes to the catalog.
+
+    Args:
+        card_classes: The card classes to add.
+    """
+    for card_class in card_classes:
+        record = CardRecord.from_card_class(card_class)
+        CATALOG[card_class] = record
+        CATALOG_BY_NAME[record.name] = record
+
+
+def card_record(card_class: Type[Card]) -> CardRecord:
+    """
+    Get the catalog record for a card class, adding it to the catalog if necessary.
+
+    Card classes added this way (e.g., basic cards) are not added to
+    :data:`CATALOG_BY_NAME`, which only ever holds the kingdom cards
+    registered when this module is imported.
+
+    Args:
+        card_class: The card class to look up.
+    """
+    try:
+        return CATALOG[card_class]
+    except KeyError:
+        record = CATALOG[card_class] = CardRecord.from_card_class(card_class)
+        return record
+
+
+def card_records(card_classes: Iterable[Type[Card]]) -> List[CardRecord]:
+    """
+    Get the catalog records for several card classes.
+
+    Args:
+        card_classes: The card classes to look up.
+    """
+    return [card_record(card_class) for card_class in card_classes]
+
+
+register(
+    dominion_cards.KINGDOM_CARDS +
+    cornucopia_cards.KINGDOM_CARDS +
+    guilds_cards.KINGDOM_CARDS +
+    hinterlands_cards.KINGDOM_CARDS +
+    intrigue_cards.KINGDOM_CARDS +
+    prosperity_cards.KINGDOM_CARDS
+)
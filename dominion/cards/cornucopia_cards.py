@@ -3,7 +3,7 @@ import math
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING
 
-from .cards import CardType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard, ReactionType
+from .cards import CardType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard, ReactionType, ACTION_BIT, CURSE_BIT, TREASURE_BIT, VICTORY_BIT
 from . import base_cards
 from ..hooks import PreTurnHook
 from ..grammar import a, s
@@ -89,7 +89,7 @@ class FortuneTeller(AttackCard):
             if (card := player.take_from_deck()) is None:
                 self.game.broadcast(f'{player} has no more cards to draw from.')
                 break
-            if CardType.VICTORY in card.types or CardType.CURSE in card.types:
+            if card.type_bits & (VICTORY_BIT | CURSE_BIT):
                 revealed_victory_or_curse = card
                 break
             cards_to_discard.append(card)
@@ -162,7 +162,7 @@ class FarmingVillage(ActionCard):
             if (card := self.owner.take_from_deck()) is None:
                 self.game.broadcast(f'{self.owner} has no more cards to draw from.')
                 break
-            if CardType.TREASURE in card.types or CardType.ACTION in card.types:
+            if card.type_bits & (TREASURE_BIT | ACTION_BIT):
                 revealed_treasure_or_action = card
                 break
             cards_to_discard.append(card)
@@ -452,7 +452,7 @@ class HornOfPlenty(TreasureCard):
         if card_class_to_gain is not None:
             self.owner.gain(card_class_to_gain)
         # If the gained card is a Victory card, trash this card
-        if CardType.VICTORY in card_class_to_gain.types:
+        if card_class_to_gain.type_bits & VICTORY_BIT:
             self.game.broadcast(f"{self.owner} trashed a Horn of Plenty because they used it to gain a Victory card.")
             self.owner.trash_played_card(self, message=False)
 
@@ -540,7 +540,7 @@ class Jester(AttackCard):
             return
         player.discard(card, message=False)
         self.game.broadcast(f"{player} discarded {a(card)} via {attacker}'s Jester.")
-        if CardType.VICTORY in card.types:
+        if card.type_bits & VICTORY_BIT:
             # If the card is a Victory card, gain a Curse
             player.gain(base_cards.Curse)
             return
@@ -575,7 +575,11 @@ class Fairgrounds(VictoryCard):
 
     @property
     def points(self):
-        num_differently_named_cards = len(set([card.name for card in self.owner.all_cards]))
+        return self.points_for(self.owner)
+
+    @classmethod
+    def points_for(cls, player):
+        num_differently_named_cards = len(player.card_counts)
         return 2 * math.floor(num_differently_named_cards / 5)
 
 
@@ -711,8 +715,7 @@ class Princess(ActionCard):
 
     def action(self):
         # Modify card costs
-        for card_class in self.supply.card_stacks:
-            self.game.current_turn.modify_cost(card_class, -2)
+        self.game.current_turn.modify_all_costs(-2)
 
 
 class TrustySteed(ActionCard):
@@ -3,8 +3,8 @@ from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Type
 
-from ...cards import ALL_KINGDOM_CARDS_BY_EXPANSION
-from ...expansions import BaseExpansion, CornucopiaExpansion, ProsperityExpansion
+from ...cards.catalog import CATALOG_BY_NAME
+from ...expansions import ALL_EXPANSIONS, BaseExpansion, CornucopiaExpansion, ProsperityExpansion
 
 if TYPE_CHECKING:
     from ..cards import Card
@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 
 CustomSetJSON = Dict[str, List[str] | List[Dict[str, str]]]
 
+EXPANSIONS_BY_NAME: Dict[str, Type[Expansion]] = {expansion.name: expansion for expansion in ALL_EXPANSIONS}
+
 
 class CustomSet(metaclass=ABCMeta):
     '''
@@ -86,11 +88,9 @@ class CustomSet(metaclass=ABCMeta):
             if self.bane_card_name is None:
                 instances.append(CornucopiaExpansion(self.game))
             else:
-                for expansion, expansion_card_classes in ALL_KINGDOM_CARDS_BY_EXPANSION.items():
-                    for expansion_card_class in expansion_card_classes:
-                        if self.bane_card_name == expansion_card_class.name:
-                            bane_card_class = expansion_card_class
-                            self.expansions.add(expansion)
+                record = CATALOG_BY_NAME[self.bane_card_name]
+                bane_card_class = record.card_class
+                self.expansions.add(EXPANSIONS_BY_NAME[record.expansion])
                 instances.append(CornucopiaExpansion(self.game, bane_card_class=bane_card_class))
         if self.use_platinum_and_colony:
             instances.append(ProsperityExpansion(self.game, platinum_and_colony=True))
@@ -127,11 +127,9 @@ class CustomSet(metaclass=ABCMeta):
             expansions: Set[Type[Expansion]] = set()
             card_names: List[str] = json["cards"]
             for card_name in card_names:
-                for expansion, expansion_card_classes in ALL_KINGDOM_CARDS_BY_EXPANSION.items():
-                    for expansion_card_class in expansion_card_classes:
-                        if card_name == expansion_card_class.name:
-                            card_classes.add(expansion_card_class)
-                            expansions.add(expansion)
+                if (record := CATALOG_BY_NAME.get(card_name)) is not None:
+                    card_classes.add(record.card_class)
+                    expansions.add(EXPANSIONS_BY_NAME[record.expansion])
             if json.get("bane_card_name", None) is not None:
                 @property
                 def bane_card_name(self):
@@ -1,5 +1,5 @@
 import math
-from .cards import Card, CardType, ReactionType, ActionCard, AttackCard, ReactionCard, VictoryCard
+from .cards import Card, CardType, ReactionType, ActionCard, AttackCard, ReactionCard, VictoryCard, ACTION_BIT, TREASURE_BIT, VICTORY_BIT
 from .base_cards import Copper, Silver, Gold, Curse
 from ..hooks import TreasureHook
 from ..grammar import a, s
@@ -179,7 +179,7 @@ class Vassal(ActionCard):
             self.game.broadcast(f'{self.owner} has no cards left to draw from.')
             return
         self.owner.discard(card)
-        if CardType.ACTION in card.types:
+        if card.type_bits & ACTION_BIT:
             prompt = f'You played a Vassal and revealed {a(card.name)}. Would you like to play it?'
             if self.interactions.choose_yes_or_no(prompt=prompt):
                 self.owner.turn.action_phase.play_without_side_effects(card)
@@ -243,9 +243,9 @@ class Bureaucrat(AttackCard):
 
     def attack_effect(self, attacker, player):
         # Check if the player has a Victory card in their hand
-        if any(CardType.VICTORY in card.types for card in player.hand):
+        if any(card.type_bits & VICTORY_BIT for card in player.hand):
             # Player must choose a Victory card to put back onto their deck
-            victory_cards = [card for card in player.hand if CardType.VICTORY in card.types]
+            victory_cards = [card for card in player.hand if card.type_bits & VICTORY_BIT]
             if len(set([type(card) for card in victory_cards])) == 1:
                 # If there is only one type of Victory card, just use any
                 card = victory_cards[0]
@@ -276,7 +276,11 @@ class Gardens(VictoryCard):
 
     @property
     def points(self):
-        num_cards = len(self.owner.all_cards)
+        return self.points_for(self.owner)
+
+    @classmethod
+    def points_for(cls, player):
+        num_cards = player.num_cards
         return math.floor(num_cards / 10)
 
 
@@ -467,7 +471,7 @@ class Bandit(AttackCard):
                 break
             else:
                 self.game.broadcast(f'{player} revealed {a(card)}.')
-                if CardType.TREASURE in card.types and not isinstance(card, Copper):
+                if card.type_bits & TREASURE_BIT and not isinstance(card, Copper):
                     trashable_cards.append(card)
                 else:
                     other_cards.append(card)
@@ -599,7 +603,7 @@ class Library(ActionCard):
                 self.game.broadcast(f'{self.owner} has no more cards to draw from.')
                 break
             self.interactions.send(f'You drew {a(card_drawn)}.')
-            if CardType.ACTION in card_drawn.types:
+            if card_drawn.type_bits & ACTION_BIT:
                 prompt = f"You drew {a(card_drawn)} with your Library. It's an Action card. You have {s(self.owner.turn.actions_remaining, 'action')} remaining. Would you like to keep it?"
                 if self.interactions.choose_yes_or_no(prompt=prompt):
                     self.interactions.send('Adding it to your hand.')
@@ -933,8 +937,8 @@ class Thief(AttackCard):
                 self.game.broadcast(f'{player} revealed {a(card)}.')
             revealed_cards.append(card)
         # Check if they revealed any treasure cards
-        if any(CardType.TREASURE in card.types for card in revealed_cards):
-            treasures = [card for card in revealed_cards if CardType.TREASURE in card.types]
+        if any(card.type_bits & TREASURE_BIT for card in revealed_cards):
+            treasures = [card for card in revealed_cards if card.type_bits & TREASURE_BIT]
             if len(set(type(card) for card in treasures)) == 1:
                 # If there's only one type of treasure, just trash it automatically
                 if len(treasures) == 1:
@@ -998,7 +1002,7 @@ class Adventurer(ActionCard):
                 self.game.broadcast(f'{self.owner} has no cards left to draw from.')
                 break
             else:
-                if CardType.TREASURE in card.types:
+                if card.type_bits & TREASURE_BIT:
                     revealed_treasures.append(card)
                 else:
                     revealed_other_cards.append(card)
@@ -5,7 +5,7 @@ import math
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING, List, Deque, Type
 
-from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard
+from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, ACTION_BIT
 from . import base_cards
 from ..hooks import PostGainHook, PreCleanupHook, PostDiscardHook, PostBuyHook, PostBuyPhaseHook
 from ..grammar import a, s, it_or_them
@@ -86,8 +86,7 @@ class Stonemason(ActionCard):
     def overpay(self, amount_overpaid: int):
         # Gain two action cards each costing the amount overpaid
         for num in range(2):
-            stacks = self.supply.card_stacks
-            gainable_card_classes = [card_class for card_class in stacks if CardType.ACTION in card_class.types and stacks[card_class].modified_cost == amount_overpaid and stacks[card_class].cards_remaining > 0]
+            gainable_card_classes = self.supply.card_classes_costing(amount_overpaid, exact_cost=True, card_type=CardType.ACTION)
             if not gainable_card_classes:
                 self.game.broadcast(f"There are no available Action cards for {self.owner} to gain costing {amount_overpaid} $.")
                 return
@@ -270,7 +269,7 @@ class Herald(ActionCard):
             self.game.broadcast(f"{self.owner} has no more cards in their deck.") 
             return
         # If it's an Action, play it
-        if CardType.ACTION in revealed_card.types:
+        if revealed_card.type_bits & ACTION_BIT:
             self.game.broadcast(f"{self.owner} revealed {a(revealed_card)} with their Herald and plays it since it is an Action.")
             self.owner.turn.action_phase.play(revealed_card)
         else:
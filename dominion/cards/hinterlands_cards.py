@@ -5,7 +5,7 @@ import math
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING, List, Deque
 
-from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard
+from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, PRIZE_BIT, TREASURE_BIT, VICTORY_BIT
 from . import base_cards
 from ..hooks import PostGainHook, PreCleanupHook, PostDiscardHook, PostBuyHook
 from ..grammar import a, s, it_or_them
@@ -42,7 +42,7 @@ class Crossroads(ActionCard):
         # Reveal your hand
         self.game.broadcast(f"{self.owner.name} revealed their hand: {Card.group_and_sort_by_cost(self.owner.hand)}.")
         # +1 Card per Victory card revealed
-        num_victories = sum(1 for card in self.owner.hand if CardType.VICTORY in card.types)
+        num_victories = sum(1 for card in self.owner.hand if card.type_bits & VICTORY_BIT)
         self.game.broadcast(f"{self.owner.name} has {s(num_victories, 'Victory card')} in their hand.")
         self.owner.draw(quantity=num_victories)
         # If this is the first time you played a Crossroads this turn, +3 Actions
@@ -508,10 +508,10 @@ class JackOfAllTrades(ActionCard):
         num_cards_to_draw = 5 - len(self.owner.hand)
         self.owner.draw(num_cards_to_draw)
         # You may trash a non-Treasure card from your hand
-        if all(CardType.TREASURE in card.types for card in self.owner.hand):
+        if all(card.type_bits & TREASURE_BIT for card in self.owner.hand):
             self.owner.interactions.send(f"You have no non-Treasure cards in your hand to trash.")
             return
-        treasure_cards_in_hand = [card for card in self.owner.hand if CardType.TREASURE in card.types]
+        treasure_cards_in_hand = [card for card in self.owner.hand if card.type_bits & TREASURE_BIT]
         prompt = f"You played a Jack of All Trades. You may trash a non-Treasure card from your hand."
         card_to_trash = self.owner.interactions.choose_card_from_hand(prompt, force=False, invalid_cards=treasure_cards_in_hand)
         if card_to_trash is not None:
@@ -560,7 +560,7 @@ class NobleBrigand(AttackCard):
             revealed_cards.append(card) # These cards are now orphaned
         if revealed_cards:
             self.game.broadcast(f"{player.name} revealed the top {s(len(revealed_cards), 'card')} of their deck: {Card.group_and_sort_by_cost(revealed_cards)}.")
-        any_treasures_revealed = any(CardType.TREASURE in card.types for card in revealed_cards)
+        any_treasures_revealed = any(card.type_bits & TREASURE_BIT for card in revealed_cards)
         revealed_silvers = [card for card in revealed_cards if isinstance(card, base_cards.Silver)]
         revealed_golds = [card for card in revealed_cards if isinstance(card, base_cards.Gold)]
         # Trash a revealed Silver or Gold that the attacker chooses
@@ -637,8 +637,11 @@ class SilkRoad(VictoryCard):
 
     @property
     def points(self):
-        victory_cards = [card for card in self.owner.all_cards if CardType.VICTORY in card.types]
-        num_victory_cards = len(victory_cards)
+        return self.points_for(self.owner)
+
+    @classmethod
+    def points_for(cls, player):
+        num_victory_cards = sum(quantity for card_class, quantity in player.card_counts.items() if card_class.type_bits & VICTORY_BIT)
         return math.floor(num_victory_cards / 4)
 
 
@@ -676,7 +679,7 @@ class SpiceMerchant(ActionCard):
                 </ul>
             </div>
         """
-        if not any(CardType.TREASURE in card.types for card in self.owner.hand):
+        if not any(card.type_bits & TREASURE_BIT for card in self.owner.hand):
             self.game.broadcast(f"{self.owner.name} has no Treasures in their hand to trash.")
             return
         treasure_to_trash = self.owner.interactions.choose_specific_card_type_from_hand(prompt, CardType.TREASURE, )
@@ -745,7 +748,7 @@ class Trader(ReactionCard):
             try:
                 self.supply.return_card(gained_card)
             except KeyError:
-                if CardType.PRIZE in gained_card.types:
+                if gained_card.type_bits & PRIZE_BIT:
                     cornucopia_expansion_instance = None
                     for expansion_instance in self.supply.customization.expansions:
                         if expansion_instance.name == "Cornucopia":
@@ -913,7 +916,7 @@ class Haggler(ActionCard):
             hagglers_already_used = []
             while hagglers_in_play:
                 haggler = hagglers_in_play[0]
-                invalid_card_classes = [card_class for card_class in self.game.supply.card_stacks if CardType.VICTORY in card_class.types]
+                invalid_card_classes = [card_class for card_class in self.game.supply.card_stacks if card_class.type_bits & VICTORY_BIT]
                 card_class_to_gain = player.interactions.choose_card_class_from_supply(prompt, max_cost=max_cost, force=True, invalid_card_classes=invalid_card_classes)
                 if card_class_to_gain is not None:
                     self.game.broadcast(f"{player.name} had a Haggler in play and gained a {card_class_to_gain.name}.")
@@ -946,8 +949,7 @@ class Highway(ActionCard):
 
     def action(self):
         # Modify card costs
-        for card_class in self.supply.card_stacks:
-            self.game.current_turn.modify_cost(card_class, -1)
+        self.game.current_turn.modify_all_costs(-1)
 
 
 class IllGottenGains(TreasureCard):
@@ -1059,7 +1061,7 @@ class Mandarin(ActionCard):
 
         def __call__(self, player, card, where_it_went):
             # Put all Treasures you have in play onto your deck in any order.
-            treasures_in_play = [played_card for played_card in player.played_cards if CardType.TREASURE in played_card.types]
+            treasures_in_play = [played_card for played_card in player.played_cards if played_card.type_bits & TREASURE_BIT]
             if not treasures_in_play:
                 self.game.broadcast(f"{player.name} did not have any Treasures in play.")
                 return where_it_went
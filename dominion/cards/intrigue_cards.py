@@ -5,7 +5,7 @@ import math
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING, List, Tuple
 
-from .cards import CardType, Card, ReactionType, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard
+from .cards import CardType, Card, ReactionType, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard, ACTION_BIT, CURSE_BIT, TREASURE_BIT, VICTORY_BIT
 from . import base_cards
 from ..hooks import TreasureHook, PreBuyHook, PostGainHook
 from ..grammar import a, s
@@ -67,7 +67,7 @@ class Lurker(ActionCard):
     extra_coppers = 0
 
     def action(self):
-        actions_in_trash = any(CardType.ACTION in card_class.types for card_class in self.supply.trash_pile)
+        actions_in_trash = any(card_class.type_bits & ACTION_BIT for card_class in self.supply.trash_pile)
         # Choose one
         prompt = f'Which would you like to choose?'
         options = [
@@ -229,7 +229,7 @@ class ShantyTown(ActionCard):
 
     def action(self):
         self.game.broadcast(f"{self.owner} reveals their hand: {', '.join(map(str, self.owner.hand))}.")
-        if not any(CardType.ACTION in card.types for card in self.owner.hand):
+        if not any(card.type_bits & ACTION_BIT for card in self.owner.hand):
             self.game.broadcast(f'{self.owner} has no Action cards in their hand, so they draw 2 cards.')
             self.owner.draw(2)
         else:
@@ -408,8 +408,7 @@ class Bridge(ActionCard):
     extra_coppers = 1
 
     def action(self):
-        for card_class in self.supply.card_stacks:
-            self.game.current_turn.modify_cost(card_class, -1)
+        self.game.current_turn.modify_all_costs(-1)
 
 
 class Conspirator(ActionCard):
@@ -431,7 +430,7 @@ class Conspirator(ActionCard):
     extra_coppers = 2
 
     def action(self):
-        if len([card for card in self.owner.played_cards if CardType.ACTION in card.types]) >= 3:
+        if len([card for card in self.owner.played_cards if card.type_bits & ACTION_BIT]) >= 3:
             self.game.broadcast(f'{self.owner} has played 3 or more Actions this turn.')
             self.owner.draw(1)
             self.owner.turn.plus_actions(1)
@@ -510,11 +509,11 @@ class Ironworks(ActionCard):
         prompt = f'Gain a card costing up to 4 $.'
         card_class_to_gain = self.interactions.choose_card_class_from_supply(prompt, max_cost=4, force=True)
         self.owner.gain(card_class_to_gain)
-        if CardType.ACTION in card_class_to_gain.types:
+        if card_class_to_gain.type_bits & ACTION_BIT:
             self.owner.turn.plus_actions(1)
-        if CardType.TREASURE in card_class_to_gain.types:
+        if card_class_to_gain.type_bits & TREASURE_BIT:
             self.owner.turn.plus_coppers(1)
-        if CardType.VICTORY in card_class_to_gain.types:
+        if card_class_to_gain.type_bits & VICTORY_BIT:
             self.owner.draw(1)
 
 
@@ -679,7 +678,11 @@ class Duke(VictoryCard):
 
     @property
     def points(self):
-        num_duchies = len([card for card in self.owner.all_cards if isinstance(card, base_cards.Duchy)])
+        return self.points_for(self.owner)
+
+    @classmethod
+    def points_for(cls, player):
+        num_duchies = player.card_counts.get(base_cards.Duchy, 0)
         return num_duchies
 
 
@@ -770,7 +773,7 @@ class Patrol(ActionCard):
             self.game.broadcast(f'{self.owner} had no cards in their deck.')
         remaining_cards = list(revealed_cards) # make a shallow copy
         # Put the Victory cards and Curses into your hand
-        victory_and_curse_cards = [card for card in revealed_cards if CardType.VICTORY in card.types or CardType.CURSE in card.types]
+        victory_and_curse_cards = [card for card in revealed_cards if card.type_bits & (VICTORY_BIT | CURSE_BIT)]
         for card in revealed_cards:
             if card in victory_and_curse_cards:
                 remaining_cards.remove(card)
@@ -823,13 +826,13 @@ class Replace(AttackCard):
             prompt = f'Gain a card costing up to {max_cost} $.'
             card_class_to_gain = self.interactions.choose_card_class_from_supply(prompt, max_cost, force=True)
             # If it's an action or a treasure, gain to deck
-            if CardType.ACTION in card_class_to_gain.types or CardType.TREASURE in card_class_to_gain.types:
+            if card_class_to_gain.type_bits & (ACTION_BIT | TREASURE_BIT):
                 self.owner.gain_to_deck(card_class_to_gain)
             # Otherwise they gain it normally
             else:
                 self.owner.gain(card_class_to_gain)
             # If the gained card is a Victory card, activate the attack_effect
-            if CardType.VICTORY in card_class_to_gain.types:
+            if card_class_to_gain.type_bits & VICTORY_BIT:
                 self.attacking = True
 
 
@@ -5,7 +5,7 @@ import math
 from gevent import Greenlet, joinall
 from typing import TYPE_CHECKING, Deque
 
-from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard
+from .cards import CardType, ReactionType, Card, TreasureCard, ActionCard, AttackCard, ReactionCard, VictoryCard, CurseCard, ACTION_BIT, TREASURE_BIT, VICTORY_BIT
 from . import base_cards
 from ..hooks import TreasureHook, PostTreasureHook, PreBuyHook, PostGainHook, PostBuyHook
 from ..grammar import a, s
@@ -66,7 +66,7 @@ class Loan(TreasureCard):
             if card is None:
                 revealed_treasure = None
                 break
-            elif CardType.TREASURE in card.types:
+            elif card.type_bits & TREASURE_BIT:
                 self.game.broadcast(f'{self.owner} revealed {a(card)}.')
                 revealed_treasure = card
                 break
@@ -275,9 +275,7 @@ class Quarry(TreasureCard):
 
     def play(self):
         # Modify Action card costs
-        action_card_classes = [card_class for card_class in self.supply.card_stacks if CardType.ACTION in card_class.types]
-        for card_class in action_card_classes:
-            self.game.current_turn.modify_cost(card_class, -2)
+        self.game.current_turn.modify_all_costs(-2, CardType.ACTION)
 
 
 class Talisman(TreasureCard):
@@ -306,7 +304,7 @@ class Talisman(TreasureCard):
             # If the Talisman is no longer in play, nothing happens
             if not self.talisman in player.played_cards:
                 return
-            if purchased_card.cost <= 4 and CardType.VICTORY not in purchased_card.types:
+            if purchased_card.cost <= 4 and not purchased_card.type_bits & VICTORY_BIT:
                 card_class = type(purchased_card)
                 if player.gain(card_class, message=False):
                     self.game.broadcast(f'{player} gained an extra {purchased_card.name} from their Talisman.')
@@ -464,7 +462,7 @@ class Mint(ActionCard):
         persistent = True
 
         def __call__(self, player, card, where_it_went):
-            treasures_in_play = [card for card in player.played_cards if CardType.TREASURE in card.types]
+            treasures_in_play = [card for card in player.played_cards if card.type_bits & TREASURE_BIT]
             for treasure in treasures_in_play:
                 player.trash_played_card(treasure)
             return where_it_went
@@ -550,7 +548,7 @@ class Rabble(AttackCard):
             if card is None:
                 break
             else:
-                if CardType.TREASURE in card.types or CardType.ACTION in card.types:
+                if card.type_bits & (TREASURE_BIT | ACTION_BIT):
                     revealed_actions_and_treasures.append(card)
                 else:
                     revealed_other_cards.append(card)
@@ -690,7 +688,7 @@ class Venture(TreasureCard):
                 break
             else:
                 self.game.broadcast(f'{self.owner} revealed {a(card)}.')
-            if CardType.TREASURE in card.types:
+            if card.type_bits & TREASURE_BIT:
                 revealed_treasure = card
                 break
             else:
@@ -812,7 +810,7 @@ class Hoard(TreasureCard):
     def play(self):
         # All Victory cards get a post gain hook added this turn
         for card_class in self.supply.card_stacks:
-            if CardType.VICTORY in card_class.types:
+            if card_class.type_bits & VICTORY_BIT:
                 post_gain_hook = self.HoardPostGainHook(self.game, card_class)
                 self.owner.turn.add_post_gain_hook(post_gain_hook, card_class) 
 
@@ -832,7 +830,7 @@ class Bank(TreasureCard):
     )
 
     def play(self):
-        value = len([card for card in self.owner.played_cards if CardType.TREASURE in card.types])
+        value = len([card for card in self.owner.played_cards if card.type_bits & TREASURE_BIT])
         self.game.broadcast(f"{self.owner}'s Bank is worth {value} $.")
         self.owner.turn.coppers_remaining += value
 
@@ -957,7 +955,7 @@ class Peddler(ActionCard):
         def __call__(self):
             player = self.game.current_turn.player
             turn = self.game.current_turn
-            num_actions = len([card for card in player.played_cards if CardType.ACTION in card.types])
+            num_actions = len([card for card in player.played_cards if card.type_bits & ACTION_BIT])
             self.game.current_turn.modify_cost(Peddler, -2 * num_actions)
 
     def action(self):
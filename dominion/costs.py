@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, DefaultDict, Dict, Optional, Type
+
+if TYPE_CHECKING:
+    from .cards.cards import Card, CardType
+
+
+class CostEngine:
+    """
+    Keeps track of every cost modification in effect and the resulting
+    effective cost of each card class.
+
+    Cost modifications come in two kinds: per card class (e.g., Peddler
+    costing less for each Action played) and blanket ones that apply to
+    every card, or to every card of a type, at once (e.g., Bridge or Quarry).
+    A card's cost can never be less than 0 $.
+
+    Effective costs are computed on demand and cached until the next
+    modification. Every modification also bumps :attr:`version`, so that
+    anything derived from card costs can tell when it has gone stale.
+    """
+    def __init__(self):
+        self._modifiers: DefaultDict[Type[Card], int] = defaultdict(int)
+        self._type_modifiers: Dict[int, int] = {} # Card type bits (0 meaning all cards) to modifier
+        self._costs: Dict[Type[Card], int] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """
+        A counter that is incremented every time any cost changes.
+        """
+        return self._version
+
+    @property
+    def modifiers(self) -> Dict[Type[Card], int]:
+        """
+        The cost modifiers applied to individual card classes.
+
+        This does not include modifiers applied to all cards at once.
+        """
+        return self._modifiers
+
+    def get_cost(self, card_class: Type[Card]) -> int:
+        """
+        Get the effective cost of a card class.
+
+        Args:
+            card_class: The card class to get the cost of.
+        """
+        try:
+            return self._costs[card_class]
+        except KeyError:
+            cost = self._costs[card_class] = self._compute_cost(card_class)
+            return cost
+
+    def _compute_cost(self, card_class: Type[Card]) -> int:
+        modifier = self._modifiers.get(card_class, 0)
+        for type_bits, type_modifier in self._type_modifiers.items():
+            if not type_bits or card_class.type_bits & type_bits:
+                modifier += type_modifier
+        return max(card_class._cost + modifier, 0)
+
+    def modify_cost(self, card_class: Type[Card], modifier: int):
+        """
+        Add a cost modifier to a single card class.
+
+        Args:
+            card_class: The card class whose cost to modify.
+            modifier: The amount to add to the card's cost.
+        """
+        if modifier == 0:
+            return
+        self._modifiers[card_class] += modifier
+        self._costs.pop(card_class, None)
+        self._version += 1
+
+    def modify_all_costs(self, modifier: int, card_type: Optional[CardType] = None):
+        """
+        Add a cost modifier to all cards at once.
+
+        Args:
+            modifier: The amount to add to each card's cost.
+            card_type: If given, only cards of this type are affected.
+        """
+        if modifier == 0:
+            return
+        type_bits = 0 if card_type is None else card_type.value
+        self._type_modifiers[type_bits] = self._type_modifiers.get(type_bits, 0) + modifier
+        self._costs.clear()
+        self._version += 1
+
+    def reset(self):
+        """
+        Remove all cost modifiers, restoring every card to its printed cost.
+        """
+        if self._modifiers or self._type_modifiers:
+            self._modifiers.clear()
+            self._type_modifiers.clear()
+            self._costs.clear()
+            self._version += 1
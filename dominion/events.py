@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+from .cards.cards import Card
+from .grammar import a, s
+
+if TYPE_CHECKING:
+    from .player import Player
+
+
+class EventType(str, Enum):
+    """
+    Enumeration of all structured game event types.
+    """
+    GAIN = "gain"
+    GAIN_FAILED = "gain failed"
+    BUY = "buy"
+    PLAY = "play"
+    PLAY_TREASURES = "play treasures"
+    DISCARD = "discard"
+    TRASH = "trash"
+    DRAW = "draw"
+    DRAW_SHORT = "draw short"
+    DREW = "drew"
+    SHUFFLE = "shuffle"
+    ACTIONS = "actions"
+    BUYS = "buys"
+    COPPERS = "coppers"
+
+
+@dataclass
+class GameEvent:
+    """
+    A compact, structured description of something that happened in a game.
+
+    Events are cheap to create. The English text describing an event is only
+    rendered (via :attr:`message`) when someone actually needs to read it,
+    e.g. when a human player is attached to the game.
+
+    Args:
+        type: The type of the event.
+        player: The player the event concerns.
+        card: A single card (or card class) involved in the event.
+        cards: A list of cards involved in the event.
+        quantity: A quantity involved in the event (e.g., number of actions added).
+        total: A running total after the event (e.g., actions remaining).
+        to: Where a card ended up ("deck" or "hand"), if not the discard pile.
+        source: Where a card came from ("trash"), if not the Supply.
+        ordered: Whether the order of :attr:`cards` is meaningful.
+    """
+    type: EventType
+    player: Player
+    card: Card | type[Card] | None = None
+    cards: List[Card] = field(default_factory=list)
+    quantity: int | None = None
+    total: int | None = None
+    to: str | None = None
+    source: str | None = None
+    ordered: bool = False
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        """
+        A compact dictionary representation of the event, containing only the
+        fields that were set.
+        """
+        data: Dict[str, Any] = {
+            "type": self.type.value,
+            "player": self.player.name,
+        }
+        if self.card is not None:
+            data["card"] = self.card.name
+        if self.cards:
+            data["cards"] = [card.name for card in self.cards]
+        if self.quantity is not None:
+            data["quantity"] = self.quantity
+        if self.total is not None:
+            data["total"] = self.total
+        if self.to is not None:
+            data["to"] = self.to
+        if self.source is not None:
+            data["source"] = self.source
+        if self.ordered:
+            data["ordered"] = True
+        return data
+
+    @cached_property
+    def message(self) -> str:
+        """
+        The English text describing the event.
+
+        This is rendered on first access and cached afterward.
+        """
+        return FORMATTERS[self.type](self)
+
+    def __str__(self) -> str:
+        return self.message
+
+
+# Formatters (only run when a human consumer is attached)
+
+
+def _format_gain(event: GameEvent) -> str:
+    if event.to == "deck":
+        return f"{event.player} gained {a(event.card.name)} onto their deck."
+    if event.to == "hand":
+        return f"{event.player} gained {a(event.card.name)} into their hand."
+    if event.source == "trash":
+        return f"{event.player} gained {a(event.card.name)} from the trash."
+    return f"{event.player} gained {a(event.card.name)}."
+
+
+def _format_gain_failed(event: GameEvent) -> str:
+    if event.card is None:
+        return f"{event.player} did not gain anything."
+    return f"{event.player} could not gain {a(event.card.name)} since that supply pile is empty."
+
+
+def _format_play_treasures(event: GameEvent) -> str:
+    if not event.cards:
+        return f"{event.player} did not play any Treasures."
+    if event.ordered:
+        treasures_string = ", ".join(treasure.name for treasure in event.cards)
+        return f"{event.player} played Treasures in the following order: {treasures_string}."
+    return f"{event.player} played Treasures: {Card.group_and_sort_by_cost(event.cards)}."
+
+
+def _format_discard(event: GameEvent) -> str:
+    if event.card is not None:
+        return f"{event.player} discarded {a(event.card.name)}."
+    return f"{event.player} discarded {Card.group_and_sort_by_cost(event.cards)}."
+
+
+def _format_draw(event: GameEvent) -> str:
+    return f"+{s(event.quantity, 'card')} → {s(event.total, 'card')} in hand."
+
+
+def _format_draw_short(event: GameEvent) -> str:
+    if event.quantity == 0:
+        return f"{event.player} had no cards left to draw from."
+    return f"{event.player} had only {s(event.quantity, 'card')} left to draw from."
+
+
+def _format_counter(word: str, currency: bool = False) -> Callable[[GameEvent], str]:
+    def formatter(event: GameEvent) -> str:
+        sign = "+" if event.quantity >= 0 else "-"
+        if currency:
+            return f"{sign}{abs(event.quantity)} $ → {event.total} $."
+        return f"{sign}{s(abs(event.quantity), word)} → {s(event.total, word)}."
+    return formatter
+
+
+FORMATTERS: Dict[EventType, Callable[[GameEvent], str]] = {
+    EventType.GAIN: _format_gain,
+    EventType.GAIN_FAILED: _format_gain_failed,
+    EventType.BUY: lambda event: f"{event.player} bought {a(event.card.name)}.",
+    EventType.PLAY: lambda event: f"{event.player} played {a(event.card.name)}.",
+    EventType.PLAY_TREASURES: _format_play_treasures,
+    EventType.DISCARD: _format_discard,
+    EventType.TRASH: lambda event: f"{event.player} trashed {a(event.card.name)}.",
+    EventType.DRAW: _format_draw,
+    EventType.DRAW_SHORT: _format_draw_short,
+    EventType.DREW: lambda event: f"You drew: {', '.join(card.name for card in event.cards)}.",
+    EventType.SHUFFLE: lambda event: f"{event.player} shuffled their deck.",
+    EventType.ACTIONS: _format_counter("action"),
+    EventType.BUYS: _format_counter("buy"),
+    EventType.COPPERS: _format_counter("$", currency=True),
+}
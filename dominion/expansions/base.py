@@ -1,6 +1,6 @@
 from math import inf
 from .expansion import Expansion
-from ..cards import cards, base_cards
+from ..cards import base_cards
 
 class BaseExpansion(Expansion):
     name = 'Base'
@@ -37,7 +37,7 @@ class BaseExpansion(Expansion):
         ]
 
     def game_end_condition_province_pile_empty(self):
-        if self.supply.card_stacks[base_cards.Province].is_empty:
+        if base_cards.Province in self.supply.empty_stacks:
             return True, 'All Provinces have been purchased.'
         else:
             return False, None
@@ -54,9 +54,5 @@ class BaseExpansion(Expansion):
         pass
 
     def scoring(self, player):
-        victory_points = 0
-        for card in player.all_cards:
-            # Count only if it's a victory or curse card
-            if cards.CardType.VICTORY in card.types or cards.CardType.CURSE in card.types:
-                victory_points += card.points
-        return victory_points
\ No newline at end of file
+        # Victory and Curse cards, evaluated once per card class
+        return player.card_victory_points
\ No newline at end of file
@@ -62,7 +62,7 @@ class ProsperityExpansion(Expansion):
             # Trade route mat starts off with no coin tokens
             self.supply.trade_route = 0
             # Each Victory card pile in the Supply starts off with one coin token on top (implemented via non-persistent post-gain hooks)
-            victory_card_classes = [card_class for card_class in self.supply.card_stacks if cards.CardType.VICTORY in card_class.types]
+            victory_card_classes = [card_class for card_class in self.supply.card_stacks if card_class.type_bits & cards.VICTORY_BIT]
             for victory_card_class in victory_card_classes:
                 post_gain_hook = prosperity_cards.TradeRoute.TradeRoutePostGainHook(self.game, victory_card_class)
                 self.supply.add_post_gain_hook(post_gain_hook, victory_card_class)  
@@ -83,7 +83,7 @@ class ProsperityExpansion(Expansion):
         # Display Trade Route info
         if prosperity_cards.TradeRoute in self.game.supply.card_stacks:
             # Find remaining Trade Route post gain hooks to see which Victory cards still have coin tokens
-            victory_card_classes = [card_class for card_class in self.game.supply.card_stacks if cards.CardType.VICTORY in card_class.types]
+            victory_card_classes = [card_class for card_class in self.game.supply.card_stacks if card_class.type_bits & cards.VICTORY_BIT]
             victory_card_classes_with_coin_tokens = []
             for victory_card_class in victory_card_classes:
                 for post_gain_hook in self.game.supply.post_gain_hooks[victory_card_class]:
@@ -127,7 +127,7 @@ class ProsperityExpansion(Expansion):
 
     def game_end_condition_colony_pile_empty(self):
         # The game ends if Colonies are in the game and the Colony supply pile becomes empty
-        if self.platinum_and_colony and self.supply.card_stacks[prosperity_cards.Colony].is_empty:
+        if self.platinum_and_colony and prosperity_cards.Colony in self.supply.empty_stacks:
             return True, 'All Colonies have been purchased.'
         else:
             return False, None
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import random
+
+from abc import ABCMeta
+from collections import deque
+from dataclasses import is_dataclass
+from enum import Enum
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from .game_log import GameLogEntry
+from .interactions.auto import AutoInteraction
+from .interactions.interaction import Interaction
+
+
+# Values of these types are immutable (or are classes and functions), so a game and its forks share them
+_SHARED_TYPES = frozenset((type(None), bool, int, float, complex, str, bytes, range, type, ABCMeta, FunctionType, BuiltinFunctionType, ModuleType))
+
+
+class Forker:
+    """
+    Makes structural copies of the objects making up a game, for :meth:`Game.fork`.
+
+    Every object reachable from the objects being copied is copied at most
+    once, so objects shared in the original (e.g., a card in a player's hand
+    that a hook also refers to) are shared in the copy too. Player zones
+    are copied as new deques of copied cards, Supply stacks as their counts.
+    Classes, functions, enums, frozen dataclasses and other immutable values
+    are not copied at all. Nor is the game log: its entries are left behind.
+
+    Each player's interactions are replaced by new, headless ones.
+
+    Args:
+        interactions_class: The interactions class to use for every player in the copy.
+            If :obj:`None`, CPU players keep their interactions class and human players
+            are replaced by :class:`AutoInteraction`.
+    """
+    def __init__(self, interactions_class: Optional[Type[Interaction]] = None):
+        self._interactions_class = interactions_class
+        self._memo: Dict[int, Any] = {}
+        self._new_interactions: List[Interaction] = []
+
+    def replace(self, obj: Any, replacement: Any):
+        """
+        Use a replacement instead of copying an object.
+
+        Args:
+            obj: The object not to copy.
+            replacement: The object to use in its place.
+        """
+        self._memo[id(obj)] = replacement
+
+    def copy(self, obj: Any) -> Any:
+        """
+        Get the copy of an object, copying it if it hasn't been copied yet.
+
+        Args:
+            obj: The object to copy.
+        """
+        cls = type(obj)
+        if cls in _SHARED_TYPES:
+            return obj
+        try:
+            return self._memo[id(obj)]
+        except KeyError:
+            pass
+        try:
+            copier = _COPIERS[cls]
+        except KeyError:
+            copier = _COPIERS[cls] = _copier_for(cls)
+        return copier(self, obj)
+
+    def copy_object(self, obj: Any, exclude: Iterable[str] = (), **overrides) -> Any:
+        """
+        Copy an object's attributes into a new object of the same class.
+
+        Args:
+            obj: The object to copy.
+            exclude: Names of attributes to leave out of the copy.
+            **overrides: Values to use for some attributes instead of copies of the original's.
+        """
+        cls = type(obj)
+        new_obj = cls.__new__(cls)
+        self._memo[id(obj)] = new_obj
+        if isinstance(obj, deque):
+            deque.__init__(new_obj, self._copy_items(obj), obj.maxlen)
+        elif isinstance(obj, dict):
+            if hasattr(obj, "default_factory"):
+                new_obj.default_factory = self.copy(obj.default_factory)
+            dict.update(new_obj, zip(self._copy_items(obj.keys()), self._copy_items(obj.values())))
+        elif isinstance(obj, list):
+            list.extend(new_obj, self._copy_items(obj))
+        elif isinstance(obj, set):
+            set.update(new_obj, self._copy_items(obj))
+        state = getattr(obj, "__dict__", None)
+        if state:
+            if overrides or exclude:
+                state = {name: value for name, value in state.items() if name not in exclude}
+                state.update({name: _Override(value) for name, value in overrides.items()})
+            new_obj.__dict__.update(zip(state.keys(), self._copy_items(state.values())))
+        return new_obj
+
+    def start_interactions(self):
+        """
+        Start the new interactions made for the copied players.
+
+        This must be called once everything has been copied, since
+        interactions refer to their player's zones when they start.
+        """
+        for interactions in self._new_interactions:
+            interactions.start()
+        self._new_interactions.clear()
+
+    def _copy_items(self, items: Iterable[Any]) -> List[Any]:
+        # Most items are shared (e.g., card classes), so check for those without a call
+        copy = self.copy
+        return [item if type(item) in _SHARED_TYPES else copy(item) for item in items]
+
+    def _copy_list(self, obj: list) -> list:
+        new_obj = self._memo[id(obj)] = []
+        new_obj.extend(self._copy_items(obj))
+        return new_obj
+
+    def _copy_tuple(self, obj: tuple) -> tuple:
+        return tuple(self._copy_items(obj))
+
+    def _copy_frozenset(self, obj: frozenset) -> frozenset:
+        return frozenset(self._copy_items(obj))
+
+    def _copy_dict(self, obj: dict) -> dict:
+        new_obj = self._memo[id(obj)] = {}
+        new_obj.update(zip(self._copy_items(obj.keys()), self._copy_items(obj.values())))
+        return new_obj
+
+    def _copy_set(self, obj: set) -> set:
+        new_obj = self._memo[id(obj)] = set()
+        new_obj.update(self._copy_items(obj))
+        return new_obj
+
+    def _copy_method(self, obj: MethodType) -> MethodType:
+        # Bound methods (e.g., an expansion's game end conditions) are bound to the copy of their object
+        return MethodType(obj.__func__, self.copy(obj.__self__))
+
+    def _copy_rng(self, obj: random.Random) -> random.Random:
+        new_obj = self._memo[id(obj)] = type(obj)()
+        new_obj.setstate(obj.getstate())
+        return new_obj
+
+    def _copy_interactions(self, obj: Interaction) -> Interaction:
+        player = self.copy(obj.player)
+        # Copying the player may have copied these interactions already
+        if id(obj) in self._memo:
+            return self._memo[id(obj)]
+        interactions_class = self._interactions_class
+        if interactions_class is None:
+            interactions_class = type(obj) if isinstance(obj, AutoInteraction) else AutoInteraction
+        new_obj = self._memo[id(obj)] = interactions_class(player=player)
+        self._new_interactions.append(new_obj)
+        return new_obj
+
+
+class _Override:
+    # Wraps a value given to Forker.copy_object to use as is
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _share(forker: Forker, obj: Any) -> Any:
+    return obj
+
+
+def _drop(forker: Forker, obj: Any) -> None:
+    return None
+
+
+def _copier_for(cls: type) -> Callable[[Forker, Any], Any]:
+    if issubclass(cls, (type, Enum)):
+        return _share
+    if is_dataclass(cls) and cls.__dataclass_params__.frozen:
+        return _share
+    if issubclass(cls, _Override):
+        return lambda forker, obj: obj.value
+    if issubclass(cls, GameLogEntry):
+        return _drop
+    if issubclass(cls, Interaction):
+        return Forker._copy_interactions
+    if issubclass(cls, random.Random):
+        return Forker._copy_rng
+    if issubclass(cls, (deque, dict, list, set)) or cls.__dictoffset__ != 0:
+        # Only instances with a __dict__ of their own (every class has one) can be copied attribute by attribute
+        return Forker.copy_object
+    # Anything else without state of its own (e.g., a datetime or a lock) is treated as immutable
+    return _share
+
+
+# How to copy objects of each class, worked out the first time one is copied
+_COPIERS: Dict[type, Callable[[Forker, Any], Any]] = {
+    list: Forker._copy_list,
+    tuple: Forker._copy_tuple,
+    dict: Forker._copy_dict,
+    set: Forker._copy_set,
+    frozenset: Forker._copy_frozenset,
+    MethodType: Forker._copy_method,
+}
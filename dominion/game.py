@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import itertools
+import json
 import random
+import sys
 
-from collections import defaultdict, Counter
+from collections import defaultdict
 from typing import TYPE_CHECKING, Any, Callable, Optional, Dict, List, Tuple, Type
 
 from .cards.cards import Card, CardType, CardJSON
+from .cards.catalog import CATALOG, CardRecord
+from .events import GameEvent
+from .fork import Forker
 from .expansions import BaseExpansion, DominionExpansion, ProsperityExpansion, IntrigueExpansion, CornucopiaExpansion, HinterlandsExpansion, GuildsExpansion
 from .game_log import GameLog
 from .grammar import s
+from .limits import GameLimits, StallDetector
 from .interactions import AutoInteraction, BrowserInteraction
 from .player import Player
 from .supply import Supply
@@ -33,6 +39,15 @@ class GameStartedError(Exception):
         super().__init__(message)
 
 
+class GameNotStartedError(Exception):
+    '''
+    Raised when the game has not started yet.
+    '''
+    def __init__(self):
+        message = f'The game has not started yet'
+        super().__init__(message)
+
+
 class Game:
     '''
     Dominion Game object.
@@ -44,14 +59,16 @@ class Game:
     Args:
         socketio: A Socket.IO server instance.
         room: The room ID for this game.
+        limits: Resource budgets for this game. Defaults to no limits.
     '''
-    def __init__(self, socketio: Optional[SocketIO] = None, room: Optional[str] = None, test: bool = False):
+    def __init__(self, socketio: Optional[SocketIO] = None, room: Optional[str] = None, test: bool = False, limits: Optional[GameLimits] = None):
         self._socketio: SocketIO = socketio
         self._test: bool = test # If not running tests, slows down CPU interactions to simulate thought
         self._room: str = room
         self._future_human_players: List[Dict[str, Any]] = []
-        self._future_cpus: int = 0
+        self._future_cpus: List[Type[Interaction]] = []
         self._players: List[Player] = []
+        self._has_human_players: bool = False
         self._startable: bool = False
         self._started: bool = False
         self._kill_scheduled: bool = False
@@ -75,6 +92,14 @@ class Game:
         self._require_buy = False
         self._require_trashing = False
         self._ended = False
+        self._truncated = False
+        self._game_over_data: Dict[str, Any] | None = None
+        self._limits: GameLimits = limits if limits is not None else GameLimits()
+        self._num_turns = 0
+        self._num_decisions = 0
+        self._stall_detector = StallDetector()
+        self._card_class_json: Dict[Type[Card], CardJSON] = {}
+        self._rng = random.Random(random.getrandbits(64)) # Seeded from the global RNG so that seeding it still makes games reproducible
 
         self.add_expansion(BaseExpansion) # This must always be here or the game will not work
         # self.add_expansion(DominionExpansion)
@@ -125,9 +150,9 @@ class Game:
             {
                 "name": f"CPU {str(num + 1)}",
                 "sid": None,
-                "interactions_class": AutoInteraction,
+                "interactions_class": interactions_class,
             }
-            for num in range(0, self._future_cpus)
+            for num, interactions_class in enumerate(self._future_cpus)
         ]
         return self._future_human_players + cpu_players
 
@@ -150,6 +175,16 @@ class Game:
     def players(self, players: List[Player]):
         self._players = players
 
+    @property
+    def has_human_players(self) -> bool:
+        '''
+        Whether any human players are attached to the game.
+
+        If not (e.g., in all-CPU simulations), structured game events are
+        never rendered to text.
+        '''
+        return self._has_human_players
+
     @property
     def startable(self) -> bool:
         '''
@@ -161,6 +196,88 @@ class Game:
     def startable(self, startable: bool):
         self._startable = startable
 
+    @property
+    def limits(self) -> GameLimits:
+        '''
+        The resource budgets for this game.
+        '''
+        return self._limits
+
+    @limits.setter
+    def limits(self, limits: GameLimits):
+        self._limits = limits
+
+    @property
+    def rng(self) -> random.Random:
+        '''
+        The random number generator for this game's shuffles and turn order.
+        '''
+        return self._rng
+
+    @property
+    def num_turns(self) -> int:
+        '''
+        The number of turns played so far, across all players.
+        '''
+        return self._num_turns
+
+    @property
+    def num_decisions(self) -> int:
+        '''
+        The number of decisions made so far, across all players.
+        '''
+        return self._num_decisions
+
+    def count_decision(self):
+        '''
+        Count one more player decision. Called automatically by every interaction.
+        '''
+        self._num_decisions += 1
+
+    def resource_usage(self) -> Dict[str, int]:
+        '''
+        An account of the resources this game is using.
+
+        The memory figure is only an approximation (of the cards, log and
+        heartbeat cache), meant for comparing rooms with one another.
+        '''
+        cards: List[Card] = []
+        if self.started:
+            for player in self.players:
+                cards += player.all_cards
+            for trashed_cards in self.supply.trash_pile.values():
+                cards += trashed_cards
+        log_entries: List[Any] = list(self.game_log.root_entries)
+        num_log_entries = 0
+        approximate_bytes = sum(sys.getsizeof(card) + sys.getsizeof(card.__dict__) for card in cards)
+        while log_entries:
+            entry = log_entries.pop()
+            num_log_entries += 1
+            approximate_bytes += sys.getsizeof(entry) + sys.getsizeof(entry.message)
+            log_entries += entry.children
+        heartbeat = getattr(self, "heartbeat", None)
+        heartbeat_cache_entries = 0
+        if heartbeat is not None:
+            cached_values = list(heartbeat.cache.communal.values())
+            for player_cache in heartbeat.cache.individual.values():
+                cached_values += player_cache.values()
+            heartbeat_cache_entries = len(cached_values)
+            approximate_bytes += sum(len(json.dumps(value, default=str)) for value in cached_values)
+        pending_requests = sum(
+            1 for player in self.players
+            if (event := getattr(player.interactions, "event", None)) is not None and not event.is_set()
+        )
+        return {
+            "turns": self.num_turns,
+            "decisions": self.num_decisions,
+            "cards": len(cards),
+            "log_entries": num_log_entries,
+            "discarded_log_entries": self.game_log.num_discarded_entries,
+            "heartbeat_cache_entries": heartbeat_cache_entries,
+            "pending_requests": pending_requests,
+            "approximate_bytes": approximate_bytes,
+        }
+
     @property
     def started(self) -> bool:
         '''
@@ -520,18 +637,22 @@ class Game:
         if self.num_players >= 2:
             self.startable = True
 
-    def add_cpu(self):
+    def add_cpu(self, interactions_class: Type[Interaction] = AutoInteraction):
         '''
         Add a new CPU player into the game.
         
         Will fail if the game has already started.
 
         Will set :obj:`Game.startable` to :obj:`True` when the second player is added.
+
+        Args:
+            interactions_class: How the CPU makes its decisions. Defaults to :class:`AutoInteraction` (at random).
+                Use :class:`StrategyInteraction` for a CPU that plays a realistic strategy.
         '''
         # Players can only be added before the game starts
         if self.started:
             raise GameStartedError()
-        self._future_cpus += 1
+        self._future_cpus.append(interactions_class)
         # If there are two players, the game is startable
         if self.num_players >= 2:
             self.startable = True
@@ -552,7 +673,7 @@ class Game:
             raise GameStartedError()
         try:
             if "CPU" in name:
-                self._future_cpus -= 1
+                self._future_cpus.pop()
             else:
                 player_to_remove = [player for player in self._future_human_players if player["name"] == name][0]
                 self._future_human_players.remove(player_to_remove)
@@ -581,6 +702,7 @@ class Game:
             player = Player(game=self, name=future_player["name"], interactions_class=future_player["interactions_class"], socketio=self.socketio, sid=future_player["sid"])
             self.players.append(player)
             player.interactions.start()
+        self._has_human_players = any(not player.is_cpu for player in self.players)
         # Initiate start-of-game logging
         game_start_log_entry = self.game_log.add_entry("The game has started.")
         # Add in the selected recommended set, if any
@@ -634,7 +756,7 @@ class Game:
         # Set up the supply
         self.supply.setup()
         # Randomly decide turn order
-        self.turn_order = random.sample(self.players, len(self.players))
+        self.turn_order = self.rng.sample(self.players, len(self.players))
         # Each player figures out the turn order of the other players
         for player in self.players:
             player.get_other_players()
@@ -643,70 +765,183 @@ class Game:
             self.game_loop()
 
     def end(self, explanation: str):
-        print(self.scores)
-        # Game is over. Print out info.
+        # Game is over. Log and broadcast the results.
         game_over_log_entry = self.game_log.add_entry("Game over!")
         self.game_log.add_entry(explanation, parent=game_over_log_entry)
         self.broadcast('Game over!')
         self.broadcast(explanation)
+        self._game_over_data = self._build_game_over_data(explanation)
+        winners_str = self._game_over_data["winners"]
+        self.game_log.add_entry(winners_str, parent=game_over_log_entry)
+        self.broadcast(winners_str)
+        if self.socketio is not None:
+            self.socketio.emit(
+                'game over',
+                {'endGameData': self._game_over_data},
+                room=self.room,
+            )
+
+    def _build_game_over_data(self, explanation: str) -> Dict[str, Any]:
         victory_points_dict, turns_played_dict, winners = self.scores
         winners_str = ', '.join(map(str, winners))
         winners_str = f'{s(len(winners), "Winner").split(" ")[-1]}: {winners_str}.'
-        self.game_log.add_entry(winners_str, parent=game_over_log_entry)
-        self.broadcast(winners_str)
-        end_game_data = {
+        show_victory_tokens = ProsperityExpansion in self.expansions and any(player.victory_tokens > 0 for player in self.players)
+        return {
             "explanation": explanation,
             "winners": winners_str,
-            "playerData": [],
-            "showVictoryTokens": ProsperityExpansion in self.expansions and any(player.victory_tokens > 0 for player in self.players),
-        }
-        for player in self.players:
-            card_class_counter: Counter[Type[Card]] = Counter([type(card) for card in player.all_cards])
-            player_cards_json: List[CardJSON] = []
-            for card_class, quantity in card_class_counter.items():
-                card_example = next(card for card in player.all_cards if isinstance(card, card_class))
-                card_json = card_example.json
-                card_json["quantity"] = quantity
-                player_cards_json.append(card_json)
-            end_game_data["playerData"].append(
+            "playerData": [
                 {
                     "name": player.name,
                     "score": victory_points_dict[player],
                     "turns": turns_played_dict[player],
-                    "cards": player_cards_json,
-                    "victoryTokens": player.victory_tokens if end_game_data["showVictoryTokens"] else None,
+                    # The shared per-class JSON is copied shallowly, just to add the quantity
+                    "cards": [dict(self.card_class_json(card_class), quantity=quantity) for card_class, quantity in player.card_counts.items()],
+                    "victoryTokens": player.victory_tokens if show_victory_tokens else None,
                 }
-            )
-        print(end_game_data)
-        if self.socketio is not None:
-            self.socketio.emit(
-                'game over',
-                {'endGameData': end_game_data},
-                room=self.room,
-            )
+                for player in self.players
+            ],
+            "showVictoryTokens": show_victory_tokens,
+            "truncated": self.truncated,
+        }
+
+    @property
+    def game_over_data(self) -> Dict[str, Any] | None:
+        """
+        A summary of the finished game (its explanation, winners, and each
+        player's score, turns and cards), or :obj:`None` if the game has
+        not ended yet.
+
+        This is built once when the game ends and is shared by everything
+        that needs it, so do not mutate it.
+        """
+        return self._game_over_data
+
+    def card_class_json(self, card_class: Type[Card]) -> CardJSON:
+        """
+        The JSON representation of a card class in this game (e.g., marked as
+        a Bane card if it is one), at its unmodified cost.
+
+        This is computed once per card class, so do not mutate it.
 
-    def game_loop(self):
+        Args:
+            card_class: The card class.
+        """
+        try:
+            return self._card_class_json[card_class]
+        except KeyError:
+            pass
+        # Basic cards aren't in the catalog, and needn't be added to it for this
+        record = CATALOG.get(card_class) or CardRecord.from_card_class(card_class)
+        card_json = dict(record.json)
+        for expansion_instance in self.supply.customization.expansions:
+            if expansion_instance.name == "Cornucopia" and expansion_instance.bane_card_class is card_class:
+                card_json["types"] = ["bane"] + card_json["types"]
+                card_json["type"] = "Bane, " + card_json["type"]
+        self._card_class_json[card_class] = card_json
+        return card_json
+
+    def game_loop(self, first_player: int = 0):
         '''
         The main game loop. Cycles through turns for each player and checks for
         game end conditions after each turn.
+
+        Args:
+            first_player: The position in the turn order of the player whose turn is first.
         '''
-        for player in itertools.cycle(self.turn_order):
+        turn_order = self.turn_order[first_player:] + self.turn_order[:first_player]
+        for player in itertools.cycle(turn_order):
             self.current_turn = Turn(player)
             self.current_turn.start()
-            # Check if the game ended after each turn
-            ended, explanation = self.end_condition_met
-            if ended:
-                self.end(explanation)
-                self.ended = True
+            if self._finish_turn():
                 break
 
-    def broadcast(self, message: str):
+    def _finish_turn(self) -> bool:
+        # Count the turn just played and check whether it ended the game
+        self._num_turns += 1
+        if self.limits.detects_stalls and self.num_turns % len(self.turn_order) == 0:
+            self._stall_detector.end_round(self)
+        ended, explanation = self.end_condition_met
+        if ended:
+            self._truncated = explanation == self._limit_reached
+            self.end(explanation)
+            self.ended = True
+        return ended
+
+    def fork(self, interactions_class: Optional[Type[Interaction]] = None, seed: Optional[int] = None) -> Game:
         '''
-        Broadcast a message to each player in the game.
+        Make an independent copy of the game as it stands, e.g. to look ahead
+        at what might happen after a decision.
+
+        The copy has its own players, cards, Supply, hooks, turn and expansion
+        state, so playing it on (see :meth:`resume`) leaves this game untouched.
+        It runs headless: it has no Socket.IO server, room or human players,
+        and starts a new game log.
+
+        The game may be forked in the middle of a decision, e.g. by an interaction.
 
         Args:
-            message: The message to broadcast to each player.
+            interactions_class: The interactions class to use for every player in the copy.
+                Defaults to each CPU player's own, and :class:`AutoInteraction` for human players.
+            seed: If given, the copy's random number generator is reseeded with this, so that its
+                shuffles differ from this game's. Otherwise it will shuffle exactly as this game would.
+        '''
+        if not self.started:
+            raise GameNotStartedError()
+        forker = Forker(interactions_class)
+        forked_game_log = GameLog(self)
+        forker.replace(self.game_log, forked_game_log)
+        forked_game: Game = forker.copy_object(
+            self,
+            exclude=("heartbeat",),
+            _socketio=None,
+            _room=None,
+            _test=True,
+            _future_human_players=[],
+            _has_human_players=False,
+            _card_class_json=self._card_class_json, # Only depends on the kingdom, which forks share
+        )
+        forked_game_log.game = forked_game
+        forker.start_interactions()
+        if seed is not None:
+            forked_game.rng.seed(seed)
+        return forked_game
+
+    def resume(self):
+        '''
+        Play a forked game on from where it was forked until it ends.
+
+        The turn in progress picks up again from the start of its current
+        phase (see :meth:`Turn.resume`), then play carries on with the next player.
+        '''
+        if self.ended:
+            return
+        turn = self.current_turn
+        if turn is None:
+            self.game_loop()
+            return
+        if turn.player.turn is turn:
+            turn.resume()
+            if self._finish_turn():
+                return
+        next_player = (self.turn_order.index(turn.player) + 1) % len(self.turn_order)
+        self.game_loop(first_player=next_player)
+
+    def broadcast(self, message: str | GameEvent):
         '''
+        Broadcast a message to each player in the game.
+
+        Structured game events are only rendered to text if a human
+        player is attached to the game.
+
+        Args:
+            message: The message (or structured game event) to broadcast to each player.
+        '''
+        if isinstance(message, GameEvent):
+            if not self.has_human_players:
+                return
+            for player in self.players:
+                player.interactions.send_event(message)
+            return
         for player in self.players:
             player.interactions.send(message)
         
@@ -725,8 +960,18 @@ class Game:
             game_ended, explanation = game_end_condition()
             if game_ended:
                 return True, explanation
-        else:
-            return False, None
+        # End runaway games gracefully
+        explanation = self._limit_reached
+        return explanation is not None, explanation
+
+    @property
+    def _limit_reached(self) -> Optional[str]:
+        # Why the game has run past one of its limits, if it has
+        if self.limits.turns_exceeded(self.num_turns):
+            return f"The game reached its limit of {self.limits.max_turns} turns."
+        if self.limits.decisions_exceeded(self.num_decisions):
+            return f"The game reached its limit of {self.limits.max_decisions} decisions."
+        return self.limits.stall_reached(self._stall_detector)
 
     @property
     def ended(self) -> bool:
@@ -739,6 +984,14 @@ class Game:
     def ended(self, ended: bool):
         self._ended = ended
 
+    @property
+    def truncated(self) -> bool:
+        '''
+        Whether the game was stopped by one of its :attr:`limits` (e.g., because it stalled)
+        rather than ending by the rules.
+        '''
+        return self._truncated
+
     @property
     def scores(self) -> Tuple[Dict[Player, int], Dict[Player, int], List[str]]:
         '''
@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, TYPE_CHECKING
 
+from .events import GameEvent
+
 if TYPE_CHECKING:
     from .player import Player
     from .game import Game
@@ -12,7 +14,7 @@ if TYPE_CHECKING:
 @dataclass
 class GameLogEntry:
     game_log: GameLog
-    message: str
+    message: str | GameEvent
     scope: List[Player] | None = None
     parent: GameLogEntry | None = None
     timestamp: datetime = field(init=False)
@@ -31,11 +33,14 @@ class GameLogEntry:
     #     return child
     
     def serialize(self) -> Dict[str, Any]:
-        return {
-            "message": self.message,
+        data = {
+            "message": str(self.message),
             "depth": self.depth,
             "timestamp": self.timestamp.isoformat(),
         }
+        if isinstance(self.message, GameEvent):
+            data["event"] = self.message.json
+        return data
 
     @property
     def depth(self) -> int:
@@ -47,19 +52,36 @@ class GameLogEntry:
         return current_depth
 
 
+    @property
+    def size(self) -> int:
+        """
+        The number of entries in this entry's subtree (including itself).
+        """
+        return 1 + sum(child.size for child in self.children)
+
+
 class GameLog:
     def __init__(self, game: Game):
         self.root_entries: List[GameLogEntry] = []
         self.most_recent_entry: GameLogEntry | None = None
         self.game = game
+        self.num_entries = 0
+        self.num_discarded_entries = 0
 
-    def add_entry(self, message: str, parent: GameLogEntry | None = None, scope: List[Player] | None = None) -> GameLogEntry:
+    def add_entry(self, message: str | GameEvent, parent: GameLogEntry | None = None, scope: List[Player] | None = None) -> GameLogEntry:
         entry = GameLogEntry(self, message, scope, parent)
         self.most_recent_entry = entry
         if parent is None:
             self.root_entries.append(entry)
         else:
             parent.children.append(entry)
+        self.num_entries += 1
+        max_entries = self.game.limits.max_log_entries
+        if max_entries is not None and self.num_entries > max_entries:
+            self.compact(max_entries)
+        # Structured events are only rendered if someone is around to read them
+        if isinstance(message, GameEvent) and not self.game.has_human_players:
+            return entry
         try:
             self.game.socketio.emit("new log entry", entry.serialize(), room=self.game.room)
         except AttributeError:
@@ -67,7 +89,27 @@ class GameLog:
         print(entry)
         return entry
     
-    def add_context_aware_subentry(self, message: str, scope: List[Player] | None = None) -> GameLogEntry:
+    def compact(self, max_entries: int):
+        """
+        Discard the oldest top-level entries (and their subentries) until
+        at most three quarters of :obj:`max_entries` entries remain, so
+        that compaction doesn't happen on every new entry.
+
+        The most recent top-level entry is always kept.
+
+        Args:
+            max_entries: The maximum number of entries to keep.
+        """
+        target = max_entries * 3 // 4
+        num_discarded_roots = 0
+        while self.num_entries > target and num_discarded_roots < len(self.root_entries) - 1:
+            discarded = self.root_entries[num_discarded_roots].size
+            self.num_entries -= discarded
+            self.num_discarded_entries += discarded
+            num_discarded_roots += 1
+        del self.root_entries[:num_discarded_roots]
+
+    def add_context_aware_subentry(self, message: str | GameEvent, scope: List[Player] | None = None) -> GameLogEntry:
         return self.add_entry(message, scope, self.most_recent_entry)
     
     def __str__(self) -> str:
@@ -1,7 +1,8 @@
 from abc import abstractmethod, ABCMeta
 from enum import Enum, auto
+from functools import lru_cache
 from string import Template
-from typing import Type
+from typing import Dict, Iterable, NamedTuple, Type
 
 
 class WordMeta(ABCMeta):
@@ -25,9 +26,63 @@ class Word(metaclass=WordMeta):
         pass
 
 
+class WordForms(NamedTuple):
+    """
+    Precomputed grammatical forms of a Word.
+    """
+    singular: str
+    pluralized: str
+    with_article: str
+
+
+# Precomputed forms for each Word class, keyed by class
+WORD_FORMS: Dict[Type[Word], WordForms] = {}
+
+
+def register_words(word_classes: Iterable[Type[Word]]):
+    """
+    Precompute the grammatical forms of some Word classes so that
+    :func:`a` and :func:`s` do not need to recompute them for every message.
+
+    Args:
+        word_classes: The Word classes to register.
+    """
+    for word_class in word_classes:
+        singular = word_class.singular
+        pluralized = word_class.pluralized
+        if isinstance(singular, str) and isinstance(pluralized, str):
+            WORD_FORMS[word_class] = WordForms(singular, pluralized, _with_article(singular))
+
+
+def word_forms(word: Word | Type[Word]) -> WordForms:
+    """
+    Get the grammatical forms of a Word (or a Type inheriting from Word),
+    registering its class first if necessary.
+
+    Args:
+        word: The Word (or Word class).
+
+    Returns:
+        The precomputed forms of the Word.
+    """
+    word_class = word if isinstance(word, type) else type(word)
+    forms = WORD_FORMS.get(word_class)
+    if forms is None:
+        register_words([word_class])
+        forms = WORD_FORMS.get(word_class) or WordForms(word.singular, word.pluralized, _with_article(word.singular))
+    return forms
+
+
 # Grammatical helper functions
 
 
+@lru_cache(maxsize=1024)
+def _with_article(word: str) -> str:
+    if word[0].lower() in "aeiou":
+        return f"an {word}"
+    return f"a {word}"
+
+
 def a(word: str) -> str:
     """
     Decide whether or not to use "a " or "an " before a word.
@@ -38,11 +93,14 @@ def a(word: str) -> str:
     Returns:
         The word with "a " or "an " prepended.
     """
-    word = str(word)
-    if word[0].lower() in ["a", "e", "i", "o", "u"]:
-        return f"an {word}"
-    else:
-        return f"a {word}"
+    if type(word) is str:
+        return _with_article(word)
+    forms = WORD_FORMS.get(type(word))
+    if forms is not None:
+        return forms.with_article
+    if isinstance(word, Word):
+        return word_forms(word).with_article
+    return _with_article(str(word))
 
 
 def s(num: int, word: str | Word | Type[Word], print_number: bool = True) -> str:
@@ -60,24 +118,27 @@ def s(num: int, word: str | Word | Type[Word], print_number: bool = True) -> str
     """
     num = int(num)
     if type(word) is str:
-        word = str(word)
         if abs(num) == 1:
             if print_number:
                 return f"{num} {word}"
-            return a(word)
+            return _with_article(word)
         else:
             if print_number:
                 return f"{num} {word}s"
             return f"{word}s"
-    elif isinstance(word, Word) or issubclass(word, Word):
+    # Fast path for registered Word classes (and instances thereof)
+    forms = WORD_FORMS.get(word if isinstance(word, type) else type(word))
+    if forms is None and (isinstance(word, Word) or issubclass(word, Word)):
+        forms = word_forms(word)
+    if forms is not None:
         if abs(num) == 1:
             if print_number:
-                return f"{num} {word.singular}"
-            return a(word.singular)
+                return f"{num} {forms.singular}"
+            return forms.with_article
         else:
             if print_number:
-                return f"{num} {word.pluralized}"
-            return word.pluralized
+                return f"{num} {forms.pluralized}"
+            return forms.pluralized
     return None
 
 def it_or_them(num: int) -> str:
@@ -1,2 +1,4 @@
 from .auto import AutoInteraction
-from .browser import BrowserInteraction
\ No newline at end of file
+from .browser import BrowserInteraction
+from .strategy import StrategyInteraction
+from .search import SearchInteraction
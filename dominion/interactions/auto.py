@@ -4,7 +4,7 @@ import random
 from typing import TYPE_CHECKING, List, Optional
 
 from ..cards import base_cards
-from ..cards.cards import CardType
+from ..cards.cards import CardType, CURSE_BIT, TREASURE_BIT
 from ..expansions import CornucopiaExpansion
 from ..grammar import s
 from .interaction import Interaction
@@ -42,6 +42,10 @@ class AutoInteraction(Interaction):
         print(message)
         print()
 
+    def send_event(self, event):
+        # Nobody reads structured events sent to a CPU, so don't bother rendering them
+        pass
+
     @notify_if_not_my_turn
     def sleep_random(self):
         """
@@ -110,7 +114,7 @@ class AutoInteraction(Interaction):
         print(prompt)
         print()
         # Only cards of the correct type can be chosen
-        playable_cards = [card for card in self.hand if card_type in card.types]
+        playable_cards = [card for card in self.hand if card.type_bits & card_type.value]
         if not playable_cards:
             print(f'There are no {card_type.name.lower().capitalize()} cards in your hand.\n')
             return None
@@ -124,7 +128,7 @@ class AutoInteraction(Interaction):
         print(prompt)
         print()
         # Only cards of the correct type can be chosen
-        selectable_cards = [card for card in self.played_cards if card_type in card.types]
+        selectable_cards = [card for card in self.played_cards if card.type_bits & card_type.value]
         if not selectable_cards:
             self.send(f'There are no {card_type.name.lower().capitalize()} cards in your played cards.')
             return []
@@ -150,7 +154,7 @@ class AutoInteraction(Interaction):
         print(prompt)
         print()
         # Only cards of the correct type can be chosen
-        selectable_cards = [card for card in self.discard_pile if card_type in card.types]
+        selectable_cards = [card for card in self.discard_pile if card.type_bits & card_type.value]
         if not selectable_cards:
             self.send(f'There are no {card_type.name.lower().capitalize()} cards in your discard pile.')
             return []
@@ -206,7 +210,7 @@ class AutoInteraction(Interaction):
         print()
         while True:
             try:
-                available_treasures = [card for card in self.hand if CardType.TREASURE in card.types]
+                available_treasures = [card for card in self.hand if card.type_bits & TREASURE_BIT]
                 if not available_treasures:
                     print('There are no treasures in your hand.\n')
                     return []
@@ -223,10 +227,7 @@ class AutoInteraction(Interaction):
             invalid_card_classes = []
         while True:
             try:
-                stacks = self.supply.card_stacks
-                buyable_card_stacks = [card_class for card_class in stacks if stacks[card_class].modified_cost <= max_cost and card_class not in invalid_card_classes and stacks[card_class].cards_remaining > 0]
-                if exact_cost:
-                    buyable_card_stacks = [card_class for card_class in buyable_card_stacks if stacks[card_class].modified_cost == max_cost]
+                buyable_card_stacks = self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, invalid_card_classes=invalid_card_classes)
                 if not buyable_card_stacks:
                     return None
                 if force:
@@ -234,7 +235,7 @@ class AutoInteraction(Interaction):
                     choices = list(range(1, len(buyable_card_stacks) + 1))
                     # Weight by cost (more expensive are more likely, coppers and estates are unlikely)
                     weights = [
-                        0 if CardType.CURSE in card_class.types \
+                        0 if card_class.type_bits & CURSE_BIT \
                         else 1 if card_class == base_cards.Copper or card_class == base_cards.Estate \
                         else self.game.current_turn.get_cost(card_class) * 5 \
                         for card_class in buyable_card_stacks
@@ -250,7 +251,7 @@ class AutoInteraction(Interaction):
                     print(f'Enter choice 1-{len(buyable_card_stacks)} (0 to skip): ', end='')
                     choices = list(range(0, len(buyable_card_stacks) + 1))
                     weights = [1] + [
-                        0 if CardType.CURSE in card_class.types \
+                        0 if card_class.type_bits & CURSE_BIT \
                         else 1 if card_class == base_cards.Copper or card_class == base_cards.Estate \
                         else self.game.current_turn.get_cost(card_class) * 5 \
                         for card_class in buyable_card_stacks
@@ -274,10 +275,7 @@ class AutoInteraction(Interaction):
         while True:
             try:
                 # Only cards you can afford can be chosen (and with non-zero quantity)
-                stacks = self.supply.card_stacks
-                buyable_card_stacks = [card_class for card_class in stacks if stacks[card_class].modified_cost <= max_cost and stacks[card_class].cards_remaining > 0 and card_type in card_class.types]
-                if exact_cost:
-                    buyable_card_stacks = [card_class for card_class in buyable_card_stacks if stacks[card_class].modified_cost == max_cost]
+                buyable_card_stacks = self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, card_type=card_type)
                 if force:
                     print(f'Enter choice 1-{len(buyable_card_stacks)}: ', end='')
                     choices = list(range(1, len(buyable_card_stacks) + 1))
@@ -311,7 +309,7 @@ class AutoInteraction(Interaction):
             try:
                 # Only cards you can afford can be chosen (and with non-zero quantity)
                 trash_pile = self.supply.trash_pile
-                gainable_card_classes = [card_class for card_class in trash_pile if trash_pile[card_class] and card_type in card_class.types]
+                gainable_card_classes = [card_class for card_class in trash_pile if trash_pile[card_class] and card_class.type_bits & card_type.value]
                 if not gainable_card_classes:
                     print('There are no cards in the Trash that you can gain.')
                     return None
@@ -19,6 +19,15 @@ class BrowserInteraction(Interaction):
             "timestamp": datetime.now().isoformat(),
         }
         self.socketio.emit("message", data, to=self.sid)
+
+    def send_event(self, event):
+        # Send the rendered text along with the structured event so the client can use either
+        data = {
+            "message": f'\n{event.message}\n',
+            "event": event.json,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self.socketio.emit("message", data, to=self.sid)
         
     def _call(self, event_name, data):
         """
@@ -153,7 +162,7 @@ class BrowserInteraction(Interaction):
     def choose_specific_card_type_from_hand(self, prompt, card_type, force=False):
         print("choose_specific_card_type_from_hand")
         # Only cards of the correct type can be chosen
-        playable_cards = [card for card in self.hand if card_type in card.types]
+        playable_cards = [card for card in self.hand if card.type_bits & card_type.value]
         if not playable_cards:
             self.send(f'There are no {card_type.name.lower().capitalize()} cards in your hand.')
             return None
@@ -181,7 +190,7 @@ class BrowserInteraction(Interaction):
     def choose_cards_of_specific_type_from_played_cards(self, prompt, force, card_type, max_cards=1, ordered=False) -> List[Card]:
         print("choose_cards_of_specific_type_from_played_cards")
         # Only cards of the correct type can be chosen
-        selectable_cards = [card for card in self.played_cards if card_type in card.types]
+        selectable_cards = [card for card in self.played_cards if card.type_bits & card_type.value]
         if not selectable_cards:
             self.send(f'There are no {card_type.name.lower().capitalize()} cards in your played cards.')
             return []
@@ -226,7 +235,7 @@ class BrowserInteraction(Interaction):
     def choose_cards_of_specific_type_from_discard_pile(self, prompt, force, card_type, max_cards=1) -> List[Card]:
         print("choose_cards_of_specific_type_from_discard_pile")
         # Only cards of the correct type can be chosen
-        selectable_cards = [card for card in self.discard_pile if card_type in card.types]
+        selectable_cards = [card for card in self.discard_pile if card.type_bits & card_type.value]
         if not selectable_cards:
             self.send(f'There are no {card_type.name.lower().capitalize()} cards in your discard pile.')
             return []
@@ -309,10 +318,7 @@ class BrowserInteraction(Interaction):
         while True:
             try:
                 # Only cards you can afford can be chosen (and with non-zero quantity)
-                stacks = self.supply.card_stacks
-                buyable_card_stacks = [card_class for card_class in stacks if stacks[card_class].modified_cost <= max_cost and card_class not in invalid_card_classes and stacks[card_class].cards_remaining > 0]
-                if exact_cost:
-                    buyable_card_stacks = [card_class for card_class in buyable_card_stacks if stacks[card_class].modified_cost == max_cost]
+                buyable_card_stacks = self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, invalid_card_classes=invalid_card_classes)
                 if not buyable_card_stacks:
                     self.send('There are no cards in the Supply that you can buy.')
                     return None
@@ -328,9 +334,7 @@ class BrowserInteraction(Interaction):
                 )
                 if card_data is None:
                     return None
-                for card_class, card_stack in self.supply.card_stacks.items():
-                    if card_data["name"] == card_stack.example.name:
-                        break
+                card_class = self.supply.card_name_to_card_class(card_data["name"])
                 if card_class not in buyable_card_stacks:
                     raise ValueError()
                 return card_class
@@ -340,10 +344,7 @@ class BrowserInteraction(Interaction):
     def choose_specific_card_type_from_supply(self, prompt, max_cost, card_type, force, exact_cost=False):
         print("choose_specific_card_type_from_supply")
         # Only cards you can afford can be chosen (and with non-zero quantity)
-        stacks = self.supply.card_stacks
-        buyable_card_stacks = [card_class for card_class in stacks if card_type in card_class.types and stacks[card_class].modified_cost <= max_cost and stacks[card_class].cards_remaining > 0]
-        if exact_cost:
-            buyable_card_stacks = [card_class for card_class in buyable_card_stacks if stacks[card_class].modified_cost == max_cost]
+        buyable_card_stacks = self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, card_type=card_type)
         if not buyable_card_stacks:
             self.send('There are no cards in the Supply that you can buy.')
             return None
@@ -359,15 +360,13 @@ class BrowserInteraction(Interaction):
         )
         if card_data is None:
             return None
-        for card_class, card_stack in self.supply.card_stacks.items():
-            if card_data["name"] == card_stack.example.name:
-                return card_class
+        return self.supply.card_name_to_card_class(card_data["name"])
 
     def choose_specific_card_type_from_trash(self, prompt, max_cost, card_type, force):
         print("choose_specific_card_type_from_trash")
         # Only cards you can afford can be chosen (and with non-zero quantity)
         trash_pile = self.supply.trash_pile
-        gainable_card_classes = [card_class for card_class in trash_pile if trash_pile[card_class] and card_type in card_class.types]
+        gainable_card_classes = [card_class for card_class in trash_pile if trash_pile[card_class] and card_class.type_bits & card_type.value]
         if not gainable_card_classes:
             self.send('There are no cards in the Trash that you can gain.')
             return None
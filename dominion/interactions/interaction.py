@@ -1,32 +1,59 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
+from functools import wraps
 from gevent.lock import RLock
 from typing import TYPE_CHECKING, Any, Optional, Deque, List, Type
 
 if TYPE_CHECKING:
     from flask_socketio import SocketIO
     from ..cards.cards import Card, CardType
+    from ..events import GameEvent
     from ..game import Game
     from ..player import Player
     from ..supply import Supply
 
 
+def _counts_decision(choose):
+    # Count each top-level choice as one decision, even if it is implemented using other choices
+    @wraps(choose)
+    def counted_choose(self: Interaction, *args, **kwargs):
+        if self._deciding:
+            return choose(self, *args, **kwargs)
+        self._deciding = True
+        try:
+            self.game.count_decision()
+            return choose(self, *args, **kwargs)
+        finally:
+            self._deciding = False
+    return counted_choose
+
+
 class Interaction(metaclass=ABCMeta):
     """
     Base class for all interactions.
 
+    Every ``choose_*`` method of a subclass counts as a player decision
+    (see :attr:`Game.num_decisions`).
+
     Args:
         player: The :class:`Player` object corresponding to the player with whom to interact.
         socketio: The :class:`SocketIO` object to use for sending messages.
         sid: The socket ID of the player with whom to interact.
 
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith("choose_") and callable(attribute) and not getattr(attribute, "__isabstractmethod__", False):
+                setattr(cls, name, _counts_decision(attribute))
+
     def __init__(self, player: Player, socketio: Optional[SocketIO] = None, sid: Optional[str] = None):
         self._player = player
         self._socketio = socketio
         self._sid = sid
         self._lock = RLock()
+        self._deciding = False
 
     @property
     def player(self) -> Player:
@@ -118,6 +145,16 @@ class Interaction(metaclass=ABCMeta):
         """
         pass
 
+    def send_event(self, event: GameEvent):
+        """
+        Send a structured game event to the player.
+
+        By default, the event is rendered to text and sent as a message.
+        Override this for interactions that do not need the text (e.g., CPUs)
+        or that can forward the structured event directly.
+        """
+        self.send(event.message)
+
     @abstractmethod
     def choose_card_from_hand(self, prompt: str, force: bool, invalid_cards: List[Card] | None = None) -> Card | None:
         """
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import pickle
+import random
+import select
+import signal
+import sys
+import time
+
+from dataclasses import replace
+from math import log, sqrt
+from typing import TYPE_CHECKING, List, Optional, Tuple, Type
+
+from ..cards.cards import CURSE_BIT
+from .strategy import Strategy, StrategyInteraction
+
+if TYPE_CHECKING:
+    from ..cards.cards import Card
+    from ..game import Game
+
+
+# Running totals of the rewards and number of rollouts for each candidate
+Stats = List[Tuple[float, int]]
+
+
+class RolloutInteraction(StrategyInteraction):
+    """
+    Plays out a forked game for :class:`SearchInteraction`.
+
+    At its first buy decision, it buys whatever is queued in :attr:`pending_buys`.
+    Otherwise it follows its strategy like :class:`StrategyInteraction`.
+    """
+    def start(self):
+        super().start()
+        self.pending_buys: List[Optional[Type[Card]]] = []
+
+    def choose_card_class_from_supply(self, prompt, max_cost, force, invalid_card_classes=None, exact_cost=False):
+        if self.pending_buys:
+            return self.pending_buys.pop()
+        return super().choose_card_class_from_supply(prompt, max_cost, force, invalid_card_classes=invalid_card_classes, exact_cost=exact_cost)
+
+
+class SearchInteraction(StrategyInteraction):
+    """
+    A CPU player that decides its buys by Monte Carlo search.
+
+    At each buy decision, a handful of candidate buys (including buying
+    nothing) are compared by playing out many forked copies of the game
+    (see :meth:`Game.fork`) in which the player makes that buy and everyone
+    then follows the player's strategy. The candidate tried most often by
+    the UCB1 bandit is bought. Other decisions are made as by
+    :class:`StrategyInteraction`.
+
+    The rollouts run in :attr:`num_workers` worker processes forked at
+    each decision, which inherit the game as it stands. The player waits
+    for them on pipes, which does not block other greenlets when gevent
+    has patched :mod:`select`. Rather than pretending to think, each
+    search takes about :attr:`time_budget` seconds.
+    """
+    time_budget: float = 1.0 # Seconds to spend on each buy decision
+    num_workers: int = os.cpu_count() or 1 # Worker processes to run rollouts in, or 0 to run them in this process
+    max_candidates: int = 6 # Buys to compare at each decision, including buying nothing
+    rollout_turns: int = 24 # Turns (across all players) to play out in each rollout before scoring it
+    exploration: float = 0.7 # UCB1 exploration constant, for rewards between 0 and 1
+
+    def choose_card_class_from_supply(self, prompt, max_cost, force, invalid_card_classes=None, exact_cost=False):
+        if not self._is_buy_decision(max_cost, force, invalid_card_classes, exact_cost):
+            return super().choose_card_class_from_supply(prompt, max_cost, force, invalid_card_classes=invalid_card_classes, exact_cost=exact_cost)
+        candidates = self._buy_candidates(max_cost, invalid_card_classes)
+        if len(candidates) == 1:
+            return candidates[0]
+        stats = self.search(candidates)
+        return candidates[max(range(len(candidates)), key=lambda index: stats[index][1])]
+
+    def _is_buy_decision(self, max_cost, force, invalid_card_classes, exact_cost) -> bool:
+        # Only buys are searched, since a forked game picks up again exactly at them (see BuyPhase.resume)
+        turn = self.game.current_turn
+        return (
+            not force
+            and not exact_cost
+            and turn.player is self.player
+            and turn.current_phase is turn.buy_phase
+            and turn.buy_phase.treasures_played
+            and max_cost == turn.coppers_remaining
+            and invalid_card_classes is turn.invalid_card_classes
+        )
+
+    def _buy_candidates(self, max_cost, invalid_card_classes) -> List[Optional[Type[Card]]]:
+        # The strategy's own choice, then the priciest other cards, then buying nothing
+        preferred = self._card_class_to_gain(max_cost, invalid_card_classes=invalid_card_classes)
+        candidates = [preferred] if preferred is not None else []
+        others = [
+            card_class for card_class in reversed(self.supply.card_classes_costing(max_cost, invalid_card_classes=invalid_card_classes))
+            if card_class is not preferred and not card_class.type_bits & CURSE_BIT
+        ]
+        candidates += others[:max(self.max_candidates - len(candidates) - 1, 0)]
+        candidates.append(None)
+        return candidates
+
+    def search(self, candidates: List[Optional[Type[Card]]]) -> Stats:
+        """
+        Compare candidate buys by rollouts until the time budget is spent.
+
+        Args:
+            candidates: The card classes to compare (:obj:`None` meaning buying nothing).
+
+        Returns:
+            The total reward and number of rollouts of each candidate.
+        """
+        deadline = time.monotonic() + self.time_budget
+        player_index = self.game.players.index(self.player)
+        seeds = [random.getrandbits(64) for _ in range(max(self.num_workers, 1))]
+        if self.num_workers < 1 or not hasattr(os, "fork"):
+            return self._rollouts(player_index, candidates, deadline, seeds[0])
+        workers: List[Tuple[int, int]] = []
+        stats = [(0.0, 0)] * len(candidates)
+        try:
+            for seed in seeds:
+                read_fd, write_fd = os.pipe()
+                try:
+                    pid = os.fork()
+                except OSError:
+                    os.close(read_fd)
+                    os.close(write_fd)
+                    raise
+                if pid == 0:
+                    # Worker process: nothing it does may leave it, other than its results
+                    os.close(read_fd)
+                    status = 1
+                    try:
+                        sys.stdout = open(os.devnull, "w")
+                        stats = self._rollouts(player_index, candidates, deadline, seed)
+                        with os.fdopen(write_fd, "wb") as pipe:
+                            pickle.dump(stats, pipe)
+                        status = 0
+                    finally:
+                        os._exit(status)
+                os.close(write_fd)
+                workers.append((pid, read_fd))
+            while workers:
+                pid, read_fd = workers.pop(0)
+                try:
+                    data = _read_all(read_fd)
+                finally:
+                    os.waitpid(pid, 0)
+                if data:
+                    stats = [(reward + worker_reward, num + worker_num) for (reward, num), (worker_reward, worker_num) in zip(stats, pickle.loads(data))]
+        finally:
+            # If forking or collecting results failed part way, stop the workers left, so none is left a zombie or with its pipe open
+            for pid, read_fd in workers:
+                os.close(read_fd)
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+        return stats
+
+    def _rollouts(self, player_index: int, candidates: List[Optional[Type[Card]]], deadline: float, seed: int) -> Stats:
+        # Run UCB1 over the candidates until the deadline
+        rng = random.Random(seed)
+        random.seed(rng.getrandbits(64)) # The CPUs in rollouts make some choices at random
+        stats = [(0.0, 0)] * len(candidates)
+        total = 0
+        while time.monotonic() < deadline:
+            index = _ucb1(stats, total, self.exploration)
+            reward = _rollout(self.game, player_index, candidates[index], self.strategy, self.rollout_turns, rng.getrandbits(64))
+            stats[index] = (stats[index][0] + reward, stats[index][1] + 1)
+            total += 1
+        return stats
+
+
+def _rollout(game: Game, player_index: int, card_class: Optional[Type[Card]], strategy: Strategy, rollout_turns: int, seed: int) -> float:
+    # Play out a fork of the game in which the player buys the card, scoring 1 for a win (split between tied winners)
+    forked_game = game.fork(interactions_class=RolloutInteraction.using(strategy), seed=seed)
+    max_turns = forked_game.num_turns + rollout_turns
+    if forked_game.limits.max_turns is not None:
+        max_turns = min(max_turns, forked_game.limits.max_turns)
+    forked_game.limits = replace(forked_game.limits, max_turns=max_turns)
+    # Don't peek at the order of anyone's deck
+    for player in forked_game.players:
+        forked_game.rng.shuffle(player.deck)
+    forked_player = forked_game.players[player_index]
+    forked_player.interactions.pending_buys.append(card_class)
+    forked_game.resume()
+    _, _, winners = forked_game.scores
+    return 1 / len(winners) if forked_player.name in winners else 0.0
+
+
+def _ucb1(stats: Stats, total: int, exploration: float) -> int:
+    # The candidate with the highest upper confidence bound, trying each one once first
+    best_index, best_bound = 0, -1.0
+    for index, (reward, num) in enumerate(stats):
+        if num == 0:
+            return index
+        bound = reward / num + exploration * sqrt(log(total) / num)
+        if bound > best_bound:
+            best_index, best_bound = index, bound
+    return best_index
+
+
+def _read_all(fd: int) -> bytes:
+    # Read a pipe until it is closed, waiting with select so that gevent can run other greenlets meanwhile
+    chunks = []
+    try:
+        while True:
+            select.select([fd], [], [])
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
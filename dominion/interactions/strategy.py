@@ -0,0 +1,536 @@
+from __future__ import annotations
+
+import operator
+import os
+import re
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type
+
+from ..cards import base_cards, prosperity_cards
+from ..cards.cards import ACTION_BIT, CURSE_BIT, REACTION_BIT, TREASURE_BIT, VICTORY_BIT
+from ..cards.catalog import CATALOG_BY_NAME, EFFECTS, card_record
+from .auto import AutoInteraction
+
+if TYPE_CHECKING:
+    from ..cards.cards import Card
+
+
+# The comparisons a Condition can make, by symbol
+COMPARISONS: Dict[str, Callable[[int, int], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "≤": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "≥": operator.ge,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# The quantities a Condition can compare
+QUANTITIES = ("coins", "count", "owned", "provinces", "money")
+
+# A row of StrategyInteraction.buy_table: a rule, the card classes it stands for, and its conditions ready to check
+BuyTableRow = Tuple["BuyRule", Tuple[Type["Card"], ...], Tuple[Tuple[str, Callable[[int, int], bool], int, Optional[Type["Card"]]], ...]]
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    A condition on a :class:`BuyRule`, comparing a quantity to a value.
+
+    Args:
+        quantity: What to compare (one of :data:`QUANTITIES`): the $ the player can spend (``"coins"``),
+            how many of the rule's cards the player owns (``"count"``), how many of :attr:`card_class`
+            the player owns (``"owned"``), the Provinces left in the Supply (``"provinces"``) or what the
+            player's basic Treasures are worth (``"money"``).
+        comparison: How to compare the quantity to the value (a key of :data:`COMPARISONS`).
+        value: The value to compare the quantity to.
+        card_class: The card class to count, for ``"owned"``.
+    """
+    quantity: str
+    comparison: str
+    value: int
+    card_class: Optional[Type[Card]] = None
+
+    def __post_init__(self):
+        if self.quantity not in QUANTITIES:
+            raise KeyError(self.quantity)
+        if self.comparison not in COMPARISONS:
+            raise KeyError(self.comparison)
+        if (self.quantity == "owned") == (self.card_class is None):
+            raise ValueError("Only an owned condition needs a card class.")
+
+
+@dataclass(frozen=True)
+class BuyRule:
+    """
+    One row of a :class:`Strategy`'s buy table.
+
+    A rule names either a specific card class or an effect. An effect rule
+    stands for the kingdom cards with that effect, most expensive first.
+
+    Args:
+        card_class: The card class to gain.
+        effect: The effect (a key of :data:`~dominion.cards.catalog.EFFECTS`) of the kingdom cards to gain.
+        max_owned: Only gain while the player owns fewer than this many of the card class (or cards with the effect).
+        max_provinces: Only gain once at most this many Provinces are left in the Supply.
+        max_money: Only gain while the player's basic Treasures are worth at most this much.
+        conditions: Any other conditions that must all hold to gain.
+    """
+    card_class: Optional[Type[Card]] = None
+    effect: Optional[str] = None
+    max_owned: Optional[int] = None
+    max_provinces: Optional[int] = None
+    max_money: Optional[int] = None
+    conditions: Tuple[Condition, ...] = ()
+
+    def __post_init__(self):
+        if (self.card_class is None) == (self.effect is None):
+            raise ValueError("A buy rule needs exactly one of a card class or an effect.")
+        if self.effect is not None and self.effect not in EFFECTS:
+            raise KeyError(self.effect)
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """
+    A table-driven CPU strategy.
+
+    Whenever the player may gain a card, the first rule in the buy table
+    that the player can afford and whose conditions hold is followed.
+
+    Args:
+        name: The name of the strategy.
+        buy_table: The buy rules, in order of priority.
+        trash_coppers: Whether to trash (or discard) Coppers when given the option, as well as Curses and Victory cards.
+            Coppers are kept while the player's basic Treasures are worth no more than :data:`MIN_MONEY`.
+        play_order: The Action cards to play first, best first. Other Action cards are played after them,
+            non-terminals first.
+    """
+    name: str
+    buy_table: Tuple[BuyRule, ...]
+    trash_coppers: bool = False
+    play_order: Tuple[Type[Card], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str, name: Optional[str] = None) -> Strategy:
+        """
+        Compile a strategy written as text.
+
+        Each line is one of the following, and ``#`` starts a comment::
+
+            name: Witch Big Money
+            trash coppers
+            play Village, Witch
+            buy Province if $ >= 8 and count(Gold) >= 1
+            buy Witch if count < 2
+            buy drawer if provinces > 4 and count < 1
+
+        ``buy`` lines make up the buy table, in order of priority. Each names a
+        card or an effect (a key of :data:`~dominion.cards.catalog.EFFECTS`),
+        optionally followed by conditions joined by ``and``. A condition
+        compares ``$`` (the $ the player can spend), ``count`` (how many of
+        the rule's cards the player owns), ``count(Card Name)``, ``provinces``
+        (Provinces left in the Supply) or ``money`` (what the player's basic
+        Treasures are worth) to a number, with any of :data:`COMPARISONS`.
+        ``play`` lines list Action cards to play first, best first.
+
+        Args:
+            text: The strategy.
+            name: The name of the strategy, if the text doesn't name it.
+
+        Raises:
+            ValueError: If the text isn't a valid strategy.
+        """
+        buy_table: List[BuyRule] = []
+        play_order: List[Type[Card]] = []
+        trash_coppers = False
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            keyword, _, rest = line.partition(" ")
+            keyword, rest = keyword.lower(), rest.strip()
+            try:
+                if keyword == "name:":
+                    name = rest
+                elif line.lower() == "trash coppers":
+                    trash_coppers = True
+                elif keyword == "play":
+                    play_order += [_card_class_named(card_name) for card_name in rest.split(",")]
+                elif keyword == "buy":
+                    buy_table.append(_parse_buy_rule(rest))
+                else:
+                    raise ValueError(f'Unknown statement "{line}".')
+            except (KeyError, ValueError) as exception:
+                raise ValueError(f"Line {line_number} of the strategy: {exception}") from exception
+        if name is None:
+            raise ValueError("The strategy has no name.")
+        return cls(name=name, buy_table=tuple(buy_table), trash_coppers=trash_coppers, play_order=tuple(play_order))
+
+    @classmethod
+    def load(cls, path: str) -> Strategy:
+        """
+        Compile a strategy from a file (see :meth:`parse`).
+
+        Strategies without a name are named after their file.
+
+        Args:
+            path: The path of the file.
+        """
+        with open(path, encoding="utf-8") as file:
+            text = file.read()
+        return cls.parse(text, name=os.path.splitext(os.path.basename(path))[0])
+
+
+# A condition in a strategy's text, e.g. "count(Gold) >= 1"
+_CONDITION = re.compile(r"^(\$|count\s*\(\s*([^)]*?)\s*\)|count|provinces|money)\s*(<=|>=|==|!=|<|>|=|≤|≥)\s*(-?\d+)$")
+
+_QUANTITY_NAMES = {"$": "coins", "count": "count", "provinces": "provinces", "money": "money"}
+
+# Every basic and kingdom card class, by lowercase name
+_CARD_CLASSES_BY_NAME: Dict[str, Type[Card]] = {
+    card_class.name.lower(): card_class for card_class in base_cards.BASIC_CARDS + prosperity_cards.BASIC_CARDS
+}
+_CARD_CLASSES_BY_NAME.update((name.lower(), record.card_class) for name, record in CATALOG_BY_NAME.items())
+
+
+def _card_class_named(name: str) -> Type[Card]:
+    # Look up a basic or kingdom card by its name, ignoring case
+    name = name.strip()
+    try:
+        return _CARD_CLASSES_BY_NAME[name.lower()]
+    except KeyError:
+        raise ValueError(f'There is no card named "{name}".') from None
+
+
+def _parse_buy_rule(text: str) -> BuyRule:
+    # A buy rule, from the rest of a "buy" line
+    target, conditions_text = re.match(r"^(.*?)(?:\s+if\s+(.*))?$", text, flags=re.IGNORECASE).groups()
+    target = target.strip()
+    rule = {"effect": target} if target in EFFECTS else {"card_class": _card_class_named(target)}
+    conditions = []
+    for condition_text in re.split(r"\s+and\s+", conditions_text, flags=re.IGNORECASE) if conditions_text else []:
+        match = _CONDITION.match(condition_text.strip())
+        if match is None:
+            raise ValueError(f'Cannot understand the condition "{condition_text}".')
+        quantity_text, card_name, comparison, value = match.groups()
+        value = int(value)
+        if card_name is not None:
+            conditions.append(Condition("owned", comparison, value, _card_class_named(card_name)))
+            continue
+        quantity = _QUANTITY_NAMES[quantity_text]
+        # Conditions that the built-in strategies use have fields of their own
+        if quantity == "count" and comparison in ("<", "<=", "≤") and "max_owned" not in rule:
+            rule["max_owned"] = value if comparison == "<" else value + 1
+        elif quantity == "provinces" and comparison in ("<", "<=", "≤") and "max_provinces" not in rule:
+            rule["max_provinces"] = value - 1 if comparison == "<" else value
+        elif quantity == "money" and comparison in ("<", "<=", "≤") and "max_money" not in rule:
+            rule["max_money"] = value - 1 if comparison == "<" else value
+        else:
+            conditions.append(Condition(quantity, comparison, value))
+    return BuyRule(conditions=tuple(conditions), **rule)
+
+
+# A strategy that trashes Coppers keeps at least this much money in basic Treasures, so it can still buy
+MIN_MONEY = 6
+
+_BASIC_TREASURES = (base_cards.Copper, base_cards.Silver, base_cards.Gold, prosperity_cards.Platinum)
+
+# Gain the best Treasure affordable, and green as the game nears its end
+BIG_MONEY = Strategy(
+    name="Big Money",
+    buy_table=(
+        BuyRule(prosperity_cards.Colony),
+        BuyRule(prosperity_cards.Platinum),
+        BuyRule(base_cards.Province),
+        BuyRule(base_cards.Duchy, max_provinces=4),
+        BuyRule(base_cards.Estate, max_provinces=2),
+        BuyRule(base_cards.Gold),
+        BuyRule(base_cards.Duchy, max_provinces=6),
+        BuyRule(base_cards.Silver),
+    ),
+)
+
+# Big Money, plus a couple of the kingdom's best drawing cards
+BIG_MONEY_X = Strategy(
+    name="Big Money + X",
+    buy_table=(
+        BuyRule(prosperity_cards.Colony),
+        BuyRule(prosperity_cards.Platinum),
+        BuyRule(base_cards.Province),
+        BuyRule(base_cards.Duchy, max_provinces=4),
+        BuyRule(base_cards.Estate, max_provinces=2),
+        BuyRule(base_cards.Gold),
+        BuyRule(effect="drawer", max_owned=1),
+        BuyRule(base_cards.Duchy, max_provinces=6),
+        BuyRule(effect="drawer", max_owned=2),
+        BuyRule(base_cards.Silver),
+    ),
+)
+
+# Thin the deck, then build up villages and drawing cards before greening
+ENGINE = Strategy(
+    name="Engine",
+    buy_table=(
+        BuyRule(prosperity_cards.Colony),
+        BuyRule(base_cards.Province),
+        BuyRule(base_cards.Duchy, max_provinces=3),
+        BuyRule(effect="trashing", max_owned=1),
+        BuyRule(effect="plus_two_action", max_owned=2),
+        BuyRule(effect="drawer", max_owned=2),
+        BuyRule(effect="buy", max_owned=1),
+        BuyRule(prosperity_cards.Platinum),
+        BuyRule(base_cards.Gold),
+        BuyRule(effect="plus_two_action", max_owned=4),
+        BuyRule(effect="drawer", max_owned=4),
+        BuyRule(base_cards.Estate, max_provinces=2),
+        BuyRule(base_cards.Silver, max_owned=3),
+        BuyRule(base_cards.Silver, max_money=MIN_MONEY),
+        BuyRule(base_cards.Copper, max_money=MIN_MONEY),
+    ),
+    trash_coppers=True,
+)
+
+STRATEGIES: Dict[str, Strategy] = {strategy.name: strategy for strategy in (BIG_MONEY, BIG_MONEY_X, ENGINE)}
+
+
+def load_strategies(directory: str) -> List[Strategy]:
+    """
+    Compile every strategy file (named ``*.strategy``) in a directory, and add them to :data:`STRATEGIES`.
+
+    Args:
+        directory: The path of the directory.
+
+    Returns:
+        The strategies, in order of file name.
+    """
+    strategies = [Strategy.load(os.path.join(directory, file_name)) for file_name in sorted(os.listdir(directory)) if file_name.endswith(".strategy")]
+    STRATEGIES.update((strategy.name, strategy) for strategy in strategies)
+    return strategies
+
+
+def _junk_order(card: Card) -> Tuple[bool, bool, bool, int]:
+    # Sort key putting the cards a player would most like to be rid of first
+    return (
+        not card.type_bits & CURSE_BIT,
+        card.type_bits != VICTORY_BIT, # Cards that are only Victory cards do nothing in hand
+        not isinstance(card, base_cards.Copper),
+        card.cost,
+    )
+
+
+def _play_order(card: Card) -> Tuple[bool, int, int]:
+    # Sort key putting the Action cards a player would most like to play last (so the best is the max)
+    return (
+        getattr(card, "extra_actions", 0) > 0, # Non-terminals first, so terminals don't strand them
+        getattr(card, "extra_cards", 0),
+        card.cost,
+    )
+
+
+class StrategyInteraction(AutoInteraction):
+    """
+    A CPU player that follows a table-driven :class:`Strategy`.
+
+    Unlike :class:`AutoInteraction`, which chooses at random, this gains
+    cards from its strategy's buy table, plays its best Action cards first
+    and gets rid of its worst cards first. Each of these decisions is a
+    single pass over a small table or the player's hand, so simulated
+    games play out in realistic numbers of turns. Decisions without an
+    obvious heuristic are still made at random.
+
+    Use :meth:`using` to get the interactions class for another strategy.
+    """
+    strategy: Strategy = BIG_MONEY
+    _strategy_classes: Dict[Tuple[type, Strategy], Type[StrategyInteraction]] = {}
+
+    @classmethod
+    def using(cls, strategy: Strategy | str) -> Type[StrategyInteraction]:
+        """
+        Get the interactions class that follows a strategy.
+
+        Args:
+            strategy: The strategy, or the name of one of the :data:`STRATEGIES`.
+        """
+        if isinstance(strategy, str):
+            strategy = STRATEGIES[strategy]
+        try:
+            return cls._strategy_classes[cls, strategy]
+        except KeyError:
+            class_name = f"{''.join(word for word in strategy.name.title().split() if word.isalnum())}{cls.__name__}"
+            strategy_class = cls._strategy_classes[cls, strategy] = type(class_name, (cls,), {"strategy": strategy})
+            return strategy_class
+
+    def start(self):
+        super().start()
+        self._buy_table: Optional[List[BuyTableRow]] = None
+        play_order = self.strategy.play_order
+        self._play_ranks: Dict[Type[Card], int] = {card_class: len(play_order) - index for index, card_class in enumerate(play_order)}
+
+    @property
+    def buy_table(self) -> List[BuyTableRow]:
+        """
+        The strategy's buy table, with each rule paired with the card classes in the Supply it stands for
+        and with its conditions' comparisons looked up.
+
+        This is worked out the first time it is needed, once the Supply is set up.
+        """
+        if self._buy_table is None:
+            kingdom_card_classes = sorted(
+                (card_class for card_class in self.supply.card_stacks if card_record(card_class).effects),
+                key=lambda card_class: card_class._cost,
+                reverse=True,
+            )
+            self._buy_table = []
+            for rule in self.strategy.buy_table:
+                if rule.card_class is not None:
+                    card_classes = (rule.card_class,) if rule.card_class in self.supply.card_stacks else ()
+                else:
+                    card_classes = tuple(card_class for card_class in kingdom_card_classes if card_record(card_class).has_effect(rule.effect))
+                if card_classes:
+                    conditions = tuple((condition.quantity, COMPARISONS[condition.comparison], condition.value, condition.card_class) for condition in rule.conditions)
+                    self._buy_table.append((rule, card_classes, conditions))
+        return self._buy_table
+
+    def send(self, message):
+        # Nobody reads messages sent to a CPU
+        pass
+
+    def _card_class_to_gain(self, max_cost, exact_cost=False, card_type=None, invalid_card_classes=None) -> Optional[Type[Card]]:
+        card_stacks = self.supply.card_stacks
+        get_cost = self.game.current_turn.get_cost
+        card_counts = self.player.card_counts
+        provinces_left = card_stacks[base_cards.Province].cards_remaining
+        money = None
+        for rule, card_classes, conditions in self.buy_table:
+            if rule.max_provinces is not None and provinces_left > rule.max_provinces:
+                continue
+            if rule.max_money is not None:
+                if money is None:
+                    money = self._money()
+                if money > rule.max_money:
+                    continue
+            if rule.max_owned is not None and sum(card_counts.get(card_class, 0) for card_class in card_classes) >= rule.max_owned:
+                continue
+            if conditions and not all(compare(self._quantity(quantity, card_classes, max_cost, condition_card_class), value) for quantity, compare, value, condition_card_class in conditions):
+                continue
+            for card_class in card_classes:
+                if card_type is not None and not card_class.type_bits & card_type.value:
+                    continue
+                if invalid_card_classes and card_class in invalid_card_classes:
+                    continue
+                cost = get_cost(card_class)
+                if cost > max_cost or (exact_cost and cost != max_cost) or card_stacks[card_class].is_empty:
+                    continue
+                return card_class
+        return None
+
+    def _quantity(self, quantity: str, card_classes: Tuple[Type[Card], ...], max_cost: int, card_class: Optional[Type[Card]]) -> int:
+        # The value of one of the QUANTITIES that a buy rule's conditions compare
+        if quantity == "coins":
+            return max_cost
+        if quantity == "count":
+            return sum(self.player.card_counts.get(card_class, 0) for card_class in card_classes)
+        if quantity == "owned":
+            return self.player.card_counts.get(card_class, 0)
+        if quantity == "provinces":
+            return self.supply.card_stacks[base_cards.Province].cards_remaining
+        return self._money()
+
+    def _most_expensive(self, card_classes: List[Type[Card]]) -> Optional[Type[Card]]:
+        # When forced to gain something off the table, take the priciest card that isn't a Curse
+        get_cost = self.game.current_turn.get_cost
+        return max(card_classes, key=lambda card_class: (not card_class.type_bits & CURSE_BIT, get_cost(card_class)), default=None)
+
+    def choose_card_class_from_supply(self, prompt, max_cost, force, invalid_card_classes=None, exact_cost=False):
+        self.sleep_random()
+        card_class = self._card_class_to_gain(max_cost, exact_cost=exact_cost, invalid_card_classes=invalid_card_classes)
+        if card_class is not None or not force:
+            return card_class
+        return self._most_expensive(self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, invalid_card_classes=invalid_card_classes))
+
+    def choose_specific_card_type_from_supply(self, prompt, max_cost, card_type, force, exact_cost=False):
+        self.sleep_random()
+        card_class = self._card_class_to_gain(max_cost, exact_cost=exact_cost, card_type=card_type)
+        if card_class is not None or not force:
+            return card_class
+        return self._most_expensive(self.supply.card_classes_costing(max_cost, exact_cost=exact_cost, card_type=card_type))
+
+    def _money(self) -> int:
+        # How much the player's basic Treasures are worth altogether
+        card_counts = self.player.card_counts
+        return sum(card_counts.get(card_class, 0) * card_class.value for card_class in _BASIC_TREASURES)
+
+    def _spare_coppers(self) -> int:
+        # How many Coppers the player can get rid of without dropping below MIN_MONEY
+        if not self.strategy.trash_coppers:
+            return 0
+        card_counts = self.player.card_counts
+        return min(self._money() - MIN_MONEY, card_counts.get(base_cards.Copper, 0))
+
+    def _has_junk_in_hand(self) -> bool:
+        spare_coppers = self._spare_coppers()
+        return any(
+            card.type_bits & CURSE_BIT or card.type_bits == VICTORY_BIT or (spare_coppers > 0 and isinstance(card, base_cards.Copper))
+            for card in self.hand
+        )
+
+    def choose_card_from_hand(self, prompt, force, invalid_cards=None) -> Optional[Card]:
+        valid_cards = [card for card in self.hand if invalid_cards is None or card not in invalid_cards]
+        if not force and valid_cards and all(card.type_bits & REACTION_BIT for card in valid_cards):
+            # Always react. The game stops asking once no Reaction can be revealed again
+            # (e.g., a Moat already revealed to this attack, or a Diplomat in too small a hand)
+            self.sleep_random()
+            return valid_cards[0]
+        if force and valid_cards:
+            return self.choose_cards_from_hand(prompt, force, invalid_cards=invalid_cards)[0]
+        return super().choose_card_from_hand(prompt, force, invalid_cards=invalid_cards)
+
+    def choose_cards_from_hand(self, prompt, force, max_cards=1, invalid_cards=None) -> List[Card]:
+        valid_cards = [card for card in self.hand if invalid_cards is None or card not in invalid_cards]
+        if not valid_cards:
+            return super().choose_cards_from_hand(prompt, force, max_cards=max_cards, invalid_cards=invalid_cards)
+        self.sleep_random()
+        if max_cards is None:
+            max_cards = len(valid_cards)
+        # Get rid of the worst cards first, and only of junk unless forced to
+        valid_cards.sort(key=_junk_order)
+        spare_coppers = self._spare_coppers()
+        junk, others, money = [], [], []
+        for card in valid_cards:
+            if isinstance(card, base_cards.Copper) and spare_coppers > 0:
+                spare_coppers -= 1
+                junk.append(card)
+            elif card.type_bits & CURSE_BIT or card.type_bits == VICTORY_BIT:
+                junk.append(card)
+            elif card.type_bits & TREASURE_BIT:
+                money.append(card)
+            else:
+                others.append(card)
+        if force:
+            # Part with other cards before the money the player can't spare
+            junk += others + money
+        return junk[:max_cards]
+
+    def choose_specific_card_type_from_hand(self, prompt, card_type, force=False):
+        self.sleep_random()
+        cards = [card for card in self.hand if card.type_bits & card_type.value]
+        if not cards:
+            return None
+        if card_type.value & ACTION_BIT:
+            if not self._has_junk_in_hand():
+                # Don't play trashers with nothing worth trashing
+                cards = [card for card in cards if not card_record(type(card)).has_effect("trashing")] or (cards if force else [])
+            return max(cards, key=lambda card: (self._play_ranks.get(type(card), 0), _play_order(card)), default=None)
+        if force:
+            return min(cards, key=_junk_order)
+        return None
+
+    def choose_treasures_from_hand(self, prompt):
+        # Always play every Treasure
+        self.sleep_random()
+        return [card for card in self.hand if card.type_bits & TREASURE_BIT]
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cards import ALL_KINGDOM_CARDS
+from .interactions.strategy import STRATEGIES
+from .limits import GameLimits
+from .simulator import VANILLA_KINGDOM_CARD_CLASSES, SimulationResults, VectorizedSimulator, simulate_with_game
+
+
+# The states of a simulation job
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_KINGDOM_CARDS_BY_NAME = {card_class.name: card_class for card_class in ALL_KINGDOM_CARDS}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kingdom TEXT NOT NULL,
+    strategies TEXT NOT NULL,
+    num_games INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    wins TEXT,
+    total_scores TEXT,
+    total_turns INTEGER NOT NULL DEFAULT 0,
+    truncated_games INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_by_update ON jobs (updated_at);
+"""
+
+_COLUMNS = "id, kingdom, strategies, num_games, seed, status, games_played, wins, total_scores, total_turns, truncated_games, error, updated_at"
+
+
+@dataclass(frozen=True)
+class SimulationJob:
+    """
+    A batch of simulated games, as kept in a :class:`JobQueue`.
+
+    The results are running totals, so a job's progress can be shown while
+    it runs, and a job interrupted part way through carries on from them.
+
+    Args:
+        id: The job's ID.
+        kingdom: The names of the kingdom cards.
+        strategies: The name of each player's strategy (one of the :data:`~dominion.interactions.strategy.STRATEGIES`).
+        num_games: The number of games to play.
+        seed: The seed to play the games with.
+        status: One of :data:`QUEUED`, :data:`RUNNING`, :data:`DONE` or :data:`FAILED`.
+        games_played: The number of games played so far.
+        wins: Each player's wins so far, with tied wins split.
+        total_scores: Each player's victory points so far.
+        total_turns: The total length (in turns across all players) of the games so far.
+        truncated_games: The number of games so far stopped by one of their limits (e.g., because they stalled).
+        error: Why the job failed, if it did.
+        updated_at: When the job last changed.
+    """
+    id: int
+    kingdom: Tuple[str, ...]
+    strategies: Tuple[str, ...]
+    num_games: int
+    seed: int
+    status: str
+    games_played: int
+    wins: Tuple[float, ...]
+    total_scores: Tuple[int, ...]
+    total_turns: int
+    truncated_games: int
+    error: Optional[str]
+    updated_at: float
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> SimulationJob:
+        id, kingdom, strategies, num_games, seed, status, games_played, wins, total_scores, total_turns, truncated_games, error, updated_at = row
+        strategies = tuple(json.loads(strategies))
+        return cls(
+            id=id,
+            kingdom=tuple(json.loads(kingdom)),
+            strategies=strategies,
+            num_games=num_games,
+            seed=seed,
+            status=status,
+            games_played=games_played,
+            wins=tuple(json.loads(wins)) if wins is not None else (0.0,) * len(strategies),
+            total_scores=tuple(json.loads(total_scores)) if total_scores is not None else (0,) * len(strategies),
+            total_turns=total_turns,
+            truncated_games=truncated_games,
+            error=error,
+            updated_at=updated_at,
+        )
+
+    @property
+    def progress(self) -> float:
+        """
+        The fraction of the games played so far.
+        """
+        return self.games_played / self.num_games
+
+    @property
+    def json(self):
+        """
+        The job's progress and results so far, for the client.
+        """
+        games_played = max(self.games_played, 1)
+        return {
+            "id": self.id,
+            "kingdom": list(self.kingdom),
+            "strategies": list(self.strategies),
+            "status": self.status,
+            "num_games": self.num_games,
+            "games_played": self.games_played,
+            "progress": self.progress,
+            "win_rates": [wins / games_played for wins in self.wins],
+            "mean_scores": [total_score / games_played for total_score in self.total_scores],
+            "mean_game_length": self.total_turns / games_played,
+            "truncated_games": self.truncated_games,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Simulation jobs, kept in a SQLite database so that they outlive the processes that submit and run them.
+
+    The web server submits jobs and reads their progress, and a
+    :class:`JobWorker` in a process of its own claims and runs them, so
+    simulations never take CPU time from the games being played.
+
+    Args:
+        path: The path of the database file.
+    """
+    def __init__(self, path: str):
+        # The server and the worker use the database at the same time, so readers mustn't block the writer
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self._connection.close()
+
+    def submit(self, kingdom: Sequence[str], strategies: Sequence[str], num_games: int, seed: Optional[int] = None) -> int:
+        """
+        Queue a simulation job.
+
+        Args:
+            kingdom: The names of the kingdom cards.
+            strategies: The name of each player's strategy.
+            num_games: The number of games to play.
+            seed: The seed to play the games with (random if :obj:`None`).
+
+        Returns:
+            The job's ID.
+
+        Raises:
+            ValueError: If the job can't be run.
+        """
+        kingdom, strategies = list(kingdom), list(strategies)
+        unknown_cards = [card_name for card_name in kingdom if card_name not in _KINGDOM_CARDS_BY_NAME]
+        if unknown_cards:
+            raise ValueError(f"Unknown kingdom cards: {', '.join(unknown_cards)}.")
+        if not kingdom or len(set(kingdom)) != len(kingdom):
+            raise ValueError("A kingdom needs one or more different cards.")
+        unknown_strategies = [strategy_name for strategy_name in strategies if strategy_name not in STRATEGIES]
+        if unknown_strategies:
+            raise ValueError(f"Unknown strategies: {', '.join(unknown_strategies)}.")
+        if not 2 <= len(strategies) <= 6:
+            raise ValueError("Games need 2 to 6 players.")
+        if num_games < 1:
+            raise ValueError("A job needs at least one game.")
+        if seed is None:
+            seed = random.getrandbits(32)
+        now = time.time()
+        cursor = self._connection.execute(
+            "INSERT INTO jobs (kingdom, strategies, num_games, seed, status, submitted_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (json.dumps(kingdom), json.dumps(strategies), num_games, seed, QUEUED, now, now),
+        )
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[SimulationJob]:
+        """
+        Get a job, or :obj:`None` if there is no such job.
+
+        Args:
+            job_id: The job's ID.
+        """
+        row = self._connection.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return SimulationJob._from_row(row) if row is not None else None
+
+    def updated_since(self, since: float) -> List[SimulationJob]:
+        """
+        Get the jobs that have changed since some time, oldest change first.
+
+        Args:
+            since: The time (as from :func:`time.time`).
+        """
+        rows = self._connection.execute(f"SELECT {_COLUMNS} FROM jobs WHERE updated_at > ? ORDER BY updated_at", (since,)).fetchall()
+        return [SimulationJob._from_row(row) for row in rows]
+
+    def claim(self) -> Optional[SimulationJob]:
+        """
+        Mark the oldest queued job as running and return it, or :obj:`None` if there are no queued jobs.
+        """
+        row = self._connection.execute(
+            f"""
+            UPDATE jobs SET status = ?, updated_at = ?
+            WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1)
+            RETURNING {_COLUMNS}
+            """,
+            (RUNNING, time.time(), QUEUED),
+        ).fetchone()
+        return SimulationJob._from_row(row) if row is not None else None
+
+    def requeue_running(self) -> int:
+        """
+        Queue again the jobs left running by a worker that stopped, keeping their results so far.
+
+        Returns:
+            The number of jobs queued again.
+        """
+        cursor = self._connection.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?", (QUEUED, time.time(), RUNNING))
+        return cursor.rowcount
+
+    def record_progress(self, job_id: int, games_played: int, wins: Sequence[float], total_scores: Sequence[int], total_turns: int, truncated_games: int, finished: bool = False):
+        """
+        Save a job's results so far.
+
+        Args:
+            job_id: The job's ID.
+            games_played: The number of games played so far.
+            wins: Each player's wins so far.
+            total_scores: Each player's victory points so far.
+            total_turns: The total length of the games so far.
+            truncated_games: The number of games so far stopped by one of their limits.
+            finished: Whether the job is done.
+        """
+        self._connection.execute(
+            "UPDATE jobs SET status = ?, games_played = ?, wins = ?, total_scores = ?, total_turns = ?, truncated_games = ?, updated_at = ? WHERE id = ?",
+            (DONE if finished else RUNNING, games_played, json.dumps(list(wins)), json.dumps(list(total_scores)), total_turns, truncated_games, time.time(), job_id),
+        )
+
+    def fail(self, job_id: int, error: str):
+        """
+        Mark a job as failed.
+
+        Args:
+            job_id: The job's ID.
+            error: Why the job failed.
+        """
+        self._connection.execute("UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?", (FAILED, error, time.time(), job_id))
+
+
+class JobWorker:
+    """
+    Runs the jobs of a :class:`JobQueue`, one at a time, in worker processes.
+
+    Each job is played in chunks of games, spread over the worker
+    processes, and its results so far are saved as each chunk finishes (in
+    order). Each chunk is seeded from the job's seed and the number of
+    games before it, so a job that is interrupted and carried on by another
+    worker plays the same games it would have. Kingdoms the
+    :class:`~dominion.simulator.VectorizedSimulator` supports are played
+    with it, and others with the full game engine.
+
+    Args:
+        queue: The queue to run the jobs of.
+        num_workers: The number of worker processes, or 0 to play the games in this process.
+        chunk_size: The number of games per chunk.
+        poll_interval: How long (in seconds) to wait for a job when there are none queued.
+        limits: The limits of each game (by default, :meth:`~dominion.limits.GameLimits.for_simulation`).
+    """
+    def __init__(
+        self,
+        queue: JobQueue,
+        num_workers: int = os.cpu_count() or 1,
+        chunk_size: int = 500,
+        poll_interval: float = 1.0,
+        limits: Optional[GameLimits] = None,
+    ):
+        self.queue = queue
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.limits = limits if limits is not None else GameLimits.for_simulation()
+
+    def run_forever(self):
+        """
+        Run queued jobs as they come, starting with any left running by a worker that stopped.
+        """
+        self.queue.requeue_running()
+        with self._executor() as executor:
+            while True:
+                if not self.run_next(executor):
+                    time.sleep(self.poll_interval)
+
+    def run_next(self, executor: Optional[Executor] = None) -> bool:
+        """
+        Run the oldest queued job to the end.
+
+        Args:
+            executor: Where to play the chunks of games (in this process if :obj:`None`).
+
+        Returns:
+            Whether there was a job to run.
+        """
+        job = self.queue.claim()
+        if job is None:
+            return False
+        games_played, wins, total_scores, total_turns, truncated_games = job.games_played, list(job.wins), list(job.total_scores), job.total_turns, job.truncated_games
+        try:
+            chunks = self._chunks(job)
+            results = executor.map(_play_chunk, *zip(*chunks)) if executor is not None else (_play_chunk(*chunk) for chunk in chunks)
+            for (_, _, num_games, _, _), (chunk_wins, chunk_scores, chunk_turns, chunk_truncated_games) in zip(chunks, results):
+                games_played += num_games
+                wins = [total + chunk_total for total, chunk_total in zip(wins, chunk_wins)]
+                total_scores = [total + chunk_total for total, chunk_total in zip(total_scores, chunk_scores)]
+                total_turns += chunk_turns
+                truncated_games += chunk_truncated_games
+                self.queue.record_progress(job.id, games_played, wins, total_scores, total_turns, truncated_games, finished=games_played == job.num_games)
+        except BrokenProcessPool:
+            # The worker can't carry on, but the job can be carried on by the next one
+            raise
+        except Exception as exception:
+            # A job that can't be run mustn't stop the jobs after it
+            self.queue.fail(job.id, repr(exception))
+        return True
+
+    def _chunks(self, job: SimulationJob) -> List[Tuple[Tuple[str, ...], Tuple[str, ...], int, Tuple[int, int], GameLimits]]:
+        return [
+            (job.kingdom, job.strategies, min(self.chunk_size, job.num_games - start), (job.seed, start), self.limits)
+            for start in range(job.games_played, job.num_games, self.chunk_size)
+        ]
+
+    def _executor(self) -> ContextManager[Optional[Executor]]:
+        if self.num_workers < 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return nullcontext()
+        # Forked workers inherit the strategies loaded in this process
+        return ProcessPoolExecutor(self.num_workers, mp_context=multiprocessing.get_context("fork"), initializer=_start_worker)
+
+
+def _start_worker():
+    # Games print as they go, which nobody reads in a worker
+    sys.stdout = open(os.devnull, "w")
+
+
+def _play_chunk(kingdom_names: Tuple[str, ...], strategy_names: Tuple[str, ...], num_games: int, seed: Tuple[int, int], limits: GameLimits) -> Tuple[List[float], List[int], int, int]:
+    # Each player's wins and victory points, the total length of the games and how many were truncated
+    kingdom = [_KINGDOM_CARDS_BY_NAME[card_name] for card_name in kingdom_names]
+    strategies = [STRATEGIES[strategy_name] for strategy_name in strategy_names]
+    chunk_seed = int(np.random.SeedSequence(seed).generate_state(1)[0])
+    if all(card_class in VANILLA_KINGDOM_CARD_CLASSES for card_class in kingdom):
+        results: SimulationResults = VectorizedSimulator(kingdom, strategies, limits=limits, seed=chunk_seed).run(num_games)
+    else:
+        random.seed(chunk_seed)
+        results = simulate_with_game(kingdom, strategies, num_games=num_games, limits=limits)
+    winners = results.winners
+    wins = (winners / winners.sum(axis=1, keepdims=True)).sum(axis=0)
+    return wins.tolist(), results.scores.sum(axis=0).tolist(), int(results.turns.sum()), int(results.truncated.sum())
+
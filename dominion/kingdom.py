@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from itertools import permutations
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple, Type
+
+# The catalog is imported directly (rather than through the package) since
+# this module is imported by the Supply while the package is still initializing
+from .cards.cards import ATTACK_BIT
+from .cards.catalog import EFFECTS, card_record
+
+if TYPE_CHECKING:
+    from .cards.cards import Card
+
+
+KINGDOM_SIZE = 10
+DISTRIBUTED_COSTS = (2, 3, 4, 5)
+CARDS_PER_DISTRIBUTED_COST = 2
+
+
+class KingdomInfeasibleError(ValueError):
+    '''
+    Raised when no kingdom can satisfy the requested constraints.
+
+    Args:
+        reason: Why the constraints cannot be satisfied.
+    '''
+    def __init__(self, reason: str):
+        message = f'Cannot generate a kingdom: {reason}'
+        super().__init__(message)
+
+
+class CandidatePool:
+    """
+    Kingdom card classes indexed by cost, type and effect.
+
+    Pools only depend on the card classes they are built from, so they are
+    built once and shared (see :func:`candidate_pool`).
+
+    Args:
+        card_classes: The card classes in the pool.
+    """
+    def __init__(self, card_classes: Iterable[Type[Card]]):
+        # Sorted so that a seeded random number generator gives reproducible kingdoms
+        self._card_classes: Tuple[Type[Card], ...] = tuple(sorted(set(card_classes), key=lambda card_class: (card_class._cost, card_class.name)))
+        self._by_cost: Dict[int, Tuple[Type[Card], ...]] = {}
+        self._by_effect: Dict[str, Tuple[Type[Card], ...]] = {effect: () for effect in EFFECTS}
+        for card_class in self._card_classes:
+            record = card_record(card_class)
+            self._by_cost[record.cost] = self._by_cost.get(record.cost, ()) + (card_class,)
+            for effect in record.effects:
+                self._by_effect[effect] += (card_class,)
+        self._non_attacks = tuple(card_class for card_class in self._card_classes if not card_class.type_bits & ATTACK_BIT)
+
+    @property
+    def card_classes(self) -> Tuple[Type[Card], ...]:
+        """
+        All card classes in the pool, ordered by cost and then by name.
+        """
+        return self._card_classes
+
+    @property
+    def non_attacks(self) -> Tuple[Type[Card], ...]:
+        """
+        The card classes in the pool that are not Attacks.
+        """
+        return self._non_attacks
+
+    def costing(self, cost: int) -> Tuple[Type[Card], ...]:
+        """
+        The card classes in the pool with a given (unmodified) cost.
+
+        Args:
+            cost: The cost.
+        """
+        return self._by_cost.get(cost, ())
+
+    def with_effect(self, effect: str) -> Tuple[Type[Card], ...]:
+        """
+        The card classes in the pool with a given effect.
+
+        Args:
+            effect: The name of the effect (a key of :data:`~dominion.cards.catalog.EFFECTS`).
+        """
+        return self._by_effect[effect]
+
+
+# A bit for each effect, so a card's effects can be tested all at once
+EFFECT_BITS: Dict[str, int] = {effect: 1 << index for index, effect in enumerate(EFFECTS)}
+
+
+def _effect_bits(card_class: Type[Card]) -> int:
+    bits = 0
+    for effect in card_record(card_class).effects:
+        bits |= EFFECT_BITS[effect]
+    return bits
+
+
+def _draw(rng: random.Random, card_classes: Tuple[Type[Card], ...], num_cards: int, excluded: Set[Type[Card]], num_excluded: int) -> List[Type[Card]]:
+    # Draw up to num_cards distinct card classes, skipping the excluded ones (num_excluded of which are among card_classes)
+    num_available = len(card_classes)
+    if num_available < 2 * (num_cards + num_excluded):
+        # Few cards to spare, so sample without replacement (oversampling by the excluded cards)
+        sample = rng.sample(card_classes, min(num_available, num_cards + num_excluded))
+        return [card_class for card_class in sample if card_class not in excluded][:num_cards]
+    # Plenty to spare, so picking at random and retrying on repeats is faster and rarely retries
+    drawn = []
+    excluded = set(excluded)
+    random_ = rng.random
+    while len(drawn) < num_cards:
+        card_class = card_classes[int(random_() * num_available)]
+        if card_class not in excluded:
+            excluded.add(card_class)
+            drawn.append(card_class)
+    return drawn
+
+
+@lru_cache(maxsize=None)
+def _candidate_pool(card_classes: FrozenSet[Type[Card]]) -> CandidatePool:
+    return CandidatePool(card_classes)
+
+
+def candidate_pool(card_classes: Iterable[Type[Card]]) -> CandidatePool:
+    """
+    Get the (shared) candidate pool for some card classes.
+
+    Args:
+        card_classes: The card classes in the pool.
+    """
+    return _candidate_pool(frozenset(card_classes))
+
+
+class KingdomGenerator:
+    """
+    Randomly generates kingdoms satisfying a set of constraints.
+
+    All of the work that does not depend on chance (filtering out Attacks,
+    finding which cards can satisfy each required effect and which costs
+    can be distributed) is done once, when the generator is created. This
+    is also when infeasible constraints are reported, so each call to
+    :meth:`generate` only has to draw cards.
+
+    Args:
+        card_classes: The kingdom card classes to choose from.
+        required_card_classes: Card classes that must be in every kingdom.
+        required_effects: Effects (keys of :data:`~dominion.cards.catalog.EFFECTS`) that at least one card in every kingdom must have.
+        distribute_cost: Whether to include at least two cards each of cost 2, 3, 4 and 5, as far as the card classes allow.
+        disable_attack_cards: Whether to leave out Attack cards (other than required ones).
+        rng: The random number generator to use. Defaults to the :mod:`random` module.
+    """
+    def __init__(
+        self,
+        card_classes: Iterable[Type[Card]],
+        required_card_classes: Iterable[Type[Card]] = (),
+        required_effects: Iterable[str] = (),
+        distribute_cost: bool = False,
+        disable_attack_cards: bool = False,
+        rng: random.Random | None = None,
+    ):
+        pool = candidate_pool(card_classes)
+        self._rng = rng if rng is not None else random
+        # Required cards are always included (even if they are Attacks)
+        self._required_card_classes = tuple(sorted(set(required_card_classes), key=lambda card_class: (card_class._cost, card_class.name)))
+        for required_card_class in self._required_card_classes:
+            if required_card_class not in pool.card_classes:
+                raise KingdomInfeasibleError(f"required card class {required_card_class.name} is not in the selected expansions")
+        if len(self._required_card_classes) > KINGDOM_SIZE:
+            raise KingdomInfeasibleError(f"{len(self._required_card_classes)} card classes are required but a kingdom only has {KINGDOM_SIZE}")
+        required = set(self._required_card_classes)
+        candidates = pool.non_attacks if disable_attack_cards else pool.card_classes
+        self._candidates = tuple(card_class for card_class in candidates if card_class not in required)
+        if len(self._required_card_classes) + len(self._candidates) < KINGDOM_SIZE:
+            raise KingdomInfeasibleError(f"only {len(self._required_card_classes) + len(self._candidates)} kingdom card classes are available")
+        candidate_set = set(self._candidates)
+        # Effects not already satisfied by a required card, with the cards that could satisfy them
+        effect_candidates: List[Tuple[int, Tuple[Type[Card], ...]]] = []
+        for effect in required_effects:
+            if effect not in EFFECTS:
+                raise KeyError(effect)
+            if any(card_record(card_class).has_effect(effect) for card_class in self._required_card_classes):
+                continue
+            card_classes_with_effect = tuple(card_class for card_class in pool.with_effect(effect) if card_class in candidate_set)
+            if not card_classes_with_effect:
+                raise KingdomInfeasibleError(f"no available card has the required effect {effect}")
+            effect_candidates.append((EFFECT_BITS[effect], card_classes_with_effect))
+        if len(self._required_card_classes) + len(effect_candidates) > KINGDOM_SIZE:
+            raise KingdomInfeasibleError("there are more required cards and effects than a kingdom has room for")
+        # Costs to distribute, with how many cards of each cost the required cards already provide
+        cost_candidates: List[Tuple[int, int, Tuple[Type[Card], ...]]] = []
+        if distribute_cost:
+            for cost in DISTRIBUTED_COSTS:
+                card_classes_of_cost = tuple(card_class for card_class in pool.costing(cost) if card_class in candidate_set)
+                num_required = sum(1 for card_class in self._required_card_classes if card_record(card_class).cost == cost)
+                # It's possible that the expansions don't have enough cards of a cost (e.g., Prosperity has no cards costing 2 $)
+                if card_classes_of_cost and num_required < CARDS_PER_DISTRIBUTED_COST:
+                    cost_candidates.append((cost, num_required, card_classes_of_cost))
+        # Every order to handle the effects and costs in, so picking one at random is a single draw
+        self._effect_orders = list(permutations(effect_candidates))
+        self._cost_orders = list(permutations(cost_candidates))
+        self._card_effect_bits = {card_class: _effect_bits(card_class) for card_class in self._candidates}
+        self._card_costs = {card_class: card_record(card_class).cost for card_class in self._candidates}
+
+    @property
+    def candidates(self) -> Tuple[Type[Card], ...]:
+        """
+        The card classes that may be chosen, other than the required ones.
+        """
+        return self._candidates
+
+    def generate(self) -> List[Type[Card]]:
+        """
+        Generate one kingdom.
+
+        Returns:
+            The kingdom's card classes.
+        """
+        rng = self._rng
+        selected = list(self._required_card_classes)
+        chosen = set() # Selected card classes that are also candidates
+        # Find and add in kingdom cards satisfying the required effects
+        effect_orders = self._effect_orders
+        if effect_orders[0]:
+            # Handle the effects in a random order so some cards don't get preferential treatment every game
+            satisfied_effect_bits = 0
+            card_effect_bits = self._card_effect_bits
+            for effect_bit, card_classes in effect_orders[rng.randrange(len(effect_orders))]:
+                # The effect may happen to be satisfied by a previously selected card
+                if satisfied_effect_bits & effect_bit:
+                    continue
+                # Since no chosen card has the effect, none of the candidates have been chosen yet
+                card_class = rng.choice(card_classes)
+                selected.append(card_class)
+                chosen.add(card_class)
+                satisfied_effect_bits |= card_effect_bits[card_class]
+        # Make sure there are at least two kingdom cards of each distributed cost, as far as possible
+        cost_orders = self._cost_orders
+        if cost_orders[0]:
+            # Handle the costs in a random order so no cost gets preferential treatment when room runs out
+            card_costs = self._card_costs
+            for cost, num_required, card_classes in cost_orders[rng.randrange(len(cost_orders))]:
+                num_chosen = sum(1 for card_class in chosen if card_costs[card_class] == cost)
+                num_still_needed = min(CARDS_PER_DISTRIBUTED_COST - num_required - num_chosen, KINGDOM_SIZE - len(selected))
+                if num_still_needed <= 0:
+                    continue
+                for card_class in _draw(rng, card_classes, num_still_needed, chosen, num_chosen):
+                    selected.append(card_class)
+                    chosen.add(card_class)
+        # Select the remaining cards at random
+        num_cards_remaining = KINGDOM_SIZE - len(selected)
+        if num_cards_remaining > 0:
+            selected += _draw(rng, self._candidates, num_cards_remaining, chosen, len(chosen))
+        return selected
+
+    def generate_many(self, num_kingdoms: int) -> Iterator[List[Type[Card]]]:
+        """
+        Generate several kingdoms, e.g. for a simulation sweep.
+
+        Args:
+            num_kingdoms: The number of kingdoms to generate.
+        """
+        for _ in range(num_kingdoms):
+            yield self.generate()
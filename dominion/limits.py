@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+@dataclass
+class GameLimits:
+    """
+    Resource budgets for a single game.
+
+    A limit of :obj:`None` means that resource is unbounded.
+
+    The stall limits catch games that would otherwise never end, such as
+    games between CPUs that never buy Provinces. They are checked at the
+    end of every round (once each player has taken a turn).
+
+    Args:
+        max_turns: The number of turns (across all players) after which the game ends.
+        max_decisions: The number of player decisions (across all players) after which the game ends.
+        max_log_entries: The number of game log entries to keep. Beyond this, the oldest entries are discarded.
+        max_rounds_without_score_change: The number of rounds in a row without any player's score changing
+            after which the game ends.
+        max_rounds_without_supply_change: The number of rounds in a row without any Supply pile changing
+            after which the game ends.
+        max_repeated_positions: The number of times the game may end a round in the same position
+            (the same Supply piles and the same cards owned by each player) before it ends.
+    """
+    max_turns: int | None = None
+    max_decisions: int | None = None
+    max_log_entries: int | None = None
+    max_rounds_without_score_change: int | None = None
+    max_rounds_without_supply_change: int | None = None
+    max_repeated_positions: int | None = None
+
+    @classmethod
+    def for_simulation(cls) -> GameLimits:
+        """
+        Get limits for games between CPUs, which stop any game that runs long or stalls.
+        """
+        return cls(max_turns=200, max_rounds_without_score_change=50, max_rounds_without_supply_change=20, max_repeated_positions=5)
+
+    @property
+    def detects_stalls(self) -> bool:
+        """
+        Whether any of the stall limits is set.
+        """
+        return (
+            self.max_rounds_without_score_change is not None
+            or self.max_rounds_without_supply_change is not None
+            or self.max_repeated_positions is not None
+        )
+
+    def turns_exceeded(self, num_turns: int) -> bool:
+        """
+        Whether a number of turns has reached the turn limit.
+
+        Args:
+            num_turns: The number of turns played.
+        """
+        return self.max_turns is not None and num_turns >= self.max_turns
+
+    def decisions_exceeded(self, num_decisions: int) -> bool:
+        """
+        Whether a number of decisions has reached the decision limit.
+
+        Args:
+            num_decisions: The number of decisions made.
+        """
+        return self.max_decisions is not None and num_decisions >= self.max_decisions
+
+    def stall_reached(self, detector: StallDetector) -> Optional[str]:
+        """
+        Check whether a game has reached one of the stall limits.
+
+        Args:
+            detector: The game's stall detector.
+
+        Returns:
+            An explanation of the stall, or :obj:`None` if the game hasn't stalled.
+        """
+        if self.max_rounds_without_score_change is not None and detector.rounds_without_score_change >= self.max_rounds_without_score_change:
+            return f"Nobody's score changed for {detector.rounds_without_score_change} rounds, so the game was stopped."
+        if self.max_rounds_without_supply_change is not None and detector.rounds_without_supply_change >= self.max_rounds_without_supply_change:
+            return f"The Supply didn't change for {detector.rounds_without_supply_change} rounds, so the game was stopped."
+        if self.max_repeated_positions is not None and detector.most_repeated_position >= self.max_repeated_positions:
+            return f"The game reached the same position {detector.most_repeated_position} times, so it was stopped."
+        return None
+
+
+class StallDetector:
+    """
+    Keeps track of how a game has changed from round to round, for the stall limits of :class:`GameLimits`.
+    """
+    def __init__(self):
+        self.rounds_without_score_change = 0
+        self.rounds_without_supply_change = 0
+        self.most_repeated_position = 0
+        self._scores: Optional[Tuple[int, ...]] = None
+        self._supply: Optional[Tuple[float, ...]] = None
+        self._positions: Counter[Hashable] = Counter()
+
+    def end_round(self, game: Game):
+        """
+        Compare the game at the end of a round with the previous round.
+
+        Args:
+            game: The game.
+        """
+        scores = tuple(player.current_victory_points for player in game.players)
+        supply = tuple(stack.cards_remaining for stack in game.supply.card_stacks.values())
+        self.rounds_without_score_change = self.rounds_without_score_change + 1 if scores == self._scores else 0
+        self.rounds_without_supply_change = self.rounds_without_supply_change + 1 if supply == self._supply else 0
+        self._scores, self._supply = scores, supply
+        # Only what each player owns is compared, not how it is split between their zones
+        position = (supply, tuple(frozenset(player.card_counts.items()) for player in game.players))
+        self._positions[position] += 1
+        self.most_repeated_position = max(self.most_repeated_position, self._positions[position])
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple, Type
+
+import numpy as np
+
+from .cards.cards import ACTION_BIT, TREASURE_BIT
+
+if TYPE_CHECKING:
+    from .cards.cards import Card
+    from .player import Player
+
+
+HAND_SIZE = 5
+
+# Pascal's triangle (as floats, so that large decks don't overflow), grown as needed
+_binomials = np.ones((1, 1))
+
+
+class DrawOdds:
+    """
+    The odds of what a player's next hand will be.
+
+    Cards are drawn from the player's deck and, if it runs out, from their
+    shuffled discard pile, as at the end of their turn. Only what matters
+    for the odds is kept of each card: how much money it is worth as a
+    Treasure and whether it is a terminal Action (one giving no +Actions).
+    The hands are either worked out exactly (a multivariate hypergeometric
+    distribution over every possible hand) or sampled, many at a time, so
+    that each query is a few array operations.
+
+    Args:
+        deck: The number of each card class in the player's deck.
+        discard_pile: The number of each card class in the player's discard pile
+            when they draw (e.g., including their hand and the cards they played).
+        hand_size: The number of cards to draw.
+        num_samples: The number of hands to sample, or :obj:`None` to work out the odds exactly.
+        rng: The random generator to sample hands with.
+    """
+    def __init__(
+        self,
+        deck: Mapping[Type[Card], int],
+        discard_pile: Mapping[Type[Card], int] = {},
+        hand_size: int = HAND_SIZE,
+        num_samples: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        categories: Dict[Tuple[int, bool], int] = {}
+        deck_counts, discard_counts = [], []
+        for counts, category_counts in ((deck, deck_counts), (discard_pile, discard_counts)):
+            for card_class, count in counts.items():
+                index = categories.setdefault(_category(card_class), len(categories))
+                category_counts.extend([0] * (len(categories) - len(category_counts)))
+                category_counts[index] += count
+        num_categories = max(len(categories), 1)
+        deck_counts = np.array(deck_counts + [0] * (num_categories - len(deck_counts)), dtype=np.int64)
+        discard_counts = np.array(discard_counts + [0] * (num_categories - len(discard_counts)), dtype=np.int64)
+        self._money = np.zeros(num_categories, dtype=np.int64)
+        self._terminal = np.zeros(num_categories, dtype=np.int64)
+        for (money, terminal), index in categories.items():
+            self._money[index] = money
+            self._terminal[index] = terminal
+        if num_samples is None:
+            self._hands, self._probabilities = _exact_hands(deck_counts, discard_counts, hand_size)
+        else:
+            if rng is None:
+                rng = np.random.default_rng()
+            self._hands = _sampled_hands(deck_counts, discard_counts, hand_size, num_samples, rng)
+            self._probabilities = np.full(num_samples, 1 / num_samples)
+        self._hand_money = self._hands @ self._money
+        self._hand_terminals = self._hands @ self._terminal
+
+    @classmethod
+    def for_player(cls, player: Player, **kwargs) -> DrawOdds:
+        """
+        Get the odds of a player's next hand, once they have cleaned up this turn.
+
+        Args:
+            player: The player to get the odds for.
+            **kwargs: Passed on to :class:`DrawOdds`.
+        """
+        deck = Counter(type(card) for card in player.deck)
+        discard_pile = Counter(type(card) for card in player.discard_pile)
+        discard_pile.update(type(card) for card in player.hand)
+        discard_pile.update(type(card) for card in player.played_cards)
+        return cls(deck, discard_pile, **kwargs)
+
+    def money_distribution(self) -> np.ndarray:
+        """
+        Get the probability of the hand being worth each amount of money in Treasures.
+
+        Returns:
+            An array whose ``i``-th element is the probability of exactly $``i``.
+        """
+        return np.bincount(self._hand_money, weights=self._probabilities)
+
+    def probability_at_least(self, money: int) -> float:
+        """
+        Get the probability of the hand being worth at least some amount of money in Treasures.
+
+        Args:
+            money: The amount of money.
+        """
+        return float(self._probabilities[self._hand_money >= money].sum())
+
+    def expected_money(self) -> float:
+        """
+        Get the expected amount of money in Treasures in the hand.
+        """
+        return float(self._probabilities @ self._hand_money)
+
+    def action_collision_probability(self) -> float:
+        """
+        Get the probability of drawing two or more terminal Actions together.
+        """
+        return float(self._probabilities[self._hand_terminals >= 2].sum())
+
+
+def _category(card_class: Type[Card]) -> Tuple[int, bool]:
+    # Money is only counted for Treasures whose value is fixed (e.g., not Bank's)
+    money = 0
+    if card_class.type_bits & TREASURE_BIT and isinstance(card_class.value, int):
+        money = card_class.value
+    extra_actions = getattr(card_class, "extra_actions", 0)
+    terminal = bool(card_class.type_bits & ACTION_BIT) and not (isinstance(extra_actions, int) and extra_actions > 0)
+    return money, terminal
+
+
+def _binomial_table(n: int) -> np.ndarray:
+    # Binomial coefficients C(i, j) for i, j <= n, which are 0 when j > i
+    global _binomials
+    if len(_binomials) <= n:
+        size = max(n + 1, 2 * len(_binomials))
+        binomials = np.zeros((size, size))
+        binomials[:, 0] = 1
+        for i in range(1, size):
+            binomials[i, 1:] = binomials[i - 1, 1:] + binomials[i - 1, :-1]
+        _binomials = binomials
+    return _binomials
+
+
+@lru_cache(maxsize=None)
+def _compositions(total: int, parts: int) -> np.ndarray:
+    # Every way of splitting a total among some parts, one per row
+    if parts == 1:
+        return np.array([[total]], dtype=np.int64)
+    rows = [
+        np.column_stack((np.full(len(rest), first, dtype=np.int64), rest))
+        for first in range(total + 1)
+        for rest in (_compositions(total - first, parts - 1),)
+    ]
+    compositions = np.concatenate(rows)
+    compositions.flags.writeable = False
+    return compositions
+
+
+def _draw_exact(counts: np.ndarray, num_cards: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Every hand of num_cards drawn from a shuffled pile, and its probability
+    hands = _compositions(num_cards, len(counts))
+    binomials = _binomial_table(int(counts.sum()))
+    probabilities = binomials[counts, hands].prod(axis=1) / binomials[counts.sum(), num_cards]
+    possible = probabilities > 0
+    return hands[possible], probabilities[possible]
+
+
+def _exact_hands(deck_counts: np.ndarray, discard_counts: np.ndarray, hand_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    deck_size = int(deck_counts.sum())
+    if deck_size >= hand_size:
+        return _draw_exact(deck_counts, hand_size)
+    # The whole deck is drawn, then the rest from the reshuffled discard pile
+    hands, probabilities = _draw_exact(discard_counts, min(hand_size - deck_size, int(discard_counts.sum())))
+    return hands + deck_counts, probabilities
+
+
+def _sampled_hands(deck_counts: np.ndarray, discard_counts: np.ndarray, hand_size: int, num_samples: int, rng: np.random.Generator) -> np.ndarray:
+    deck_size = int(deck_counts.sum())
+    if deck_size >= hand_size:
+        return _draw_sampled(deck_counts, hand_size, num_samples, rng)
+    hands = _draw_sampled(discard_counts, min(hand_size - deck_size, int(discard_counts.sum())), num_samples, rng)
+    return hands + deck_counts
+
+
+def _draw_sampled(counts: np.ndarray, num_cards: int, num_samples: int, rng: np.random.Generator) -> np.ndarray:
+    # Shuffle the pile once per sample by sorting random keys, then count the categories of the top cards
+    num_categories = len(counts)
+    pile = np.repeat(np.arange(num_categories), counts)
+    if num_cards == 0 or len(pile) == 0:
+        return np.zeros((num_samples, num_categories), dtype=np.int64)
+    keys = rng.random((num_samples, len(pile)))
+    drawn = pile[np.argpartition(keys, num_cards - 1, axis=1)[:, :num_cards]]
+    drawn += np.arange(num_samples)[:, np.newaxis] * num_categories
+    return np.bincount(drawn.ravel(), minlength=num_samples * num_categories).reshape(num_samples, num_categories)
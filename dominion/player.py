@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import random
-
-from collections import deque
-from typing import TYPE_CHECKING, Optional, Deque, List, Type
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Optional, Deque, Dict, Iterable, List, Type
 
 from .cards import base_cards, intrigue_cards, prosperity_cards, cornucopia_cards, hinterlands_cards, guilds_cards
-from .cards.cards import Card, CardType, ReactionCard, ReactionType
+from .cards.cards import Card, CardType, ReactionCard, ReactionType, REACTION_BIT, VICTORY_BIT, CURSE_BIT
+from .events import EventType, GameEvent
 from .expansions import ProsperityExpansion, GuildsExpansion
-from .grammar import a, s
+from .grammar import s
 from .interactions.auto import AutoInteraction
 from .supply import SupplyStackEmptyError
 from .turn import BuyPhase
@@ -21,6 +20,102 @@ if TYPE_CHECKING:
     from .turn import Turn
 
 
+class Hand(deque):
+    """
+    A deque of cards that keeps an index of the Reaction cards it contains.
+
+    This makes checking whether a player can react to an attack or a gain
+    a constant-time operation in the usual case of there being no Reaction
+    cards in hand. What a Reaction card reacts to can depend on the state of
+    the game (e.g., Diplomat), so that is only checked when queried.
+
+    Args:
+        iterable: The cards to start with.
+        maxlen: The maximum length of the deque.
+    """
+    def __init__(self, iterable: Iterable[Card] = (), maxlen: Optional[int] = None):
+        super().__init__((), maxlen)
+        self._reaction_cards: List[ReactionCard] = []
+        self.extend(iterable)
+
+    def _index(self, card: Card):
+        if card.type_bits & REACTION_BIT:
+            self._reaction_cards.append(card)
+
+    def _unindex(self, card: Card):
+        if card.type_bits & REACTION_BIT:
+            self._reaction_cards.remove(card)
+
+    def has_reactions(self, reaction_type: ReactionType) -> bool:
+        """
+        Whether the hand contains any cards that can currently react to the given reaction type.
+
+        Args:
+            reaction_type: The reaction type.
+        """
+        return bool(self._reaction_cards) and any(reaction_type in card.reacts_to for card in self._reaction_cards)
+
+    def reactions(self, reaction_type: ReactionType) -> List[ReactionCard]:
+        """
+        The cards in the hand that can currently react to the given reaction type.
+
+        Args:
+            reaction_type: The reaction type.
+        """
+        return [card for card in self._reaction_cards if reaction_type in card.reacts_to]
+
+    def append(self, card: Card):
+        super().append(card)
+        self._index(card)
+
+    def appendleft(self, card: Card):
+        super().appendleft(card)
+        self._index(card)
+
+    def extend(self, cards: Iterable[Card]):
+        for card in list(cards):
+            self.append(card)
+
+    def extendleft(self, cards: Iterable[Card]):
+        for card in list(cards):
+            self.appendleft(card)
+
+    def insert(self, index: int, card: Card):
+        super().insert(index, card)
+        self._index(card)
+
+    def remove(self, card: Card):
+        super().remove(card)
+        self._unindex(card)
+
+    def pop(self) -> Card:
+        card = super().pop()
+        self._unindex(card)
+        return card
+
+    def popleft(self) -> Card:
+        card = super().popleft()
+        self._unindex(card)
+        return card
+
+    def clear(self):
+        super().clear()
+        self._reaction_cards.clear()
+
+    def __setitem__(self, index: int, card: Card):
+        self._unindex(self[index])
+        super().__setitem__(index, card)
+        self._index(card)
+
+    def __delitem__(self, index: int):
+        self._unindex(self[index])
+        super().__delitem__(index)
+
+    def __iadd__(self, cards: Iterable[Card]) -> Hand:
+        self.extend(cards)
+        return self
+
+
 class Player:
     """
     Player object representing a player's state.
@@ -41,8 +136,14 @@ class Player:
         self._interactions = interactions_class(player=self, socketio=socketio, sid=sid)
         self._deck = deque()
         self._discard_pile = deque()
-        self._hand = deque()
+        self._hand = Hand()
         self._played_cards = deque()
+        # Counts of the cards the Player owns, kept up to date as cards change hands (see :meth:`count_card`)
+        self._card_counts: Counter[Type[Card]] = Counter()
+        self._num_cards = 0
+        self._card_counts_version = 0
+        self._card_victory_points: int | None = None
+        self._card_victory_points_version = -1
         # self.victory_tokens = 0
         # Start with seven coppers and three estates
         self.gain(base_cards.Copper, quantity=7, from_supply=False, message=False)
@@ -116,7 +217,7 @@ class Player:
         return self._discard_pile
 
     @property
-    def hand(self) -> Deque[Card]:
+    def hand(self) -> Hand:
         """
         The Player's hand.
         """
@@ -160,9 +261,13 @@ class Player:
         Returns:
             The card that was gained.
         """
+        # Usually there is nothing to react with
+        if not self.hand.has_reactions(ReactionType.GAIN):
+            return card
+
         def get_reaction_cards_in_hand():
-            # Get all reaction cards in the player's hand that can react to an attack
-            return set(card for card in self.hand if CardType.REACTION in card.types and ReactionType.GAIN in card.reacts_to)
+            # Get all reaction cards in the player's hand that can react to a gain
+            return set(self.hand.reactions(ReactionType.GAIN))
 
         # Allow the player to play reaction cards
         reaction_cards_in_hand = get_reaction_cards_in_hand()
@@ -280,21 +385,21 @@ class Player:
                 try:
                     card = self.supply.draw(card_class)
                 except SupplyStackEmptyError:
-                    self.game.broadcast(f'{self.name} could not gain {a(card_class.name)} since that supply pile is empty.')
+                    self.game.broadcast(GameEvent(EventType.GAIN_FAILED, self, card_class))
                     break
             card.owner = self
             if card.gain_to is self.discard_pile: 
                 self.discard_pile.append(card)
             elif card.gain_to is self.deck:
                 self.deck.append(card)
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} onto their deck.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="deck"))
                 message = False
             elif card.gain_to is self.hand:
                 self.hand.append(card)
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} into their hand.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="hand"))
                 message = False
             if message:
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)}.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class))
             if not ignore_post_gain_actions:
                 card = self.process_post_gain_actions(card, card.gain_to)
             gained_cards.append(card)
@@ -327,13 +432,13 @@ class Player:
                 try:
                     card = self.supply.draw(card_class)
                 except SupplyStackEmptyError:
-                    self.game.broadcast(f'{self.name} could not gain {a(card_class.name)} since that supply pile is empty.')
+                    self.game.broadcast(GameEvent(EventType.GAIN_FAILED, self, card_class))
                     break
             card.owner = self
             gained_cards.append(card)
             self.hand.append(card)
             if message:
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} into their hand.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="hand"))
             if not ignore_post_gain_actions:
                 self.process_post_gain_actions(card, self.hand)
         if gained_cards:
@@ -366,13 +471,13 @@ class Player:
                 try:
                     card = self.supply.draw(card_class)
                 except SupplyStackEmptyError:
-                    self.game.broadcast(f'{self.name} could not gain {a(card_class.name)} since that supply pile is empty.')
+                    self.game.broadcast(GameEvent(EventType.GAIN_FAILED, self, card_class))
                     break
             card.owner = self
             gained_cards.append(card)
             self.deck.append(card)
             if message:
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} onto their deck.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="deck"))
             if not ignore_post_gain_actions:
                 self.process_post_gain_actions(card, self.deck)
         if gained_cards:
@@ -386,18 +491,18 @@ class Player:
         """
         Shuffle the Player's discard pile into their deck.
         """
-        self.game.broadcast(f'{self.name} shuffled their deck.')
+        self.game.broadcast(GameEvent(EventType.SHUFFLE, self))
         self.deck.extend(self.discard_pile)
         self.discard_pile.clear()
-        random.shuffle(self.deck)
+        self.game.rng.shuffle(self.deck)
 
     def shuffle_deck(self, message=True):
         """
         Shuffle the Player's deck.
         """
-        random.shuffle(self.deck)
+        self.game.rng.shuffle(self.deck)
         if message:
-            self.game.broadcast(f'{self.name} shuffled their deck.')
+            self.game.broadcast(GameEvent(EventType.SHUFFLE, self))
 
     def take_from_deck(self) -> Card | None:
         """
@@ -440,14 +545,14 @@ class Player:
             if quantity == 0:
                 pass
             elif len(drawn_cards) == quantity:
-                self.game.broadcast(f"+{s(quantity, 'card')} → {s(len(self.hand), 'card')} in hand.")
-                self.interactions.send(f"You drew: {', '.join(map(str, drawn_cards))}.")
+                self.game.broadcast(GameEvent(EventType.DRAW, self, quantity=quantity, total=len(self.hand)))
+                self.interactions.send_event(GameEvent(EventType.DREW, self, cards=drawn_cards))
             elif 1 <= len(drawn_cards) < quantity:
-                self.game.broadcast(f"{self} had only {s(len(drawn_cards), 'card')} left to draw from.")
-                self.game.broadcast(f"+{s(len(drawn_cards), 'card')} → {s(len(self.hand), 'card')} in hand.")
-                self.interactions.send(f"You drew: {', '.join(map(str, drawn_cards))}.")
+                self.game.broadcast(GameEvent(EventType.DRAW_SHORT, self, quantity=len(drawn_cards)))
+                self.game.broadcast(GameEvent(EventType.DRAW, self, quantity=len(drawn_cards), total=len(self.hand)))
+                self.interactions.send_event(GameEvent(EventType.DREW, self, cards=drawn_cards))
             elif not drawn_cards:
-                self.game.broadcast(f'{self} had no cards left to draw from.')
+                self.game.broadcast(GameEvent(EventType.DRAW_SHORT, self, quantity=0))
         return drawn_cards
 
     def play(self, card: Card):
@@ -478,14 +583,14 @@ class Player:
             message: Whether to broadcast a message to all Players saying that the card was discarded.
         """
         if isinstance(cards, Card):
-            message_string = f"{self.name} discarded {a(cards.name)}."
+            event = GameEvent(EventType.DISCARD, self, cards)
             cards = [cards]
         else:
-            message_string = f"{self.name} discarded {Card.group_and_sort_by_cost(cards)}."
+            event = GameEvent(EventType.DISCARD, self, cards=list(cards))
         # All cards are discarded at once and before post-discard hooks are activated
         self.discard_pile.extend(cards)
         if message:
-            self.game.broadcast(message_string)
+            self.game.broadcast(event)
         # Process post-discard hooks for each discarded card
         for discarded_card in cards:
             self.process_post_discard_hooks(discarded_card)
@@ -515,7 +620,7 @@ class Player:
         self.hand.remove(card)
         self.supply.trash(card)
         if message:
-            self.game.broadcast(f'{self.name} trashed {a(card)}.')
+            self.game.broadcast(GameEvent(EventType.TRASH, self, card))
 
     def trash_played_card(self, card: Card, message: bool = True):
         """
@@ -529,7 +634,7 @@ class Player:
             self.played_cards.remove(card)
             self.supply.trash(card)
             if message:
-                self.game.broadcast(f'{self.name} trashed {a(card)}.')
+                self.game.broadcast(GameEvent(EventType.TRASH, self, card))
         except ValueError:
             self.game.broadcast(f'{self.name} could not trash the {(card)} since it was no longer in their played cards.')
 
@@ -567,14 +672,14 @@ class Player:
                 self.discard_pile.append(card)
             elif card.gain_to is self.deck:
                 self.deck.append(card)
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} onto their deck.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="deck"))
                 message = False
             elif card.gain_to is self.hand:
                 self.hand.append(card)
-                self.game.broadcast(f'{self.name} gained {a(card_class.name)} into their hand.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card_class, to="hand"))
                 message = False
             if message:
-                self.game.broadcast(f'{self.name} gained {a(card)} from the trash.')
+                self.game.broadcast(GameEvent(EventType.GAIN, self, card, source="trash"))
             if not ignore_post_gain_actions:
                 self.process_post_gain_actions(card, card.gain_to, gained_from_trash=True)
         return card
@@ -611,6 +716,72 @@ class Player:
         '''
         return set(self.deck + self.discard_pile + self.hand + self.played_cards)
 
+    @property
+    def card_counts(self) -> Dict[Type[Card], int]:
+        """
+        The number of cards of each class the Player owns. Do not mutate this.
+
+        Unlike :attr:`all_cards`, this also includes cards that are
+        temporarily set aside.
+        """
+        return self._card_counts
+
+    @property
+    def num_cards(self) -> int:
+        """
+        The number of cards the Player owns.
+        """
+        return self._num_cards
+
+    def count_card(self, card: Card):
+        """
+        Start counting a card as one of the Player's cards.
+
+        This is called automatically when a card's owner is set.
+
+        Args:
+            card: The card.
+        """
+        self._card_counts[type(card)] += 1
+        self._num_cards += 1
+        self._card_counts_version += 1
+
+    def uncount_card(self, card: Card):
+        """
+        Stop counting a card as one of the Player's cards.
+
+        This is called automatically when a card changes owners or
+        leaves the Player's possession (see :meth:`Card.release`).
+
+        Args:
+            card: The card.
+        """
+        card_class = type(card)
+        count = self._card_counts[card_class] - 1
+        if count:
+            self._card_counts[card_class] = count
+        else:
+            del self._card_counts[card_class]
+        self._num_cards -= 1
+        self._card_counts_version += 1
+
+    @property
+    def card_victory_points(self) -> int:
+        """
+        The victory points the Player's Victory and Curse cards are worth.
+
+        Each card class is only evaluated once, and the result is cached
+        until the Player's cards change.
+        """
+        if self._card_victory_points_version != self._card_counts_version:
+            self._card_victory_points = sum(
+                quantity * card_class.points_for(self)
+                for card_class, quantity in self._card_counts.items()
+                if card_class.type_bits & (VICTORY_BIT | CURSE_BIT)
+            )
+            self._card_victory_points_version = self._card_counts_version
+        return self._card_victory_points
+
     @property
     def current_victory_points(self) -> int:
         """
@@ -642,7 +813,8 @@ class Player:
             "discard_size": len(self.discard_pile),
             "deck_size": len(self.deck),
             "played_size": len(self.played_cards),
-            "total_cards": len(self.all_cards),
+            "total_cards": self.num_cards,
+            "victory_points": self.current_victory_points,
         }
         if ProsperityExpansion in self.game.expansions:
             info["victory_tokens"] = self.victory_tokens
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .cards import base_cards, dominion_cards
+from .cards.cards import ACTION_BIT, TREASURE_BIT
+from .cards.catalog import card_record
+from .cards.custom_sets import CustomSet
+from .game import Game
+from .interactions.strategy import BIG_MONEY, COMPARISONS, Strategy, StrategyInteraction
+from .limits import GameLimits
+
+if TYPE_CHECKING:
+    from .cards.cards import Card
+
+
+# Cards whose only effects are their +Cards, +Actions, +Buys and +$ (or their value and points)
+BASIC_CARD_CLASSES: Tuple[Type[Card], ...] = (
+    base_cards.Copper,
+    base_cards.Silver,
+    base_cards.Gold,
+    base_cards.Estate,
+    base_cards.Duchy,
+    base_cards.Province,
+    base_cards.Curse,
+)
+VANILLA_KINGDOM_CARD_CLASSES: Tuple[Type[Card], ...] = (
+    dominion_cards.Moat, # Its reaction never comes up without Attacks
+    dominion_cards.Village,
+    dominion_cards.Smithy,
+    dominion_cards.Festival,
+    dominion_cards.Laboratory,
+    dominion_cards.Market,
+)
+
+_BASIC_TREASURES = (base_cards.Copper, base_cards.Silver, base_cards.Gold)
+
+# Treasure piles never run out, so they start with more cards than any game could gain
+_UNLIMITED = 1 << 30
+
+
+@dataclass
+class SimulationResults:
+    """
+    The outcomes of a batch of simulated games.
+
+    Args:
+        strategies: The strategy of each player.
+        scores: The victory points of each player (a column) in each game (a row).
+        turns: The turns played by each player in each game.
+        kingdom: The kingdom card classes.
+        card_classes: The card classes counted in :attr:`cards`.
+        cards: The number of each card class (the last axis) each player owned at the end of each game.
+        truncated: Whether each game was stopped by one of its limits rather than ending by the rules.
+    """
+    strategies: Tuple[Strategy, ...]
+    scores: np.ndarray
+    turns: np.ndarray
+    kingdom: Tuple[Type[Card], ...] = ()
+    card_classes: Tuple[Type[Card], ...] = ()
+    cards: Optional[np.ndarray] = None
+    truncated: Optional[np.ndarray] = None
+
+    @property
+    def num_games(self) -> int:
+        """
+        The number of games played.
+        """
+        return len(self.scores)
+
+    @property
+    def winners(self) -> np.ndarray:
+        """
+        Whether each player won each game.
+
+        As in :attr:`Game.scores`, ties are broken by fewest turns played.
+        """
+        best = self.scores == self.scores.max(axis=1, keepdims=True)
+        turns = np.where(best, self.turns, np.iinfo(self.turns.dtype).max)
+        return best & (turns == turns.min(axis=1, keepdims=True))
+
+    @property
+    def win_rates(self) -> np.ndarray:
+        """
+        The fraction of games each player won, with tied wins split between the winners.
+        """
+        winners = self.winners
+        return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+    @property
+    def mean_scores(self) -> np.ndarray:
+        """
+        The average victory points of each player.
+        """
+        return self.scores.mean(axis=0)
+
+    @property
+    def mean_game_length(self) -> float:
+        """
+        The average number of turns (across all players) per game.
+        """
+        return float(self.turns.sum(axis=1).mean())
+
+
+class VectorizedSimulator:
+    """
+    Plays many games of simple kingdoms at once, with table-driven strategies.
+
+    Only the cards in :data:`BASIC_CARD_CLASSES` and
+    :data:`VANILLA_KINGDOM_CARD_CLASSES` can be used, since each card is
+    reduced to its ``extra_cards``, ``extra_actions``, ``extra_buys``,
+    ``extra_coppers``, ``value`` and ``points``. Each player's deck,
+    discard pile and hand are arrays of card counts, with one row per game,
+    and every game takes its turns in lock-step, so a turn of thousands of
+    games is a few dozen array operations. Drawing a card from a count
+    array at random is the same as drawing the top card of a shuffled deck.
+
+    The players follow their :class:`Strategy` as :class:`StrategyInteraction`
+    does: they play their non-terminal Actions first, then the terminal
+    ones that draw the most, play all their Treasures, and buy from their
+    buy table until they run out of buys or the table has nothing for them.
+    So results can be cross-checked against :func:`simulate_with_game`.
+
+    Args:
+        kingdom: The kingdom card classes.
+        strategies: The strategy of each player.
+        limits: The game limits (by default, :meth:`GameLimits.for_simulation`). The turn and stall limits apply.
+            Simple kingdoms have no way of returning cards to the Supply, so a game can only reach the
+            same position again if its Supply doesn't change.
+        seed: The seed to play the games with.
+    """
+    def __init__(
+        self,
+        kingdom: Sequence[Type[Card]],
+        strategies: Sequence[Strategy] = (BIG_MONEY, BIG_MONEY),
+        limits: Optional[GameLimits] = None,
+        seed: Optional[int] = None,
+    ):
+        unsupported = [card_class.name for card_class in kingdom if card_class not in VANILLA_KINGDOM_CARD_CLASSES]
+        if unsupported:
+            raise ValueError(f"Can't simulate {', '.join(unsupported)}.")
+        if not 2 <= len(strategies) <= 6:
+            raise ValueError("Games need 2 to 6 players.")
+        self.strategies = tuple(strategies)
+        self.limits = limits if limits is not None else GameLimits.for_simulation()
+        self._rng = np.random.default_rng(seed)
+        num_players = len(self.strategies)
+        # Kingdom cards are ordered as the Supply orders them
+        self.kingdom = tuple(sorted(set(kingdom), key=lambda card_class: (card_class._cost, card_class.name)))
+        self.card_classes = BASIC_CARD_CLASSES + self.kingdom
+        self._index = {card_class: index for index, card_class in enumerate(self.card_classes)}
+        self._cost = np.array([card_class._cost for card_class in self.card_classes])
+        self._value = np.array([card_class.value if card_class.type_bits & TREASURE_BIT else 0 for card_class in self.card_classes])
+        self._points = np.array([getattr(card_class, "points", 0) for card_class in self.card_classes])
+        self._extra_cards, self._extra_actions, self._extra_buys, self._extra_coppers = (
+            np.array([getattr(card_class, attribute, 0) if card_class.type_bits & ACTION_BIT else 0 for card_class in self.card_classes])
+            for attribute in ("extra_cards", "extra_actions", "extra_buys", "extra_coppers")
+        )
+        self._basic_treasures = np.array([self._index[card_class] for card_class in _BASIC_TREASURES])
+        # The Action cards in the order they'd be played, best first
+        actions = [card_class for card_class in self.card_classes if card_class.type_bits & ACTION_BIT]
+        actions.sort(key=lambda card_class: (card_class.extra_actions > 0, card_class.extra_cards, card_class._cost), reverse=True)
+        self._play_order = [self._index[card_class] for card_class in actions]
+        # Each player plays the Actions their strategy names first, in its order
+        self._play_orders = [
+            [self._index[card_class] for card_class in strategy.play_order if card_class in self._index]
+            + [index for index in self._play_order if self.card_classes[index] not in strategy.play_order]
+            for strategy in self.strategies
+        ]
+        # The piles as the Base expansion sets them up
+        victory_pile_size = 8 if num_players == 2 else 12
+        self._pile_sizes = np.array([
+            _UNLIMITED if card_class.type_bits & TREASURE_BIT and card_class in BASIC_CARD_CLASSES
+            else (num_players - 1) * 10 if card_class is base_cards.Curse
+            else victory_pile_size if card_class in BASIC_CARD_CLASSES
+            else 10
+            for card_class in self.card_classes
+        ])
+        self._empty_pile_threshold = 3 if num_players <= 4 else 4
+        self._buy_tables = [self._buy_table(strategy) for strategy in self.strategies]
+
+    def _buy_table(self, strategy: Strategy) -> List[Tuple[np.ndarray, Optional[int], Optional[int], Optional[int], List[Tuple[str, Callable, int, Optional[int]]]]]:
+        # Each rule as the card indices it stands for and its conditions, as in StrategyInteraction.buy_table
+        kingdom = sorted(self.kingdom, key=lambda card_class: card_class._cost, reverse=True)
+        table = []
+        for rule in strategy.buy_table:
+            if rule.card_class is not None:
+                card_classes = [rule.card_class] if rule.card_class in self._index else []
+            else:
+                card_classes = [card_class for card_class in kingdom if card_record(card_class).has_effect(rule.effect)]
+            if card_classes:
+                indices = np.array([self._index[card_class] for card_class in card_classes])
+                conditions = [
+                    (condition.quantity, COMPARISONS[condition.comparison], condition.value, self._index.get(condition.card_class))
+                    for condition in rule.conditions
+                ]
+                table.append((indices, rule.max_owned, rule.max_provinces, rule.max_money, conditions))
+        return table
+
+    def run(self, num_games: int) -> SimulationResults:
+        """
+        Play a batch of games.
+
+        Args:
+            num_games: The number of games to play.
+        """
+        num_players, num_cards = len(self.strategies), len(self.card_classes)
+        # Indexed by seat first, so each seat's arrays are contiguous
+        shape = (num_players, num_games, num_cards)
+        self._deck = np.zeros(shape, dtype=np.int32)
+        self._discard_pile = np.zeros(shape, dtype=np.int32)
+        self._hand = np.zeros(shape, dtype=np.int32)
+        self._owned = np.zeros(shape, dtype=np.int32) # No card ever leaves a player's deck, so this only grows
+        self._deck_size = np.zeros((num_players, num_games), dtype=np.int32)
+        self._supply = np.tile(self._pile_sizes, (num_games, 1))
+        turns = np.zeros((num_players, num_games), dtype=np.int64)
+        # Seat the players in a random order in each game, as Game.start does
+        self._players = self._rng.permuted(np.tile(np.arange(num_players), (num_games, 1)), axis=1).T.copy()
+        for zone in (self._deck, self._owned):
+            zone[:, :, self._index[base_cards.Copper]] = 7
+            zone[:, :, self._index[base_cards.Estate]] = 3
+        self._deck_size[:] = 10
+        rows = np.arange(num_games)
+        for seat in range(num_players):
+            self._draw(seat, rows, 5)
+        truncated = np.zeros(num_games, dtype=bool)
+        # Rounds in a row without a change in each game's scores and Supply, and what they were last round
+        # (the first round has no round before it, as in StallDetector)
+        score_stall = np.full(num_games, -1, dtype=np.int64)
+        supply_stall = np.full(num_games, -1, dtype=np.int64)
+        scores = self._owned @ self._points
+        supply = self._supply.copy()
+        num_turns = 0
+        while len(rows):
+            seat = num_turns % num_players
+            self._take_turn(seat, rows)
+            turns[seat, rows] += 1
+            num_turns += 1
+            rows = rows[~self._game_over(rows)]
+            if self.limits.turns_exceeded(num_turns):
+                truncated[rows] = True
+                break
+            if seat == num_players - 1 and self.limits.detects_stalls:
+                stalled = self._stalled(rows, scores, supply, score_stall, supply_stall)
+                truncated[rows[stalled]] = True
+                rows = rows[~stalled]
+        # Report each player's results in their own column rather than their seat's
+        seat_scores = (self._owned @ self._points).T
+        order = np.argsort(self._players.T, axis=1)
+        return SimulationResults(
+            strategies=self.strategies,
+            scores=np.take_along_axis(seat_scores, order, axis=1),
+            turns=np.take_along_axis(turns.T, order, axis=1),
+            kingdom=self.kingdom,
+            card_classes=self.card_classes,
+            cards=np.take_along_axis(self._owned.transpose(1, 0, 2), order[:, :, np.newaxis], axis=1),
+            truncated=truncated,
+        )
+
+    def _stalled(self, rows: np.ndarray, scores: np.ndarray, supply: np.ndarray, score_stall: np.ndarray, supply_stall: np.ndarray) -> np.ndarray:
+        # Whether each of some games has reached a stall limit at the end of a round, updating the previous round's state
+        round_scores = self._owned[:, rows] @ self._points
+        round_supply = self._supply[rows]
+        score_stall[rows] = np.where((round_scores == scores[:, rows]).all(axis=0), score_stall[rows] + 1, 0)
+        supply_stall[rows] = np.where((round_supply == supply[rows]).all(axis=1), supply_stall[rows] + 1, 0)
+        scores[:, rows] = round_scores
+        supply[rows] = round_supply
+        stalled = np.zeros(len(rows), dtype=bool)
+        if self.limits.max_rounds_without_score_change is not None:
+            stalled |= score_stall[rows] >= self.limits.max_rounds_without_score_change
+        if self.limits.max_rounds_without_supply_change is not None:
+            stalled |= supply_stall[rows] >= self.limits.max_rounds_without_supply_change
+        if self.limits.max_repeated_positions is not None:
+            stalled |= supply_stall[rows] >= self.limits.max_repeated_positions - 1
+        return stalled
+
+    def _game_over(self, rows: np.ndarray) -> np.ndarray:
+        # Whether each of some games has met one of the Base expansion's end conditions
+        empty = self._supply[rows] == 0
+        return empty[:, self._index[base_cards.Province]] | (empty.sum(axis=1) >= self._empty_pile_threshold)
+
+    def _draw(self, seat: int, rows: np.ndarray, num_cards: int | np.ndarray):
+        # Draw cards into some games' hands for the player in a seat, shuffling their discard pile into their deck as needed
+        deck, discard_pile, hand, deck_size = self._deck[seat], self._discard_pile[seat], self._hand[seat], self._deck_size[seat]
+        remaining = np.broadcast_to(num_cards, rows.shape)
+        drawing = remaining > 0
+        rows, remaining = rows[drawing], remaining[drawing]
+        while len(rows):
+            shuffling = rows[deck_size[rows] == 0]
+            if len(shuffling):
+                deck[shuffling] += discard_pile[shuffling]
+                deck_size[shuffling] = discard_pile[shuffling].sum(axis=1)
+                discard_pile[shuffling] = 0
+            sizes = deck_size[rows]
+            drawing = sizes > 0
+            rows, remaining, sizes = rows[drawing], remaining[drawing], sizes[drawing]
+            # Pick a card uniformly at random, summing down the columns of the counts since there are far more games than card classes
+            picks = self._rng.random(len(rows)) * sizes
+            cumulative_counts = np.ascontiguousarray(deck[rows].T)
+            np.cumsum(cumulative_counts, axis=0, out=cumulative_counts)
+            drawn = (cumulative_counts <= picks).sum(axis=0)
+            deck[rows, drawn] -= 1
+            hand[rows, drawn] += 1
+            deck_size[rows] -= 1
+            remaining = remaining - 1
+            drawing = remaining > 0
+            rows, remaining = rows[drawing], remaining[drawing]
+
+    def _take_turn(self, seat: int, rows: np.ndarray):
+        # Take the turn of the player in a seat in some games
+        hand, discard_pile = self._hand[seat], self._discard_pile[seat]
+        played = np.zeros((len(rows), len(self.card_classes)), dtype=np.int32)
+        actions = np.ones(len(rows), dtype=np.int32)
+        buys = np.ones(len(rows), dtype=np.int32)
+        coins = np.zeros(len(rows), dtype=np.int32)
+        # Action phase: play the best Action in hand until out of Actions or Action cards
+        playing = np.arange(len(rows))
+        while len(playing):
+            hands = hand[rows[playing]]
+            players = self._players[seat, rows[playing]]
+            card = np.full(len(playing), -1)
+            for player, play_order in enumerate(self._play_orders):
+                choosing = players == player
+                for index in reversed(play_order):
+                    card[choosing & (hands[:, index] > 0)] = index
+            playing, card = playing[card >= 0], card[card >= 0]
+            playing_rows = rows[playing]
+            hand[playing_rows, card] -= 1
+            played[playing, card] += 1
+            actions[playing] += self._extra_actions[card] - 1
+            buys[playing] += self._extra_buys[card]
+            coins[playing] += self._extra_coppers[card]
+            self._draw(seat, playing_rows, self._extra_cards[card])
+            playing = playing[actions[playing] > 0]
+        # Buy phase: play every Treasure, then follow the buy table
+        coins += hand[rows] @ self._value
+        buying = np.arange(len(rows))
+        while len(buying):
+            card = self._choose_buys(seat, rows[buying], coins[buying])
+            buying, card = buying[card >= 0], card[card >= 0]
+            buying_rows = rows[buying]
+            self._supply[buying_rows, card] -= 1
+            discard_pile[buying_rows, card] += 1
+            self._owned[seat, buying_rows, card] += 1
+            coins[buying] -= self._cost[card]
+            buys[buying] -= 1
+            buying = buying[buys[buying] > 0]
+        # Clean-up phase
+        discard_pile[rows] += hand[rows] + played
+        hand[rows] = 0
+        self._draw(seat, rows, 5)
+
+    def _choose_buys(self, seat: int, rows: np.ndarray, coins: np.ndarray) -> np.ndarray:
+        # The card the player in a seat buys in each of some games (or -1 for nothing), as StrategyInteraction._card_class_to_gain
+        card = np.full(len(rows), -1)
+        owned = self._owned[seat, rows]
+        money = owned[:, self._basic_treasures] @ self._value[self._basic_treasures]
+        supply = self._supply[rows]
+        provinces_left = supply[:, self._index[base_cards.Province]]
+        affordable = (self._cost <= coins[:, np.newaxis]) & (supply > 0)
+        players = self._players[seat, rows]
+        for player, buy_table in enumerate(self._buy_tables):
+            deciding = players == player
+            for indices, max_owned, max_provinces, max_money, conditions in buy_table:
+                undecided = deciding & (card < 0)
+                if max_provinces is not None:
+                    undecided &= provinces_left <= max_provinces
+                if max_money is not None:
+                    undecided &= money <= max_money
+                if max_owned is not None:
+                    undecided &= owned[:, indices].sum(axis=1) < max_owned
+                for quantity, compare, value, index in conditions:
+                    if quantity == "coins":
+                        undecided &= compare(coins, value)
+                    elif quantity == "count":
+                        undecided &= compare(owned[:, indices].sum(axis=1), value)
+                    elif quantity == "owned":
+                        undecided &= compare(owned[:, index] if index is not None else np.zeros(len(rows), dtype=np.int32), value)
+                    elif quantity == "provinces":
+                        undecided &= compare(provinces_left, value)
+                    else:
+                        undecided &= compare(money, value)
+                for index in indices:
+                    card[undecided & (card < 0) & affordable[:, index]] = index
+        return card
+
+
+def simulate_with_game(
+    kingdom: Sequence[Type[Card]],
+    strategies: Sequence[Strategy] = (BIG_MONEY, BIG_MONEY),
+    num_games: int = 100,
+    limits: Optional[GameLimits] = None,
+) -> SimulationResults:
+    """
+    Play games of a kingdom with the full game engine, to cross-check a :class:`VectorizedSimulator`.
+
+    Args:
+        kingdom: The kingdom card classes.
+        strategies: The strategy of each player.
+        num_games: The number of games to play.
+        limits: The game limits (by default, :meth:`GameLimits.for_simulation`).
+    """
+    if limits is None:
+        limits = GameLimits.for_simulation()
+    custom_set = CustomSet.from_json({"cards": [card_class.name for card_class in kingdom]})
+    kingdom = tuple(sorted(set(kingdom), key=lambda card_class: (card_class._cost, card_class.name)))
+    card_classes = BASIC_CARD_CLASSES + kingdom
+    scores = np.zeros((num_games, len(strategies)), dtype=np.int64)
+    turns = np.zeros((num_games, len(strategies)), dtype=np.int64)
+    cards = np.zeros((num_games, len(strategies), len(card_classes)), dtype=np.int64)
+    truncated = np.zeros(num_games, dtype=bool)
+    for game_index in range(num_games):
+        game = Game(test=True, limits=limits)
+        game.custom_set = custom_set
+        for strategy in strategies:
+            game.add_cpu(StrategyInteraction.using(strategy))
+        game.start()
+        victory_points, turns_played, _ = game.scores
+        for player_index, player in enumerate(game.players):
+            scores[game_index, player_index] = victory_points[player]
+            turns[game_index, player_index] = turns_played[player]
+            cards[game_index, player_index] = [player.card_counts.get(card_class, 0) for card_class in card_classes]
+        truncated[game_index] = game.truncated
+    return SimulationResults(strategies=tuple(strategies), scores=scores, turns=turns, kingdom=kingdom, card_classes=card_classes, cards=cards, truncated=truncated)
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Tuple, Type
+
+from .cards import ALL_KINGDOM_CARDS
+
+if TYPE_CHECKING:
+    from .cards.cards import Card
+    from .game import Game
+    from .simulator import SimulationResults
+
+
+# The expansion under which card statistics across all expansions are aggregated
+ANY_EXPANSION = "*"
+
+_KINGDOM_CARDS = frozenset(ALL_KINGDOM_CARDS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    kingdom TEXT NOT NULL,
+    expansions TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    num_turns INTEGER NOT NULL,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_kingdom ON games (kingdom, num_players);
+
+CREATE TABLE IF NOT EXISTS game_cards (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    card TEXT NOT NULL,
+    PRIMARY KEY (card, game_id)
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    strategy TEXT,
+    score INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    win REAL NOT NULL,
+    PRIMARY KEY (game_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS player_cards (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    position INTEGER NOT NULL,
+    card TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (game_id, position, card)
+);
+CREATE INDEX IF NOT EXISTS player_cards_by_card ON player_cards (card);
+
+CREATE TABLE IF NOT EXISTS card_stats (
+    card TEXT NOT NULL,
+    expansion TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    total_turns INTEGER NOT NULL,
+    owners INTEGER NOT NULL,
+    owner_wins REAL NOT NULL,
+    PRIMARY KEY (card, expansion, num_players)
+);
+
+CREATE TABLE IF NOT EXISTS kingdom_stats (
+    kingdom TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    total_turns INTEGER NOT NULL,
+    PRIMARY KEY (kingdom, num_players)
+);
+"""
+
+
+@dataclass(frozen=True)
+class PlayerRecord:
+    """
+    How one player did in a recorded game.
+
+    Args:
+        name: The player's name.
+        strategy: The name of the player's strategy, if they were a CPU following one.
+        score: The player's victory points.
+        turns: The number of turns the player took.
+        win: The player's share of the win (e.g., 0.5 for one of two tied winners).
+        cards: The number of each card (by name) the player owned at the end of the game.
+    """
+    name: str
+    strategy: Optional[str]
+    score: int
+    turns: int
+    win: float
+    cards: Tuple[Tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    """
+    A finished game, as kept in a :class:`StatsStore`.
+
+    Args:
+        source: Where the game was played (``"live"`` or ``"simulation"``).
+        kingdom: The names of the kingdom cards, sorted.
+        expansions: The names of the expansions, sorted.
+        num_turns: The number of turns (across all players) the game lasted.
+        players: How each player did.
+        truncated: Whether the game was stopped by one of its limits (e.g., because it stalled)
+            rather than ending by the rules.
+    """
+    source: str
+    kingdom: Tuple[str, ...]
+    expansions: Tuple[str, ...]
+    num_turns: int
+    players: Tuple[PlayerRecord, ...]
+    truncated: bool = False
+
+    @classmethod
+    def from_game(cls, game: Game, source: str = "live") -> GameRecord:
+        """
+        Take a snapshot of a finished game.
+
+        Args:
+            game: The game.
+            source: Where the game was played.
+        """
+        victory_points, turns_played, winners = game.scores
+        players = []
+        for player in game.players:
+            strategy = getattr(player.interactions, "strategy", None)
+            players.append(
+                PlayerRecord(
+                    name=player.name,
+                    strategy=strategy.name if strategy is not None else None,
+                    score=victory_points[player],
+                    turns=turns_played[player],
+                    win=1 / len(winners) if player.name in winners else 0.0,
+                    cards=tuple(sorted((card_class.name, quantity) for card_class, quantity in player.card_counts.items() if quantity)),
+                )
+            )
+        return cls(
+            source=source,
+            kingdom=tuple(sorted(card_class.name for card_class in game.supply.card_stacks if card_class in _KINGDOM_CARDS)),
+            expansions=tuple(sorted(expansion.name for expansion in game.supply.customization.expansions)),
+            num_turns=game.num_turns,
+            players=tuple(players),
+            truncated=game.truncated,
+        )
+
+    @classmethod
+    def from_simulation(cls, results: SimulationResults) -> List[GameRecord]:
+        """
+        Make a record of each game in a batch of simulated games.
+
+        Args:
+            results: The results of the games.
+        """
+        expansions = tuple(sorted({"Base"} | {card_class.expansion for card_class in results.kingdom}))
+        kingdom = tuple(sorted(card_class.name for card_class in results.kingdom))
+        card_names = [card_class.name for card_class in results.card_classes]
+        wins = results.winners / results.winners.sum(axis=1, keepdims=True)
+        records = []
+        for game_index in range(results.num_games):
+            players = []
+            for player_index, strategy in enumerate(results.strategies):
+                quantities = results.cards[game_index, player_index]
+                players.append(
+                    PlayerRecord(
+                        name=f"CPU {player_index + 1}",
+                        strategy=strategy.name,
+                        score=int(results.scores[game_index, player_index]),
+                        turns=int(results.turns[game_index, player_index]),
+                        win=float(wins[game_index, player_index]),
+                        cards=tuple(sorted((name, int(quantity)) for name, quantity in zip(card_names, quantities) if quantity)),
+                    )
+                )
+            truncated = results.truncated is not None and bool(results.truncated[game_index])
+            records.append(cls("simulation", kingdom, expansions, int(results.turns[game_index].sum()), tuple(players), truncated))
+        return records
+
+
+@dataclass(frozen=True)
+class CardStats:
+    """
+    Aggregated results of the games a kingdom card was in.
+
+    Args:
+        card: The name of the card.
+        games: The number of games the card was in the kingdom of.
+        total_turns: The total length of those games (in turns across all players).
+        owners: The number of players who ended those games owning the card.
+        owner_wins: The wins of those players, with tied wins split.
+    """
+    card: str
+    games: int
+    total_turns: int
+    owners: int
+    owner_wins: float
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        """
+        The fraction of games won by players who owned the card, or :obj:`None` if nobody did.
+        """
+        return self.owner_wins / self.owners if self.owners else None
+
+    @property
+    def mean_game_length(self) -> Optional[float]:
+        """
+        The average length of the games the card was in, or :obj:`None` if there were none.
+        """
+        return self.total_turns / self.games if self.games else None
+
+
+class StatsStore:
+    """
+    Results of finished games, kept in a SQLite database.
+
+    Besides every game's kingdom, expansions, and each player's score,
+    turns, win and cards, the store keeps running totals per kingdom card
+    (by expansion and number of players) and per kingdom, updated as games
+    are added. So balance questions, such as how Witch does in 3-player
+    Prosperity games, are answered from a few indexed rows.
+
+    Args:
+        path: The path of the database file, or ``":memory:"``.
+    """
+    def __init__(self, path: str):
+        # Gevent runs every greenlet in one thread, but the connection may be used from other threads too
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The database connection, for queries the store has no method for.
+        """
+        return self._connection
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self._connection.close()
+
+    def add_games(self, records: Iterable[GameRecord]) -> int:
+        """
+        Add finished games to the store, in a single transaction.
+
+        Args:
+            records: The games.
+
+        Returns:
+            The number of games added.
+        """
+        recorded_at = time.time()
+        card_totals: Dict[Tuple[str, str, int], List[float]] = defaultdict(lambda: [0, 0, 0, 0.0])
+        kingdom_totals: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        num_games = 0
+        with self._connection:
+            cursor = self._connection.cursor()
+            for record in records:
+                num_games += 1
+                kingdom = ",".join(record.kingdom)
+                num_players = len(record.players)
+                cursor.execute(
+                    "INSERT INTO games (source, kingdom, expansions, num_players, num_turns, truncated, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (record.source, kingdom, ",".join(record.expansions), num_players, record.num_turns, record.truncated, recorded_at),
+                )
+                game_id = cursor.lastrowid
+                cursor.executemany("INSERT INTO game_cards (game_id, card) VALUES (?, ?)", [(game_id, card) for card in record.kingdom])
+                cursor.executemany(
+                    "INSERT INTO players (game_id, position, name, strategy, score, turns, win) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(game_id, position, player.name, player.strategy, player.score, player.turns, player.win) for position, player in enumerate(record.players)],
+                )
+                cursor.executemany(
+                    "INSERT INTO player_cards (game_id, position, card, quantity) VALUES (?, ?, ?, ?)",
+                    [(game_id, position, card, quantity) for position, player in enumerate(record.players) for card, quantity in player.cards],
+                )
+                totals = kingdom_totals[kingdom, num_players]
+                totals[0] += 1
+                totals[1] += record.num_turns
+                owned_cards = [dict(player.cards) for player in record.players]
+                for card in record.kingdom:
+                    owners = [player for player, cards in zip(record.players, owned_cards) if card in cards]
+                    for expansion in record.expansions + (ANY_EXPANSION,):
+                        totals = card_totals[card, expansion, num_players]
+                        totals[0] += 1
+                        totals[1] += record.num_turns
+                        totals[2] += len(owners)
+                        totals[3] += sum(player.win for player in owners)
+            cursor.executemany(
+                """
+                INSERT INTO card_stats (card, expansion, num_players, games, total_turns, owners, owner_wins) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (card, expansion, num_players) DO UPDATE SET
+                    games = games + excluded.games,
+                    total_turns = total_turns + excluded.total_turns,
+                    owners = owners + excluded.owners,
+                    owner_wins = owner_wins + excluded.owner_wins
+                """,
+                [key + tuple(totals) for key, totals in card_totals.items()],
+            )
+            cursor.executemany(
+                """
+                INSERT INTO kingdom_stats (kingdom, num_players, games, total_turns) VALUES (?, ?, ?, ?)
+                ON CONFLICT (kingdom, num_players) DO UPDATE SET
+                    games = games + excluded.games,
+                    total_turns = total_turns + excluded.total_turns
+                """,
+                [key + tuple(totals) for key, totals in kingdom_totals.items()],
+            )
+        return num_games
+
+    def add_simulation(self, results: SimulationResults) -> int:
+        """
+        Add a batch of simulated games to the store.
+
+        Args:
+            results: The results of the games.
+
+        Returns:
+            The number of games added.
+        """
+        return self.add_games(GameRecord.from_simulation(results))
+
+    def card_stats(self, card: Type[Card] | str, expansion: Optional[str] = None, num_players: Optional[int] = None) -> CardStats:
+        """
+        Get the aggregated results of the games a kingdom card was in.
+
+        Args:
+            card: The card class or its name.
+            expansion: Only count games with this expansion (e.g., ``"Prosperity"``).
+            num_players: Only count games with this many players.
+        """
+        name = card if isinstance(card, str) else card.name
+        query = "SELECT SUM(games), SUM(total_turns), SUM(owners), SUM(owner_wins) FROM card_stats WHERE card = ? AND expansion = ?"
+        params: List[object] = [name, expansion if expansion is not None else ANY_EXPANSION]
+        if num_players is not None:
+            query += " AND num_players = ?"
+            params.append(num_players)
+        games, total_turns, owners, owner_wins = self._connection.execute(query, params).fetchone()
+        return CardStats(name, games or 0, total_turns or 0, owners or 0, owner_wins or 0.0)
+
+    def kingdom_stats(self, kingdom: Iterable[Type[Card] | str], num_players: Optional[int] = None) -> Tuple[int, Optional[float]]:
+        """
+        Get the number of games recorded with a kingdom and their average length.
+
+        Args:
+            kingdom: The kingdom card classes or their names.
+            num_players: Only count games with this many players.
+
+        Returns:
+            The number of games and their average length (in turns across all players), or :obj:`None` if there were none.
+        """
+        key = ",".join(sorted(card if isinstance(card, str) else card.name for card in kingdom))
+        query = "SELECT SUM(games), SUM(total_turns) FROM kingdom_stats WHERE kingdom = ?"
+        params: List[object] = [key]
+        if num_players is not None:
+            query += " AND num_players = ?"
+            params.append(num_players)
+        games, total_turns = self._connection.execute(query, params).fetchone()
+        return games or 0, total_turns / games if games else None
+
+
+class StatsRecorder:
+    """
+    Queues finished games to add to a :class:`StatsStore` in batches.
+
+    Recording a game only takes a snapshot of it, so it is cheap enough to
+    do as soon as the game ends. Call :meth:`flush` from a background task
+    to write the queued games.
+
+    Args:
+        store: The store to add the games to.
+        max_pending: The most games to queue. Beyond this, the oldest queued games are dropped.
+    """
+    def __init__(self, store: StatsStore, max_pending: int = 10000):
+        self.store = store
+        self._pending: Deque[GameRecord] = deque(maxlen=max_pending)
+
+    @property
+    def num_pending(self) -> int:
+        """
+        The number of games waiting to be written.
+        """
+        return len(self._pending)
+
+    def record_game(self, game: Game, source: str = "live"):
+        """
+        Queue a finished game.
+
+        Args:
+            game: The game.
+            source: Where the game was played.
+        """
+        self._pending.append(GameRecord.from_game(game, source=source))
+
+    def flush(self) -> int:
+        """
+        Write every queued game to the store.
+
+        Returns:
+            The number of games written.
+        """
+        records = []
+        while self._pending:
+            records.append(self._pending.popleft())
+        return self.store.add_games(records) if records else 0
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
-import copy
 import random
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from math import inf
-from typing import TYPE_CHECKING, Dict, DefaultDict, List, Type
+from typing import TYPE_CHECKING, Dict, DefaultDict, Iterable, List, Optional, Set, Type
 
 from .cards import cards, base_cards, prosperity_cards, intrigue_cards, cornucopia_cards, hinterlands_cards, guilds_cards
+from .cards.catalog import card_record
+from .costs import CostEngine
+from .kingdom import KingdomGenerator
 
 if TYPE_CHECKING:
     from .cards.custom_sets import CustomSet
     from .cards.recommended_sets import RecommendedSet
-    from .cards.cards import Card
+    from .cards.cards import Card, CardType
     from .expansions import CornucopiaExpansion
     from .expansions.expansion import Expansion
     from .hooks import PostGainHook
@@ -183,11 +186,10 @@ class Customization:
     @staticmethod
     def card_has_effect(card_class: Type[Card], effect_string: str) -> bool:
         """
-        TODO: This really belongs in the :obj:`Card` class itself as either multiple properties or a regular method that accepts an effect.
-        Additionally, it would be better to have an enumeration of all the effects that can be checked for, rather than using strings.
-
         Return whether a given card class has a specific effect. Useful for dealing with customization options that require specific effects.
 
+        Effects are looked up in the card catalog, so they are only computed once per card class.
+
         For instance, :obj:`Customization.card_has_effect(base_cards.Festival, "buy")` would return :obj:`True`.
 
         Arguments:
@@ -197,12 +199,76 @@ class Customization:
         Returns:
             Whether the card class has the effect.
         """
-        return {
-            "plus_two_action": card_class.has_plus_two_actions,
-            "drawer": card_class.has_plus_one_card,
-            "buy": card_class.has_plus_one_buy,
-            "trashing": card_class.has_trashing,
-        }[effect_string]
+        return card_record(card_class).has_effect(effect_string)
+
+
+class CardStacks(dict):
+    '''
+    A dictionary whose keys are card classes and whose values are
+    :obj:`SupplyStack` objects, which also indexes the stacks by card name.
+
+    Any change to which stacks are in the Supply invalidates the Supply's
+    cost index.
+
+    Args:
+        supply: The Supply to which the stacks belong.
+        card_stacks: The initial stacks.
+    '''
+    def __init__(self, supply: Supply, card_stacks: Dict[Type[Card], SupplyStack] | None = None):
+        super().__init__()
+        self._supply = supply
+        self._card_classes_by_name: Dict[str, Type[Card]] = {}
+        if card_stacks is not None:
+            self.update(card_stacks)
+
+    def __reduce__(self):
+        return (self.__class__, (self._supply, dict(self)))
+
+    def __setitem__(self, card_class: Type[Card], card_stack: SupplyStack):
+        super().__setitem__(card_class, card_stack)
+        self._card_classes_by_name[card_class.name] = card_class
+        self._supply.invalidate_cost_index()
+
+    def __delitem__(self, card_class: Type[Card]):
+        super().__delitem__(card_class)
+        self._card_classes_by_name.pop(card_class.name, None)
+        self._supply.invalidate_cost_index()
+
+    def pop(self, card_class: Type[Card], *default):
+        if card_class in self:
+            card_stack = self[card_class]
+            del self[card_class]
+            return card_stack
+        return super().pop(card_class, *default)
+
+    def popitem(self):
+        card_class, card_stack = super().popitem()
+        self._card_classes_by_name.pop(card_class.name, None)
+        self._supply.invalidate_cost_index()
+        return card_class, card_stack
+
+    def setdefault(self, card_class: Type[Card], card_stack: SupplyStack = None):
+        if card_class not in self:
+            self[card_class] = card_stack
+        return self[card_class]
+
+    def update(self, *args, **kwargs):
+        for card_class, card_stack in dict(*args, **kwargs).items():
+            self[card_class] = card_stack
+
+    def clear(self):
+        super().clear()
+        self._card_classes_by_name.clear()
+        self._supply.invalidate_cost_index()
+
+    def card_class_named(self, card_name: str) -> Type[Card] | None:
+        '''
+        The card class with the given name, or :obj:`None` if it is not in the Supply.
+
+        Args:
+            card_name: The name of the card.
+        '''
+        return self._card_classes_by_name.get(card_name)
 
 
 class Supply:
@@ -214,10 +280,16 @@ class Supply:
     """
     def __init__(self, num_players):
         self._num_players = num_players
-        self._card_stacks = {}
+        self._card_stacks = CardStacks(self)
+        self._costs = CostEngine()
+        # Non-empty stacks ordered by modified cost, rebuilt lazily when invalidated
+        self._cost_index_costs: List[int] | None = None
+        self._cost_index_card_classes: List[Type[Card]] = []
+        self._cost_index_version = self._costs.version
         self._post_gain_hooks = defaultdict(list)
         self._customization = Customization()
         self._possible_kingdom_card_classes: List[Type[Card]] = []
+        self._empty_stacks: Set[Type[Card]] = set()
         # TODO: Remove these (they are for debugging specific cards)
         # self.customization.required_card_classes.add(guilds_cards.Stonemason)
 
@@ -229,7 +301,7 @@ class Supply:
         return self._num_players
 
     @property
-    def card_stacks(self) -> Dict[Type[Card], SupplyStack]:
+    def card_stacks(self) -> CardStacks:
         """
         A dictionary whose keys are card classes and whose values are
         :obj:`SupplyStack` objects.
@@ -241,7 +313,7 @@ class Supply:
 
     @card_stacks.setter
     def card_stacks(self, card_stacks: Dict[Type[Card], SupplyStack]):
-        self._card_stacks = card_stacks
+        self._card_stacks = CardStacks(self, card_stacks)
 
     @property
     def post_gain_hooks(self) -> Dict[Type[Card], List[PostGainHook]]:
@@ -317,60 +389,15 @@ class Supply:
                 self.card_stacks[card_class] = FiniteSupplyStack(self, card_class, 10)
             return
         print("Randomly selecting kingdom cards.")
-        selected_kingdom_card_classes = []
-        # Add in any required cards. Note that this will break things is a required card's expansion is not selected.
-        for required_card_class in self.customization.required_card_classes:
-            if required_card_class not in self.possible_kingdom_card_classes:
-                raise ValueError(f"Required card class {required_card_class.name} is not in the selected expansions.")
-            print(f"Adding required card class {required_card_class.name}.")
-            selected_kingdom_card_classes.append(required_card_class)
-            self.possible_kingdom_card_classes.remove(required_card_class)
-        # All filtering and disabling should be done prior to fulfilling requirements!
-        if self.customization.disable_attack_cards:
-            # Filter out attack cards
-            print("Disabling attack cards.")
-            self.possible_kingdom_card_classes = [card_class for card_class in copy.deepcopy(self.possible_kingdom_card_classes) if cards.CardType.ATTACK not in card_class.types]
-        # Find and add in kingdom cards satisfying the required effects
-        required_effects = [effect for effect, required in self.customization.required_effects.items() if required]
-        random.shuffle(required_effects) # Shuffle the list of required effects so some cards don't get preferential treatment every game
-        for required_effect in required_effects:
-            # First check if the required effect already happens to be satisfied by a previously required card
-            if any(self.customization.card_has_effect(card_class, required_effect) for card_class in selected_kingdom_card_classes):
-                print(f"{required_effect} is already satisfied by a previously selected card.")
-                continue
-            # Otherwise, find a card that has the required effect
-            possible_kingdom_card_classes_with_required_effect = [card_class for card_class in self.possible_kingdom_card_classes if self.customization.card_has_effect(card_class, required_effect)]
-            card_class_with_required_effect = random.choice(possible_kingdom_card_classes_with_required_effect)
-            print(f"Adding {card_class_with_required_effect.name} to satisfy {required_effect}.")
-            # Add the card to the list of selected kingdom cards
-            selected_kingdom_card_classes.append(card_class_with_required_effect)
-            # Remove the card from the list of possible remaining kingdom cards
-            self.possible_kingdom_card_classes.remove(card_class_with_required_effect)
-        if self.customization.distribute_cost:
-            # Make sure there are at least two kingdom cards each of cost {2, 3, 4, 5} (this leaves 2 cards of any cost if no other customizations are chosen)
-            print("Distributing costs")
-            selected_kingdom_card_classes_by_cost = {cost: [card_class for card_class in selected_kingdom_card_classes if card_class._cost == cost] for cost in range(2, 6)}
-            possible_kingdom_card_classes_by_cost = {cost: [card_class for card_class in self.possible_kingdom_card_classes if card_class._cost == cost] for cost in range(2, 6)}
-            for cost in range(2, 6):
-                num_still_needed = max(0, 2 - len(selected_kingdom_card_classes_by_cost[cost]))
-                try:
-                    card_classes_of_cost = random.sample(possible_kingdom_card_classes_by_cost[cost], num_still_needed)
-                except ValueError:
-                    # It's possible that there aren't enough cards of this cost in the selected expansion to satisfy the requirement
-                    # E.g., the Prosperity expansion has no cards of cost 2
-                    try:
-                        # First try reducing the requirement
-                        card_classes_of_cost = random.sample(possible_kingdom_card_classes_by_cost[cost], 1)
-                    except ValueError:
-                        # Give up
-                        continue
-                print(f"Adding {num_still_needed} cards of cost {cost}: {' and '.join(card_class.name for card_class in card_classes_of_cost)}")
-                for card_class in card_classes_of_cost:
-                    selected_kingdom_card_classes.append(card_class)
-                    self.possible_kingdom_card_classes.remove(card_class)
-        # Select the remaining cards at random
-        num_cards_remaining = max(0, 10 - len(selected_kingdom_card_classes))
-        selected_kingdom_card_classes += random.sample(self.possible_kingdom_card_classes, num_cards_remaining)
+        kingdom_generator = KingdomGenerator(
+            self.possible_kingdom_card_classes,
+            required_card_classes=self.customization.required_card_classes,
+            required_effects=[effect for effect, required in self.customization.required_effects.items() if required],
+            distribute_cost=self.customization.distribute_cost,
+            disable_attack_cards=self.customization.disable_attack_cards,
+        )
+        selected_kingdom_card_classes = kingdom_generator.generate()
+        self.possible_kingdom_card_classes = [card_class for card_class in kingdom_generator.candidates if card_class not in selected_kingdom_card_classes]
         # Sort kingdom cards first by cost, then by name
         for card_class in sorted(selected_kingdom_card_classes, key=lambda card_class: (card_class._cost, card_class.name)):
             # Stacks of ten kingdom cards each
@@ -441,6 +468,7 @@ class Supply:
         Args:
             card: The card to return to the supply.
         """
+        card.release()
         card_class = type(card)
         self.card_stacks[card_class].return_card()
 
@@ -454,12 +482,20 @@ class Supply:
         Args:
             card: The card to add to the trash pile.
         """
+        card.release()
         card_class = type(card)
         self.trash_pile[card_class].append(card)
 
+    @property
+    def costs(self) -> CostEngine:
+        """
+        The cost engine holding every cost modification currently in effect.
+        """
+        return self._costs
+
     def modify_cost(self, card_class: Type[Card], increment: int):
         """
-        Temporarily modify the cost of a card in the supply.
+        Temporarily modify the cost of a card.
         (A card's cost cannot ever be less than 0.)
 
         Once the cost modification is no longer relevant, this needs
@@ -469,17 +505,27 @@ class Supply:
             card_class: The card class whose cost to modify.
             increment: The amount to add to the card's cost.
         """
-        self.card_stacks[card_class].modified_cost += increment
-        # Don't ever let the cost go below zero
-        if self.card_stacks[card_class].modified_cost < 0:
-            self.card_stacks[card_class].modified_cost = 0
+        self.costs.modify_cost(card_class, increment)
+
+    def modify_all_costs(self, increment: int, card_type: Optional[CardType] = None):
+        """
+        Temporarily modify the cost of all cards (or all cards of a type) at once.
+        (A card's cost cannot ever be less than 0.)
+
+        Once the cost modification is no longer relevant, this needs
+        to be undone by calling :meth:`reset_costs`.
+
+        Args:
+            increment: The amount to add to each card's cost.
+            card_type: If given, only cards of this type are affected.
+        """
+        self.costs.modify_all_costs(increment, card_type)
 
     def reset_costs(self):
         """
-        Reset the costs of all cards in the supply to their default.
+        Reset the costs of all cards to their default.
         """
-        for card_class in self.card_stacks:
-            self.card_stacks[card_class].modified_cost = self.card_stacks[card_class].base_cost
+        self.costs.reset()
 
     def card_name_to_card_class(self, card_name: str) -> Type[Card]:
         '''Convert a card name to a card class. If you need to use this function, you're almost definitely doing something wrong.
@@ -490,16 +536,88 @@ class Supply:
         Returns:
             The card class
         '''
-        for card_class in self.card_stacks:
-            if card_class.name == card_name:
-                return card_class
+        return self.card_stacks.card_class_named(card_name)
+
+    def invalidate_cost_index(self):
+        """
+        Mark the cost index as stale, e.g. because a stack was emptied.
+        It will be rebuilt the next time it is queried. (Cost changes are
+        detected through the cost engine's version instead.)
+        """
+        self._cost_index_costs = None
+
+    def _build_cost_index(self):
+        # Sort by modified cost, keeping the Supply's order among cards of equal cost
+        non_empty_stacks = [card_stack for card_stack in self.card_stacks.values() if not card_stack.is_empty]
+        non_empty_stacks.sort(key=lambda card_stack: card_stack.modified_cost)
+        self._cost_index_costs = [card_stack.modified_cost for card_stack in non_empty_stacks]
+        self._cost_index_card_classes = [card_stack.card_class for card_stack in non_empty_stacks]
+        self._cost_index_version = self.costs.version
+
+    def card_classes_costing(self, max_cost: int, exact_cost: bool = False, card_type: Optional[CardType] = None, invalid_card_classes: Optional[Iterable[Type[Card]]] = None) -> List[Type[Card]]:
+        """
+        The card classes of all non-empty stacks in the Supply whose
+        (modified) cost is at most (or exactly) a given cost.
+
+        Args:
+            max_cost: The maximum cost.
+            exact_cost: Whether the cost must be exactly :obj:`max_cost`.
+            card_type: If given, only cards of this type are included.
+            invalid_card_classes: Card classes to exclude.
+
+        Returns:
+            The matching card classes, ordered by cost.
+        """
+        if self._cost_index_costs is None or self._cost_index_version != self.costs.version:
+            self._build_cost_index()
+        costs = self._cost_index_costs
+        end = bisect_right(costs, max_cost)
+        start = bisect_left(costs, max_cost, 0, end) if exact_cost else 0
+        card_classes = self._cost_index_card_classes[start:end]
+        if card_type is not None:
+            type_bits = card_type.value
+            card_classes = [card_class for card_class in card_classes if card_class.type_bits & type_bits]
+        if invalid_card_classes:
+            invalid_card_classes = set(invalid_card_classes)
+            card_classes = [card_class for card_class in card_classes if card_class not in invalid_card_classes]
+        return card_classes
 
     @property
-    def num_empty_stacks(self):
+    def empty_stacks(self) -> Set[Type[Card]]:
+        """
+        The card classes whose supply piles are currently empty.
+
+        This is kept up to date by the supply stacks themselves as they
+        are emptied and refilled, so it never needs to be recomputed.
+        """
+        return self._empty_stacks
+
+    @property
+    def num_empty_stacks(self) -> int:
         """
         The number of empty supply piles in the supply.
         """
-        return [stack.is_empty for stack in self.card_stacks.values()].count(True)
+        return len(self._empty_stacks)
+
+    def stack_emptied(self, card_class: Type[Card]):
+        """
+        Called by a supply stack when its last card is taken.
+
+        Args:
+            card_class: The card class whose stack was emptied.
+        """
+        self._empty_stacks.add(card_class)
+        self.invalidate_cost_index()
+
+    def stack_refilled(self, card_class: Type[Card]):
+        """
+        Called by a supply stack when a card is returned to it after it was empty.
+
+        Args:
+            card_class: The card class whose stack was refilled.
+        """
+        self._empty_stacks.discard(card_class)
+        self.invalidate_cost_index()
 
     @property
     def trash_pile_json(self):
@@ -650,8 +768,9 @@ class FiniteSupplyStack(SupplyStack):
     def __init__(self, supply: Supply, card_class: Type[Card], size: int):
         super().__init__(supply, card_class)
         self._base_cost = self.example.cost
-        self._modified_cost = self.example.cost
         self._cards_remaining = size
+        if size == 0:
+            supply.stack_emptied(card_class)
 
     @property
     def base_cost(self) -> int:
@@ -665,11 +784,7 @@ class FiniteSupplyStack(SupplyStack):
         """
         The cost of the card, including any modifications.
         """
-        return self._modified_cost
-
-    @modified_cost.setter
-    def modified_cost(self, value: int):
-        self._modified_cost = value
+        return self.supply.costs.get_cost(self.card_class)
 
     def draw(self) -> Card:
         """
@@ -682,6 +797,8 @@ class FiniteSupplyStack(SupplyStack):
         if not self.is_empty:
             card = self.card_class()
             self._cards_remaining -= 1
+            if self._cards_remaining == 0:
+                self.supply.stack_emptied(self.card_class)
             return card
         else:
             raise SupplyStackEmptyError(self.card_class)
@@ -691,6 +808,8 @@ class FiniteSupplyStack(SupplyStack):
         Return a card to its stack and increment its number of cards
         remaining by one.
         """
+        if self._cards_remaining == 0:
+            self.supply.stack_refilled(self.card_class)
         self._cards_remaining += 1
 
     @property
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import sys
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import combinations
+from math import inf, log, sqrt
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from .cards.custom_sets import CustomSet
+from .expansions import DominionExpansion
+from .game import Game
+from .limits import GameLimits
+
+if TYPE_CHECKING:
+    from .cards.cards import Card
+    from .expansions.expansion import Expansion
+    from .interactions.interaction import Interaction
+
+
+@dataclass
+class Pairing:
+    """
+    The results so far of the games between two entrants of a :class:`Tournament`.
+
+    Games are played in pairs with the seats swapped (see :meth:`Tournament.run`),
+    and each pair is scored as the first entrant's average share of the wins.
+
+    Args:
+        first: The name of the first entrant.
+        second: The name of the second entrant.
+    """
+    first: str
+    second: str
+    num_pairs: int = 0
+    total: float = 0.0 # Of the first entrant's pair scores
+    total_squares: float = 0.0
+    resolved: bool = False
+    scheduled: int = 0 # Pairs of games submitted, including those still being played
+    in_flight: int = 0
+
+    @property
+    def num_games(self) -> int:
+        """
+        The number of games played.
+        """
+        return 2 * self.num_pairs
+
+    @property
+    def score(self) -> float:
+        """
+        The first entrant's share of the wins (0.5 if no games have been played).
+        """
+        return self.total / self.num_pairs if self.num_pairs else 0.5
+
+    def confidence_interval(self, z: float) -> Tuple[float, float]:
+        """
+        Get a confidence interval for the first entrant's share of the wins.
+
+        Args:
+            z: The number of standard errors on either side of the score.
+        """
+        if self.num_pairs < 2:
+            return 0.0, 1.0
+        variance = (self.total_squares - self.num_pairs * self.score ** 2) / (self.num_pairs - 1)
+        margin = z * sqrt(max(variance, 0.0) / self.num_pairs)
+        return max(self.score - margin, 0.0), min(self.score + margin, 1.0)
+
+
+class Tournament:
+    """
+    Plays round-robin matches between CPU strategies, rating them as it goes.
+
+    Every pair of entrants plays 2-player games in seat-swapped pairs: both
+    games of a pair are played from the same seed, so the kingdom, the
+    starting decks and the turn order are the same, but the entrants swap
+    seats. This cancels out most of the luck of the draw. A pairing stops
+    early once its confidence interval excludes an even split, since more
+    games would not change who is better, or once it has played
+    :attr:`max_pairs` pairs.
+
+    Elo ratings are updated after every game, in the order the games
+    finish. Rating margins are worked out from each entrant's overall
+    share of the wins.
+
+    Args:
+        entrants: The interactions class of each entrant, by name. With worker processes,
+            these are inherited by forking, so they needn't be importable.
+        kingdoms: The kingdoms to play, one chosen at random for each pair of games.
+            If :obj:`None`, kingdoms are generated at random from the expansions.
+        expansions: The expansions to generate kingdoms from.
+        limits: The limits of each game (by default, :meth:`~dominion.limits.GameLimits.for_simulation`).
+        confidence: The confidence level of the intervals that pairings stop early on.
+        min_pairs: The number of pairs of games each pairing plays before it can stop early.
+        max_pairs: The most pairs of games each pairing plays.
+        num_workers: The number of worker processes to play games in, or 0 to play them in this process.
+        k_factor: The Elo K-factor.
+        seed: The seed to play the games with.
+    """
+    initial_rating: float = 1500.0
+    batch_size: int = 4 # Pairs of games in flight per pairing, so pairings that are resolved stop soon
+
+    def __init__(
+        self,
+        entrants: Mapping[str, Type[Interaction]],
+        kingdoms: Optional[Sequence[Sequence[Type[Card]]]] = None,
+        expansions: Sequence[Type[Expansion]] = (DominionExpansion,),
+        limits: Optional[GameLimits] = None,
+        confidence: float = 0.95,
+        min_pairs: int = 10,
+        max_pairs: int = 200,
+        num_workers: int = os.cpu_count() or 1,
+        k_factor: float = 16.0,
+        seed: Optional[int] = None,
+    ):
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants.")
+        self.entrants = dict(entrants)
+        self.kingdoms = [tuple(kingdom) for kingdom in kingdoms] if kingdoms is not None else None
+        self.expansions = tuple(expansions)
+        self.limits = limits if limits is not None else GameLimits.for_simulation()
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.min_pairs = min_pairs
+        self.max_pairs = max_pairs
+        self.num_workers = num_workers
+        self.k_factor = k_factor
+        self._rng = random.Random(seed)
+        self.pairings = [Pairing(first, second) for first, second in combinations(self.entrants, 2)]
+        self.ratings: Dict[str, float] = {name: self.initial_rating for name in self.entrants}
+        self._wins: Dict[str, float] = {name: 0.0 for name in self.entrants}
+        self._games: Dict[str, int] = {name: 0 for name in self.entrants}
+
+    def run(self) -> List[Tuple[str, float, float]]:
+        """
+        Play every pairing until it is resolved or reaches its maximum number of games.
+
+        Returns:
+            The :meth:`standings`.
+        """
+        names = list(self.entrants)
+        in_flight: Dict[Future, Pairing] = {}
+        with self._executor() as executor:
+            # Games played in this process are played as they're submitted, so there's no point submitting them ahead
+            batch_size = 1 if isinstance(executor, _InlineExecutor) else self.batch_size
+            while True:
+                for pairing in self.pairings:
+                    while not pairing.resolved and pairing.in_flight < batch_size and pairing.scheduled < self.max_pairs:
+                        kingdom = self._rng.choice(self.kingdoms) if self.kingdoms is not None else None
+                        future = executor.submit(_play_pair, names.index(pairing.first), names.index(pairing.second), kingdom, self._rng.getrandbits(64))
+                        in_flight[future] = pairing
+                        pairing.scheduled += 1
+                        pairing.in_flight += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pairing = in_flight.pop(future)
+                    pairing.in_flight -= 1
+                    if not future.cancelled():
+                        self._record(pairing, future.result())
+                    if pairing.resolved:
+                        # Don't play games that can't change the outcome
+                        for other_future, other_pairing in in_flight.items():
+                            if other_pairing is pairing:
+                                other_future.cancel()
+        return self.standings()
+
+    def _executor(self) -> Executor:
+        if self.num_workers < 1 or "fork" not in multiprocessing.get_all_start_methods():
+            _start_worker(self.entrants.values(), self.expansions, self.limits, redirect_stdout=False)
+            return _InlineExecutor()
+        return ProcessPoolExecutor(
+            self.num_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_start_worker,
+            initargs=(list(self.entrants.values()), self.expansions, self.limits),
+        )
+
+    def _record(self, pairing: Pairing, shares: Tuple[float, float]):
+        # Rate both games of a pair, then check whether the pairing is resolved
+        for share in shares:
+            self._rate(pairing.first, pairing.second, share)
+        pair_score = sum(shares) / 2
+        pairing.num_pairs += 1
+        pairing.total += pair_score
+        pairing.total_squares += pair_score ** 2
+        if pairing.resolved:
+            # Games already being played when the pairing was resolved still count, but can't unresolve it
+            return
+        low, high = pairing.confidence_interval(self.z)
+        if pairing.num_pairs >= self.min_pairs and (low > 0.5 or high < 0.5):
+            pairing.resolved = True
+        elif pairing.num_pairs >= self.max_pairs:
+            pairing.resolved = True
+
+    def _rate(self, first: str, second: str, share: float):
+        expected = 1 / (1 + 10 ** ((self.ratings[second] - self.ratings[first]) / 400))
+        self.ratings[first] += self.k_factor * (share - expected)
+        self.ratings[second] -= self.k_factor * (share - expected)
+        self._wins[first] += share
+        self._wins[second] += 1 - share
+        self._games[first] += 1
+        self._games[second] += 1
+
+    def rating_margin(self, name: str) -> float:
+        """
+        Get the margin of error of an entrant's rating, at the tournament's confidence level.
+
+        This is the standard error of the Elo difference implied by the entrant's
+        share of the wins across all their games, which is infinite while they
+        have won all or none of them.
+
+        Args:
+            name: The name of the entrant.
+        """
+        num_games = self._games[name]
+        score = self._wins[name] / num_games if num_games else 0.5
+        if not 0 < score < 1:
+            return inf
+        return self.z * 400 / log(10) / sqrt(num_games * score * (1 - score))
+
+    def standings(self) -> List[Tuple[str, float, float]]:
+        """
+        The entrants' names, ratings and rating margins, best first.
+        """
+        return sorted(((name, rating, self.rating_margin(name)) for name, rating in self.ratings.items()), key=lambda standing: standing[1], reverse=True)
+
+
+class _InlineExecutor(Executor):
+    # Plays each pair of games as soon as it is submitted
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+# Set in each worker process by _start_worker
+_entrants: List[Type[Interaction]] = []
+_expansions: Tuple[Type[Expansion], ...] = ()
+_limits: GameLimits = GameLimits()
+
+
+def _start_worker(entrants: Sequence[Type[Interaction]], expansions: Sequence[Type[Expansion]], limits: GameLimits, redirect_stdout: bool = True):
+    global _entrants, _expansions, _limits
+    _entrants, _expansions, _limits = list(entrants), tuple(expansions), limits
+    if redirect_stdout:
+        # Games print as they go, which nobody reads in a worker
+        sys.stdout = open(os.devnull, "w")
+
+
+def _play_pair(first: int, second: int, kingdom: Optional[Tuple[Type[Card], ...]], seed: int) -> Tuple[float, float]:
+    # The first entrant's share of the wins of a game from each seat
+    return (
+        _play_game((_entrants[first], _entrants[second]), kingdom, seed)[0],
+        _play_game((_entrants[second], _entrants[first]), kingdom, seed)[1],
+    )
+
+
+def _play_game(interactions_classes: Sequence[Type[Interaction]], kingdom: Optional[Tuple[Type[Card], ...]], seed: int) -> List[float]:
+    # Each player's share of the wins, with the game (and so its kingdom, decks and turn order) seeded
+    random.seed(seed)
+    game = Game(test=True, limits=_limits)
+    if kingdom is not None:
+        game.custom_set = CustomSet.from_json({"cards": [card_class.name for card_class in kingdom]})
+    else:
+        for expansion in _expansions:
+            game.add_expansion(expansion)
+    for interactions_class in interactions_classes:
+        game.add_cpu(interactions_class)
+    game.start()
+    _, _, winners = game.scores
+    return [1 / len(winners) if player.name in winners else 0.0 for player in game.players]
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
-from typing import TYPE_CHECKING, List, Dict, Type
+from typing import TYPE_CHECKING, List, Dict, Optional, Type
 
-from .cards.cards import Card, CardType, CurseCard
+from .cards.cards import Card, CardType, CurseCard, ACTION_BIT, TREASURE_BIT
+from .events import EventType, GameEvent
 from .expansions import GuildsExpansion
 from .game_log import GameLog, GameLogEntry
-from .grammar import a, s
+from .grammar import s
 from .interactions import AutoInteraction, BrowserInteraction
 
 if TYPE_CHECKING:
@@ -47,7 +48,6 @@ class Turn:
         self._post_buy_hooks = defaultdict(list)
         self._pre_cleanup_hooks = []
         self._invalid_card_classes = []
-        self._cost_modifiers = defaultdict(int)
 
     @property
     def player(self) -> Player:
@@ -208,9 +208,9 @@ class Turn:
     @property
     def cost_modifiers(self) -> Dict[Type[Card], int]:
         """
-        A dictionary of cost modifiers for cards.
+        A dictionary of cost modifiers for individual card classes.
         """
-        return self._cost_modifiers
+        return self.game.supply.costs.modifiers
 
     def should_order_treasures(self, treasures: List[TreasureCard]) -> bool:
         """
@@ -256,10 +256,8 @@ class Turn:
             The cost of the card or card class.
         """
         if isinstance(card_like, Card):
-            cost_modifier = self.cost_modifiers[type(card_like)]
-        else:
-            cost_modifier = self.cost_modifiers[card_like]
-        return max(card_like._cost + cost_modifier, 0)
+            card_like = type(card_like)
+        return self.game.supply.costs.get_cost(card_like)
 
     def start(self):
         '''
@@ -276,6 +274,25 @@ class Turn:
         self.buy_phase.start()
         self.cleanup_phase.start()
 
+    def resume(self):
+        '''
+        Continue the Turn from its current phase, e.g. in a forked game.
+
+        The current phase picks up again from its start (see :meth:`Phase.resume`)
+        and the remaining phases follow as usual. A decision that was in progress
+        is asked again, but the effects of a card that was partway through being
+        played are not resumed.
+        '''
+        phases = [self.action_phase, self.buy_phase, self.cleanup_phase]
+        if self.current_phase is None:
+            self.process_pre_turn_hooks()
+            first_phase = 0
+        else:
+            first_phase = phases.index(self.current_phase)
+        phases[first_phase].resume()
+        for phase in phases[first_phase + 1:]:
+            phase.start()
+
     def add_treasure_hook(self, treasure_hook: TreasureHook, card_class: Type[Card]):
         '''
         Add a turn-wide treasure hook to a specific card class.
@@ -342,13 +359,10 @@ class Turn:
             message: Whether or not to broadcast the change.
         """
         self.actions_remaining += num_actions
-        if message:
-            if num_actions > 0:
-                self._game_log.add_context_aware_subentry(f"+{s(num_actions, 'action')} → {s(self.actions_remaining, 'action')}.")
-                self.game.broadcast(f"+{s(num_actions, 'action')} → {s(self.actions_remaining, 'action')}.")
-            elif num_actions < 0:
-                self._game_log.add_context_aware_subentry(f"-{s(-num_actions, 'action')} → {s(self.actions_remaining, 'action')}.")
-                self.game.broadcast(f"-{s(-num_actions, 'action')} → {s(self.actions_remaining, 'action')}.")
+        if message and num_actions != 0:
+            event = GameEvent(EventType.ACTIONS, self.player, quantity=num_actions, total=self.actions_remaining)
+            self._game_log.add_context_aware_subentry(event)
+            self.game.broadcast(event)
 
     def plus_buys(self, num_buys: int, message: bool = True):
         """
@@ -359,13 +373,10 @@ class Turn:
             message: Whether or not to broadcast the change.
         """
         self.buys_remaining += num_buys
-        if message:
-            if num_buys > 0:
-                self._game_log.add_context_aware_subentry(f"+{s(num_buys, 'buy')} → {s(self.buys_remaining, 'buy')}.")
-                self.game.broadcast(f"+{s(num_buys, 'buy')} → {s(self.buys_remaining, 'buy')}.")
-            elif num_buys < 0:
-                self._game_log.add_context_aware_subentry(f"-{s(-num_buys, 'buy')} → {s(self.buys_remaining, 'buy')}.")
-                self.buys_remaining(f"-{s(-num_buys, 'buy')} → {s(self.buys_remaining,'buy')}.")
+        if message and num_buys != 0:
+            event = GameEvent(EventType.BUYS, self.player, quantity=num_buys, total=self.buys_remaining)
+            self._game_log.add_context_aware_subentry(event)
+            self.game.broadcast(event)
 
     def plus_coppers(self, num_coppers: int, message: bool = True):
         """
@@ -376,13 +387,10 @@ class Turn:
             message: Whether or not to broadcast the change.
         """
         self.coppers_remaining += num_coppers
-        if message:
-            if num_coppers > 0:
-                self._game_log.add_context_aware_subentry(f"+{num_coppers} $ → {self.coppers_remaining} $.")
-                self.game.broadcast(f'+{num_coppers} $ → {self.coppers_remaining} $.')
-            elif num_coppers < 0:
-                self._game_log.add_context_aware_subentry(f'-{-num_coppers} $ → {self.coppers_remaining} $.')
-                self.game.broadcast(f'-{-num_coppers} $ → {self.coppers_remaining} $.')
+        if message and num_coppers != 0:
+            event = GameEvent(EventType.COPPERS, self.player, quantity=num_coppers, total=self.coppers_remaining)
+            self._game_log.add_context_aware_subentry(event)
+            self.game.broadcast(event)
 
     def process_pre_turn_hooks(self):
         '''
@@ -429,9 +437,18 @@ class Turn:
             card_class: The card class to modify.
             modifier: The modifier to add.
         """
-        self.cost_modifiers[card_class] += modifier
         self.game.supply.modify_cost(card_class, modifier)
 
+    def modify_all_costs(self, modifier: int, card_type: Optional[CardType] = None):
+        """
+        Add a cost modifier to all cards (or all cards of a type) at once.
+
+        Args:
+            modifier: The modifier to add.
+            card_type: If given, only cards of this type are affected.
+        """
+        self.game.supply.modify_all_costs(modifier, card_type)
+
 
 class Phase(metaclass=ABCMeta):
     '''
@@ -508,6 +525,14 @@ class Phase(metaclass=ABCMeta):
         except AttributeError:
             pass
 
+    def resume(self):
+        '''
+        Continue the phase after it was interrupted, e.g. in a forked game.
+
+        By default, the phase simply starts over.
+        '''
+        self.start()
+
     @property
     @abstractmethod
     def phase_name(self) -> str:
@@ -533,7 +558,7 @@ class ActionPhase(Phase):
         super().start()
         while self.turn.actions_remaining > 0:
             # If there are no action cards in the player's hand, move on
-            if not any(CardType.ACTION in card.types for card in self.player.hand):
+            if not any(card.type_bits & ACTION_BIT for card in self.player.hand):
                 self.player.interactions.send('No Action cards to play. Ending action phase.')
                 return
             prompt = f"You have {s(self.turn.actions_remaining, 'action')}. Select an Action card to play."
@@ -555,8 +580,9 @@ class ActionPhase(Phase):
         Args:
             card: The action card to play.
         '''
-        self._game_log.add_entry(f"{self.player} played {a(card)}.", parent=self._log_entry)
-        self.game.broadcast(f'{self.player} played {a(card)}.')
+        event = GameEvent(EventType.PLAY, self.player, card)
+        self._game_log.add_entry(event, parent=self._log_entry)
+        self.game.broadcast(event)
         # Add the card to the played cards area
         self.player.play(card)
         # Playing an action card uses one action
@@ -570,8 +596,9 @@ class ActionPhase(Phase):
         Args:
             card: The action card to play.
         '''
-        self._game_log.add_entry(f"{self.player} played {a(card)}.", parent=self._log_entry)
-        self.game.broadcast(f'{self.player} played {a(card)}.')
+        event = GameEvent(EventType.PLAY, self.player, card)
+        self._game_log.add_entry(event, parent=self._log_entry)
+        self.game.broadcast(event)
         self.walk_through_action_card(card)
 
     def walk_through_action_card(self, card: ActionCard):
@@ -598,10 +625,21 @@ class BuyPhase(Phase):
     '''
     Buy phase of the current turn.
     '''
+    def __init__(self, turn: Turn):
+        super().__init__(turn)
+        self._treasures_played = False # Whether the player is done playing Treasures and has moved on to buying
+
     @property
     def phase_name(self) -> str:
         return "Buy Phase"
 
+    @property
+    def treasures_played(self) -> bool:
+        """
+        Whether the player is done playing Treasures and has moved on to buying cards.
+        """
+        return self._treasures_played
+
     def start(self):
         '''
         Start the buy phase. 
@@ -622,7 +660,7 @@ class BuyPhase(Phase):
         for expansion_instance in self.supply.customization.expansions:
             expansion_instance.additional_pre_buy_phase_actions()
         # Find any Treasures in the player's hand
-        treasures_available = [card for card in self.player.hand if CardType.TREASURE in card.types]
+        treasures_available = [card for card in self.player.hand if card.type_bits & TREASURE_BIT]
         # Ask the player which Treasures they would like to play
         treasures_to_play = []
         if treasures_available:
@@ -646,7 +684,25 @@ class BuyPhase(Phase):
         self.process_post_treasure_hooks()
         # Activate any pre-buy hooks registered to cards in the Supply
         self.process_pre_buy_hooks()
+        self._treasures_played = True
         # Buy cards
+        self.buy_cards()
+
+    def resume(self):
+        '''
+        Continue the buy phase. If the player has already played their Treasures,
+        this goes straight back to buying cards.
+        '''
+        if self._treasures_played:
+            self.buy_cards()
+        else:
+            self.start()
+
+    def buy_cards(self):
+        '''
+        While the player has buys remaining, ask them which cards
+        they would like to buy (then gain them).
+        '''
         while self.turn.buys_remaining > 0:
             prompt = f"You have {self.turn.coppers_remaining} $ to spend and {s(self.turn.buys_remaining, 'buy')}. Select a card to buy."
             card_class = self.player.interactions.choose_card_class_from_supply(prompt=prompt, max_cost=self.turn.coppers_remaining, force=False, invalid_card_classes=self.turn.invalid_card_classes)
@@ -716,21 +772,20 @@ class BuyPhase(Phase):
             treasures: A list of treasure cards to play.
         '''
         if not treasures:
-            self._game_log.add_entry(f"{self.player} did not any Treasures.", parent=self._log_entry)
-            self.game.broadcast(f"{self.player} did not play any Treasures.")
+            event = GameEvent(EventType.PLAY_TREASURES, self.player)
+            self._game_log.add_entry(event, parent=self._log_entry)
+            self.game.broadcast(event)
             return
         # Allow each expansion to modify the order of Treasures played
         if self.turn.should_order_treasures(treasures):
             num_treasures_played = len(treasures)
             prompt = f"You played some Treasures which might benefit from being played in a particular order. Please choose the order in which you would like to play them. (1 will be played first, {num_treasures_played} will be played last.)"
             treasures = self.player.interactions.choose_cards_from_list(prompt, treasures, force=True, max_cards=num_treasures_played, ordered=True)
-            treasures_string = ", ".join([treasure.name for treasure in treasures])
-            self._game_log.add_entry(f"{self.player} played Treasures in the following order: {treasures_string}.", parent=self._log_entry)
-            self.game.broadcast(f"{self.player} played Treasures in the following order: {treasures_string}.")
+            event = GameEvent(EventType.PLAY_TREASURES, self.player, cards=list(treasures), ordered=True)
         else:
-            treasures_string = Card.group_and_sort_by_cost(treasures)
-            self._game_log.add_entry(f"{self.player} played Treasures: {treasures_string}.", parent=self._log_entry)
-            self.game.broadcast(f"{self.player} played Treasures: {treasures_string}.")
+            event = GameEvent(EventType.PLAY_TREASURES, self.player, cards=list(treasures))
+        self._game_log.add_entry(event, parent=self._log_entry)
+        self.game.broadcast(event)
         # Play the Treasures
         for treasure in treasures:
             # Add the Treasure to the played cards area and remove from hand
@@ -817,8 +872,9 @@ class BuyPhase(Phase):
         # Buying a card uses one buy
         self.turn.buys_remaining -= 1
         # Gain the desired card
-        self._game_log.add_entry(f"{self.player} bought {a(card_class.name)}.", parent=self._log_entry)
-        self.game.broadcast(f'{self.player} bought {a(card_class.name)}.')
+        event = GameEvent(EventType.BUY, self.player, card_class)
+        self._game_log.add_entry(event, parent=self._log_entry)
+        self.game.broadcast(event)
         purchased_card = self.player.gain(card_class, message=False)[0]
         self.turn.coppers_remaining -= self.supply.card_stacks[card_class].modified_cost
         # Activate any post-buy hooks registered to this card class
@@ -840,13 +896,15 @@ class BuyPhase(Phase):
         '''
         card_class = self.player.interactions.choose_card_class_from_supply(prompt=prompt, max_cost=max_cost, force=force, exact_cost=exact_cost)
         if card_class is None:
-            self._game_log.add_entry(f"{self.player} did not gain anything.", parent=self._log_entry)
-            self.game.broadcast(f'{self.player} did not gain anything.')
+            event = GameEvent(EventType.GAIN_FAILED, self.player)
+            self._game_log.add_entry(event, parent=self._log_entry)
+            self.game.broadcast(event)
             return
         else:
             # Gain the desired card
-            self._game_log.add_entry(f"{self.player} gained {a(card_class.name)}.", parent=self._log_entry)
-            self.game.broadcast(f'{self.player} gained {a(card_class.name)}.')
+            event = GameEvent(EventType.GAIN, self.player, card_class)
+            self._game_log.add_entry(event, parent=self._log_entry)
+            self.game.broadcast(event)
             self.player.gain(card_class, message=False)
 
 
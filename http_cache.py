@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from flask import Request, Response, send_from_directory
+
+
+class CachedPayload:
+    """
+    A JSON payload that is serialized and compressed once and can then be
+    served any number of times without further work.
+
+    Responses carry an ETag and a Last-Modified date, so clients that
+    already have the payload get an empty 304 response, and the payload
+    is served gzipped to clients that accept it.
+
+    Args:
+        data: The (JSON-serializable) data to serve. It should not change afterward.
+        max_age: How long (in seconds) clients may use the payload without revalidating it.
+    """
+    def __init__(self, data: Any, max_age: int = 3600):
+        self.data = data
+        self.max_age = max_age
+        self.body = json.dumps(data, separators=(",", ":")).encode()
+        self.gzipped_body = gzip.compress(self.body, mtime=0)
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def response(self, request: Request) -> Response:
+        """
+        Build a (possibly 304) response to a request for this payload.
+
+        Args:
+            request: The request being responded to.
+        """
+        use_gzip = request.accept_encodings["gzip"] > 0
+        response = Response(self.gzipped_body if use_gzip else self.body, mimetype="application/json")
+        if use_gzip:
+            response.content_encoding = "gzip"
+        # Each encoding is a different representation, so they need different ETags
+        response.set_etag(f"{self.etag}-gzip" if use_gzip else self.etag)
+        response.last_modified = self.last_modified
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        return response.make_conditional(request)
+
+
+class StaticAssets:
+    """
+    Serves the content-hashed, precompressed frontend assets written by
+    ``build_static.py``.
+
+    Since a hashed file's contents can never change, hashed files are served
+    with immutable, year-long cache headers. The index (which refers to the
+    hashed files) must be revalidated on every visit, which is cheap thanks
+    to conditional GET support. Each file is served brotli- or
+    gzip-compressed when the client accepts it and a compressed copy exists.
+
+    Args:
+        public_directory: The directory the frontend is served from.
+    """
+    IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+    ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")] # In order of preference
+
+    def __init__(self, public_directory: str | Path):
+        self.public_directory = Path(public_directory)
+        self.dist_directory = self.public_directory / "dist"
+        manifest: Dict[str, str] = json.loads((self.dist_directory / "manifest.json").read_text())
+        # Paths (relative to the public directory) of every file that can be served, including the index
+        self.files = set(manifest.values()) | {"dist/index.html"}
+        self.compressed_files = {
+            f"{path}{suffix}"
+            for path in self.files
+            for _, suffix in self.ENCODINGS
+            if (self.public_directory / f"{path}{suffix}").is_file()
+        }
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.files
+
+    def response(self, request: Request, path: str = "dist/index.html") -> Response:
+        """
+        Build a (possibly 304) response to a request for an asset.
+
+        Args:
+            request: The request being responded to.
+            path: The asset's path relative to the public directory. Defaults to the index.
+        """
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        immutable = path != "dist/index.html"
+        filename, encoding = path, None
+        for candidate_encoding, suffix in self.ENCODINGS:
+            if request.accept_encodings[candidate_encoding] > 0 and f"{path}{suffix}" in self.compressed_files:
+                filename, encoding = f"{path}{suffix}", candidate_encoding
+                break
+        response = send_from_directory(
+            self.public_directory,
+            filename,
+            mimetype=mimetype,
+            conditional=True,
+            etag=True,
+            max_age=self.IMMUTABLE_MAX_AGE if immutable else 0,
+        )
+        if encoding is not None:
+            response.content_encoding = encoding
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        if immutable:
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response
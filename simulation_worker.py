@@ -0,0 +1,26 @@
+"""
+Run the simulation jobs submitted to the server's admin API.
+
+Jobs are kept in the database at ``SIMULATION_DATABASE``, which the server
+and this worker share. Run the worker as a process of its own (e.g., a
+second container), so that simulations never take CPU time from the games
+the server is running. Jobs left running when the worker stops are carried
+on from their last saved progress when it starts again.
+"""
+from config import Config
+from dominion.interactions.strategy import load_strategies
+from dominion.jobs import JobQueue, JobWorker
+
+
+def main():
+    if not Config.SIMULATION_DATABASE:
+        raise SystemExit("SIMULATION_DATABASE is not set.")
+    if Config.STRATEGIES_DIRECTORY:
+        load_strategies(Config.STRATEGIES_DIRECTORY)
+    worker = JobWorker(JobQueue(Config.SIMULATION_DATABASE), num_workers=Config.SIMULATION_WORKERS, chunk_size=Config.SIMULATION_CHUNK_SIZE)
+    print(f"Running the simulation jobs in {Config.SIMULATION_DATABASE} with {worker.num_workers} workers.")
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
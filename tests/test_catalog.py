@@ -0,0 +1,33 @@
+from dominion.cards import base_cards
+from dominion.cards.catalog import CATALOG, CATALOG_BY_NAME, card_record
+from dominion.cards.custom_sets import CustomSet
+from dominion.cards.dominion_cards import Smithy
+from dominion.expansions import DominionExpansion
+from dominion.game import Game
+from dominion.limits import GameLimits
+
+
+def test_catalog_names_kingdom_cards_only():
+    '''
+    Test that looking up basic cards doesn't let custom sets use them as kingdom cards.
+    '''
+    card_record(base_cards.Copper)
+    assert "Copper" not in CATALOG_BY_NAME
+    custom_set = CustomSet.from_json({"cards": ["Copper", "Province", "Curse", "Smithy"]})
+    assert custom_set.card_classes == {Smithy}
+
+
+def test_game_over_leaves_catalog_alone():
+    '''
+    Test that describing the basic cards at the end of a game doesn't add them to the catalog.
+    '''
+    card_classes = set(CATALOG)
+    card_names = set(CATALOG_BY_NAME)
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    game.add_expansion(DominionExpansion)
+    for _ in range(2):
+        game.add_cpu()
+    game.start()
+    assert any(card["name"] == "Copper" for player_data in game.game_over_data["playerData"] for card in player_data["cards"])
+    assert set(CATALOG) == card_classes
+    assert set(CATALOG_BY_NAME) == card_names
@@ -0,0 +1,32 @@
+import pytest
+from dominion.jobs import DONE, QUEUED, JobQueue, JobWorker
+
+
+KINGDOM = ["Village", "Smithy", "Festival", "Laboratory", "Market"]
+
+
+def test_job_queue(tmp_path):
+    '''
+    Test that simulation jobs are run in chunks, and that jobs left running by a stopped worker are carried on the same.
+    '''
+    queue = JobQueue(str(tmp_path / "simulations.db"))
+    with pytest.raises(ValueError):
+        queue.submit(KINGDOM, ["Big Money", "Nonexistent Strategy"], 100)
+    with pytest.raises(ValueError, match="Unknown kingdom cards: Copper"):
+        queue.submit(KINGDOM + ["Copper"], ["Big Money", "Engine"], 100)
+    worker = JobWorker(queue, num_workers=0, chunk_size=40)
+    first_id = queue.submit(KINGDOM, ["Big Money", "Engine"], 100, seed=1)
+    assert worker.run_next()
+    first = queue.get(first_id)
+    assert first.status == DONE and first.games_played == 100
+    assert sum(first.wins) == pytest.approx(100)
+    # A worker stops right after claiming a job, and the next one carries it on
+    second_id = queue.submit(KINGDOM, ["Big Money", "Engine"], 100, seed=1)
+    assert queue.claim().id == second_id
+    assert not worker.run_next()
+    assert queue.requeue_running() == 1
+    assert queue.get(second_id).status == QUEUED
+    assert worker.run_next()
+    second = queue.get(second_id)
+    assert (second.wins, second.total_scores, second.total_turns) == (first.wins, first.total_scores, first.total_turns)
+    assert [job.id for job in queue.updated_since(first.updated_at)] == [second_id]
@@ -0,0 +1,30 @@
+import numpy as np
+from dominion.cards.base_cards import Copper, Estate, Gold, Silver
+from dominion.cards.dominion_cards import Smithy, Village
+from dominion.odds import DrawOdds
+
+
+def test_starting_deck_odds():
+    '''
+    Test the exact odds of a starting hand against hand counting.
+    '''
+    odds = DrawOdds({Copper: 7, Estate: 3})
+    # 5/2 and 2/5 splits each come up 1 time in 12
+    assert np.allclose(odds.money_distribution(), [0, 0, 1 / 12, 5 / 12, 5 / 12, 1 / 12])
+    assert np.isclose(odds.probability_at_least(5), 1 / 12)
+    assert odds.action_collision_probability() == 0
+
+
+def test_sampled_odds():
+    '''
+    Test that sampled odds agree with the exact ones, including when the discard pile is reshuffled.
+    '''
+    for deck, discard_pile in [
+        ({Copper: 4, Silver: 3, Gold: 2, Estate: 3, Smithy: 2, Village: 1}, {}),
+        ({Copper: 2, Smithy: 1}, {Gold: 5, Estate: 5, Smithy: 2}),
+    ]:
+        exact = DrawOdds(deck, discard_pile)
+        sampled = DrawOdds(deck, discard_pile, num_samples=50000, rng=np.random.default_rng(0))
+        assert np.isclose(exact.probability_at_least(8), sampled.probability_at_least(8), atol=0.01)
+        assert np.isclose(exact.action_collision_probability(), sampled.action_collision_probability(), atol=0.01)
+        assert np.isclose(exact.expected_money(), sampled.expected_money(), atol=0.05)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from dominion.cards.dominion_cards import Festival, Laboratory, Market, Smithy, Village
+from dominion.interactions.strategy import BIG_MONEY, ENGINE, Strategy
+from dominion.limits import GameLimits
+from dominion.simulator import VectorizedSimulator, simulate_with_game
+
+
+KINGDOM = [Village, Smithy, Festival, Laboratory, Market]
+
+
+def test_simulator_matches_game():
+    '''
+    Cross-check the vectorized simulator against the full game engine.
+    '''
+    strategies = (ENGINE, BIG_MONEY)
+    simulated = VectorizedSimulator(KINGDOM, strategies, seed=0).run(2000)
+    played = simulate_with_game(KINGDOM, strategies, num_games=100)
+    assert np.allclose(simulated.win_rates, played.win_rates, atol=0.1)
+    assert np.allclose(simulated.mean_scores, played.mean_scores, atol=3)
+    assert abs(simulated.mean_game_length - played.mean_game_length) < 3
+
+
+LAB_STRATEGY = """
+name: Lab Big Money
+play Laboratory, Smithy
+buy Province if $ >= 8 and count(Gold) >= 1
+buy Duchy if provinces <= 4
+buy Gold
+buy Laboratory if count < 3 # Labs are non-terminal, so a few can't hurt
+buy Smithy if count(Smithy) = 0
+buy Silver
+"""
+
+
+def test_strategy_text():
+    '''
+    Test that a strategy written as text plays the same in the vectorized simulator and the full game engine.
+    '''
+    strategy = Strategy.parse(LAB_STRATEGY)
+    assert strategy.name == "Lab Big Money"
+    assert strategy.play_order == (Laboratory, Smithy)
+    assert strategy.buy_table[3].max_owned == 3
+    assert len(strategy.buy_table[0].conditions) == 2
+    with pytest.raises(ValueError, match="Line 2"):
+        Strategy.parse("name: Broken\nbuy Nonexistent Card")
+    strategies = (strategy, BIG_MONEY)
+    simulated = VectorizedSimulator(KINGDOM, strategies, seed=0).run(2000)
+    played = simulate_with_game(KINGDOM, strategies, num_games=100)
+    assert np.allclose(simulated.win_rates, played.win_rates, atol=0.15)
+    assert abs(simulated.mean_game_length - played.mean_game_length) < 3
+
+
+def test_simulator_stalls():
+    '''
+    Test that stalled games are stopped and marked as truncated, in the vectorized simulator as in the full game engine.
+    '''
+    idle = Strategy.parse("name: Idle\nbuy Province if $ >= 100")
+    limits = GameLimits(max_rounds_without_supply_change=10)
+    simulated = VectorizedSimulator(KINGDOM, (idle, BIG_MONEY), limits=limits, seed=0).run(100)
+    assert not simulated.truncated.any()
+    played = simulate_with_game(KINGDOM, (idle, idle), num_games=5, limits=limits)
+    assert played.truncated.all() and (played.turns == 11).all()
+    simulated = VectorizedSimulator(KINGDOM, (idle, idle), limits=limits, seed=0).run(100)
+    assert simulated.truncated.all() and (simulated.turns == 11).all()
@@ -1,9 +1,16 @@
+import os
 import pytest
 import random
+import threading
+from datetime import datetime
 from dominion.cards import base_cards, dominion_cards, intrigue_cards, prosperity_cards, cornucopia_cards, hinterlands_cards, guilds_cards
+from dominion.cards.custom_sets import CustomSet
 from dominion.expansions import BaseExpansion, DominionExpansion, IntrigueExpansion, ProsperityExpansion, CornucopiaExpansion, HinterlandsExpansion, GuildsExpansion
 from dominion.game import Game
-from dominion.interactions import AutoInteraction
+from dominion.interactions import AutoInteraction, SearchInteraction, StrategyInteraction
+from dominion.interactions.strategy import STRATEGIES
+from dominion.limits import GameLimits
+from dominion.turn import Turn
 
 
 EXPANSIONS = [
@@ -51,7 +58,7 @@ def test_stability():
 
     Expansions, supply customizations and number of CPU players are randomly selected for each game.
     '''
-    game = Game(test=True)
+    game = Game(test=True, limits=GameLimits.for_simulation())
     # Add a randomly selected set of expansions into the game
     num_expansions = random.randint(2, len(EXPANSIONS))
     expansions_to_include = random.sample(EXPANSIONS, num_expansions)
@@ -76,4 +83,172 @@ def test_stability():
     for _ in range(num_players):
         game.add_cpu()
     game.start()
-    del(game)
\ No newline at end of file
+    del(game)
+
+
+@pytest.mark.repeat(100)
+def test_strategy_stability():
+    '''
+    Test CPU-driven games between players following the built-in strategies.
+
+    Expansions and strategies are randomly selected for each game.
+    '''
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    for expansion in random.sample(EXPANSIONS, random.randint(2, len(EXPANSIONS))):
+        game.add_expansion(expansion)
+    num_players = random.randint(2, 4)
+    for strategy_name in random.choices(list(STRATEGIES), k=num_players):
+        game.add_cpu(StrategyInteraction.using(strategy_name))
+    game.start()
+    assert game.ended
+
+
+def test_strategy_reactions():
+    '''
+    Test that a strategy CPU reveals its Moat to every attack, not just the first.
+    '''
+    game = Game(test=True)
+    game.custom_set = CustomSet.from_json({"cards": ["Moat", "Militia", "Village", "Smithy", "Festival", "Laboratory", "Market", "Cellar", "Chapel", "Workshop"]})
+    for _ in range(2):
+        game.add_cpu(StrategyInteraction)
+    game.start(debug=True)
+    attacker, defender = game.players
+    game.current_turn = Turn(attacker)
+    militia = dominion_cards.Militia()
+    militia.owner = attacker
+    moat = dominion_cards.Moat()
+    moat.owner = defender
+    defender.hand.append(moat)
+    for _ in range(2):
+        militia.attack_player(defender)
+        assert len(defender.hand) == 6
+
+
+class IdleInteraction(AutoInteraction):
+    '''
+    A CPU that never gains a card unless it has to.
+    '''
+    def choose_card_class_from_supply(self, prompt, max_cost, force, invalid_card_classes=None, exact_cost=False):
+        if not force:
+            return None
+        return super().choose_card_class_from_supply(prompt, max_cost, force, invalid_card_classes=invalid_card_classes, exact_cost=exact_cost)
+
+
+def test_stall_detection():
+    '''
+    Test that a game nobody can end is stopped once it stalls, and is marked as truncated.
+    '''
+    game = Game(test=True, limits=GameLimits(max_rounds_without_supply_change=5))
+    game.add_expansion(DominionExpansion)
+    for _ in range(2):
+        game.add_cpu(IdleInteraction)
+    game.start()
+    assert game.ended and game.truncated
+    assert game.game_over_data["truncated"]
+    assert game.num_turns < 100
+
+
+class ForkingInteraction(StrategyInteraction):
+    '''
+    A strategy CPU that forks the game at some of its buy decisions and plays each fork to the end.
+    '''
+    def choose_card_class_from_supply(self, prompt, max_cost, force, invalid_card_classes=None, exact_cost=False):
+        if random.random() < 0.1:
+            card_counts = {player.name: dict(player.card_counts) for player in self.game.players}
+            # The forked players follow the same strategy without forking again, so forks don't multiply
+            forked_game = self.game.fork(interactions_class=StrategyInteraction.using(self.strategy), seed=random.randint(0, 1000))
+            forked_game.resume()
+            assert forked_game.ended
+            # Playing the fork on must not have touched this game
+            assert card_counts == {player.name: dict(player.card_counts) for player in self.game.players}
+            for player in forked_game.players:
+                assert all(card.owner is player and card.game is forked_game for card in player.all_cards)
+        return super().choose_card_class_from_supply(prompt, max_cost, force, invalid_card_classes=invalid_card_classes, exact_cost=exact_cost)
+
+
+@pytest.mark.repeat(20)
+def test_fork_stability():
+    '''
+    Test that forks of CPU-driven games can be played to the end without affecting the original game.
+
+    Expansions are randomly selected for each game.
+    '''
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    for expansion in random.sample(EXPANSIONS, random.randint(2, len(EXPANSIONS))):
+        game.add_expansion(expansion)
+    for _ in range(random.randint(2, 4)):
+        game.add_cpu(ForkingInteraction)
+    game.start()
+    assert game.ended
+
+
+def test_fork_shares_immutable_state():
+    '''
+    Test that objects without attributes of their own (e.g., datetimes and locks) are shared by forks rather than copied.
+    '''
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    game.add_expansion(DominionExpansion)
+    for _ in range(2):
+        game.add_cpu(StrategyInteraction)
+    game.start(debug=True)
+    game.started_at = datetime.now()
+    game.players[0].lock = threading.Lock()
+    forked_game = game.fork()
+    assert forked_game.started_at is game.started_at
+    assert forked_game.players[0].lock is game.players[0].lock
+    forked_game.resume()
+    assert forked_game.ended and not game.ended
+
+
+class QuickSearchInteraction(SearchInteraction):
+    '''
+    A search CPU with a small time budget, so that tests run quickly.
+    '''
+    time_budget = 0.01
+    num_workers = 2
+
+
+@pytest.mark.repeat(5)
+def test_search_stability():
+    '''
+    Test CPU-driven games between a search CPU and strategy CPUs.
+
+    Expansions are randomly selected for each game.
+    '''
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    for expansion in random.sample(EXPANSIONS, random.randint(2, len(EXPANSIONS))):
+        game.add_expansion(expansion)
+    game.add_cpu(QuickSearchInteraction)
+    for _ in range(random.randint(1, 3)):
+        game.add_cpu(StrategyInteraction)
+    game.start()
+    assert game.ended
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="Open file descriptors are listed in /proc")
+def test_search_cleans_up_workers(monkeypatch):
+    '''
+    Test that a search whose workers can't all be forked leaves no worker process or pipe behind.
+    '''
+    game = Game(test=True)
+    game.add_expansion(DominionExpansion)
+    for _ in range(2):
+        game.add_cpu(QuickSearchInteraction)
+    game.start(debug=True)
+    interactions = game.players[0].interactions
+    open_fds = set(os.listdir("/proc/self/fd"))
+    fork = os.fork
+    forks = []
+
+    def fork_once():
+        if forks:
+            raise BlockingIOError("Resource temporarily unavailable")
+        forks.append(fork())
+        return forks[-1]
+
+    monkeypatch.setattr(os, "fork", fork_once)
+    with pytest.raises(BlockingIOError):
+        interactions.search([base_cards.Silver, None])
+    with pytest.raises(ChildProcessError):
+        os.waitpid(forks[0], os.WNOHANG)
+    assert set(os.listdir("/proc/self/fd")) == open_fds
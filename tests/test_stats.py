@@ -0,0 +1,52 @@
+from dominion.cards import ALL_KINGDOM_CARDS
+from dominion.cards.dominion_cards import Festival, Laboratory, Market, Smithy, Village
+from dominion.expansions import DominionExpansion
+from dominion.game import Game
+from dominion.interactions.strategy import BIG_MONEY, ENGINE
+from dominion.limits import GameLimits
+from dominion.simulator import VectorizedSimulator
+from dominion.stats import StatsRecorder, StatsStore
+
+
+KINGDOM = [Village, Smithy, Festival, Laboratory, Market]
+
+
+def test_stats_store():
+    '''
+    Test that simulated games are aggregated into card and kingdom statistics.
+    '''
+    results = VectorizedSimulator(KINGDOM, (BIG_MONEY, ENGINE), seed=0).run(200)
+    store = StatsStore(":memory:")
+    assert store.add_simulation(results) == 200
+    smithy = store.card_stats(Smithy, expansion="Dominion", num_players=2)
+    assert smithy.games == 200
+    assert smithy.mean_game_length == results.mean_game_length
+    owners = results.cards[:, :, results.card_classes.index(Smithy)] > 0
+    assert smithy.owners == owners.sum()
+    assert store.card_stats(Smithy, num_players=3).games == 0
+    assert store.kingdom_stats(KINGDOM) == (200, results.mean_game_length)
+
+
+def test_stats_recorder():
+    '''
+    Test that a finished game is queued by the recorder and added to the store's statistics when flushed.
+    '''
+    game = Game(test=True, limits=GameLimits.for_simulation())
+    game.add_expansion(DominionExpansion)
+    for _ in range(2):
+        game.add_cpu()
+    game.start()
+    store = StatsStore(":memory:")
+    recorder = StatsRecorder(store)
+    recorder.record_game(game)
+    assert recorder.num_pending == 1
+    assert recorder.flush() == 1
+    assert recorder.num_pending == 0
+    assert store.connection.execute("SELECT source, num_players, num_turns, truncated FROM games").fetchall() == [("live", 2, game.num_turns, game.truncated)]
+    kingdom = [card_class for card_class in game.supply.card_stacks if card_class in ALL_KINGDOM_CARDS]
+    for card_class in kingdom:
+        stats = store.card_stats(card_class, expansion="Dominion")
+        assert stats.games == 1
+        assert stats.owners == sum(1 for player in game.players if player.card_counts.get(card_class))
+        assert store.card_stats(card_class, expansion="Prosperity").games == 0
+    assert store.kingdom_stats(kingdom) == (1, game.num_turns)
@@ -0,0 +1,28 @@
+from dominion.cards.dominion_cards import Festival, Laboratory, Market, Smithy, Village
+from dominion.interactions import AutoInteraction, StrategyInteraction
+from dominion.interactions.strategy import BIG_MONEY
+from dominion.tournament import Tournament
+
+
+def test_tournament():
+    '''
+    Test that a tournament tells a real strategy from random play, and that identical strategies tie.
+    '''
+    big_money = StrategyInteraction.using(BIG_MONEY)
+    tournament = Tournament(
+        {"Big Money": big_money, "Big Money again": big_money, "Random": AutoInteraction},
+        kingdoms=[[Village, Smithy, Festival, Laboratory, Market]],
+        min_pairs=3,
+        max_pairs=5,
+        num_workers=0,
+        seed=0,
+    )
+    standings = tournament.run()
+    assert standings[-1][0] == "Random"
+    for pairing in tournament.pairings:
+        assert pairing.resolved
+        if pairing.second == "Random":
+            assert pairing.num_pairs == 3 and pairing.score == 1
+        else:
+            # Seat-swapped games of identical strategies are mirror images
+            assert pairing.num_pairs == 5 and pairing.score == 0.5